@@ -0,0 +1,377 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+import httpx
+import numpy as np
+
+import services.orchestrator.app as orchestrator_app_module
+from services.orchestrator.config import Settings
+from services.orchestrator.engine import SentinelEngine
+from services.tools import CIRunner, GitHubClient, MockAzureMonitorTool, SyntheticWorkload, WorkloadSpec
+from storage import PatternStore
+
+
+HISTOGRAM_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+OPERATIONS = ("create", "list", "get", "approve", "retry")
+
+
+@dataclass(frozen=True)
+class LoadProfile:
+    duration_seconds: float = 10.0
+    create_rate: float = 5.0
+    list_rate: float = 1.0
+    get_rate: float = 5.0
+    approve_rate: float = 1.0
+    retry_rate: float = 0.5
+    storm_interval_seconds: float = 5.0
+    storm_size: int = 20
+    storm_spread_seconds: float = 0.5
+    concurrency: int = 32
+    seed: int = 7
+
+
+@dataclass
+class OperationStats:
+    samples_ms: list[float] = field(default_factory=list)
+    server_errors: int = 0
+    client_errors: int = 0
+    transport_errors: int = 0
+
+    @property
+    def count(self) -> int:
+        return len(self.samples_ms)
+
+    @property
+    def error_rate(self) -> float:
+        if not self.count:
+            return 0.0
+        return (self.server_errors + self.transport_errors) / self.count
+
+    def histogram(self) -> dict[str, int]:
+        buckets = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+        for sample in self.samples_ms:
+            buckets[bisect_left(HISTOGRAM_BOUNDS_MS, sample)] += 1
+        labels = [f"<={bound}ms" for bound in HISTOGRAM_BOUNDS_MS] + [f">{HISTOGRAM_BOUNDS_MS[-1]}ms"]
+        return dict(zip(labels, buckets))
+
+    def to_dict(self) -> dict[str, Any]:
+        percentiles = np.percentile(self.samples_ms, [50, 95, 99]).tolist() if self.samples_ms else [0.0] * 3
+        return {
+            "count": self.count,
+            "server_errors": self.server_errors,
+            "client_errors": self.client_errors,
+            "transport_errors": self.transport_errors,
+            "error_rate": round(self.error_rate, 4),
+            "p50_ms": round(percentiles[0], 3),
+            "p95_ms": round(percentiles[1], 3),
+            "p99_ms": round(percentiles[2], 3),
+            "histogram": self.histogram(),
+        }
+
+
+@dataclass
+class LoadReport:
+    elapsed_seconds: float
+    operations: dict[str, OperationStats]
+    rss_start_bytes: int | None
+    rss_end_bytes: int | None
+
+    @property
+    def total_requests(self) -> int:
+        return sum(stats.count for stats in self.operations.values())
+
+    def to_dict(self) -> dict[str, Any]:
+        growth = None
+        if self.rss_start_bytes is not None and self.rss_end_bytes is not None:
+            growth = self.rss_end_bytes - self.rss_start_bytes
+        return {
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "total_requests": self.total_requests,
+            "throughput_per_s": round(self.total_requests / self.elapsed_seconds, 2) if self.elapsed_seconds else 0.0,
+            "rss_start_bytes": self.rss_start_bytes,
+            "rss_end_bytes": self.rss_end_bytes,
+            "rss_growth_bytes": growth,
+            "operations": {name: stats.to_dict() for name, stats in self.operations.items()},
+        }
+
+
+def rss_bytes(pid: int | None = None) -> int | None:
+    status_path = Path(f"/proc/{pid or 'self'}/status")
+    if status_path.exists():
+        for line in status_path.read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    if pid is None:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return None
+
+
+def build_schedule(profile: LoadProfile) -> list[tuple[float, str, bool]]:
+    rng = random.Random(profile.seed)
+    schedule: list[tuple[float, str, bool]] = []
+    rates = {
+        "create": profile.create_rate,
+        "list": profile.list_rate,
+        "get": profile.get_rate,
+        "approve": profile.approve_rate,
+        "retry": profile.retry_rate,
+    }
+    for operation, rate in rates.items():
+        if rate <= 0:
+            continue
+        offset = rng.expovariate(rate)
+        while offset < profile.duration_seconds:
+            schedule.append((offset, operation, False))
+            offset += rng.expovariate(rate)
+    if profile.storm_interval_seconds > 0 and profile.storm_size > 0:
+        storm_start = profile.storm_interval_seconds
+        while storm_start < profile.duration_seconds:
+            for _ in range(profile.storm_size):
+                schedule.append((storm_start + rng.uniform(0, profile.storm_spread_seconds), "create", True))
+            storm_start += profile.storm_interval_seconds
+    schedule.sort(key=lambda item: item[0])
+    return schedule
+
+
+class LoadGenerator:
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        profile: LoadProfile,
+        targets: list[tuple[str, str]],
+        memory_probe: Callable[[], int | None] | None = None,
+    ) -> None:
+        self.client = client
+        self.profile = profile
+        self.targets = targets
+        self.memory_probe = memory_probe
+        self.rng = random.Random(profile.seed + 1)
+        self.operations = {operation: OperationStats() for operation in OPERATIONS}
+        self.incident_ids: list[str] = []
+        self._sequence = 0
+
+    def _incident_payload(self, storm: bool) -> dict[str, Any]:
+        self._sequence += 1
+        service, endpoint = self.targets[0] if storm else self.rng.choice(self.targets)
+        if not storm:
+            endpoint = f"{endpoint}?load={self._sequence}"
+        return {
+            "incident_id": f"load-{self.profile.seed}-{self._sequence:06d}",
+            "service": service,
+            "env": "prod",
+            "signal_type": "http_5xx_rate",
+            "signal_payload": {
+                "error_rate": round(self.rng.uniform(0.06, 0.3), 3),
+                "baseline_error_rate": 0.01,
+                "endpoint": endpoint,
+                "latency_p95_ms": 1400,
+            },
+        }
+
+    def _request(self, operation: str, storm: bool) -> tuple[str, str, dict[str, Any] | None] | None:
+        if operation == "create":
+            return "POST", "/api/v1/incidents", self._incident_payload(storm)
+        if operation == "list":
+            return "GET", "/api/v1/incidents", None
+        if not self.incident_ids:
+            return None
+        incident_id = self.rng.choice(self.incident_ids)
+        if operation == "get":
+            return "GET", f"/api/v1/incidents/{incident_id}", None
+        if operation == "approve":
+            body = {"approved_by": "loadtest@example.com", "decision": self.rng.choice(["approve", "reject"])}
+            return "POST", f"/api/v1/incidents/{incident_id}/approve", body
+        return "POST", f"/api/v1/incidents/{incident_id}/retry", {"stage": "triage"}
+
+    async def _issue(self, scheduled_at: float, operation: str, storm: bool, gate: asyncio.Semaphore) -> None:
+        request = self._request(operation, storm)
+        if request is None:
+            return
+        method, path, body = request
+        stats = self.operations[operation]
+        async with gate:
+            try:
+                response = await self.client.request(method, path, json=body)
+            except httpx.HTTPError:
+                response = None
+        # Latency is measured from the scheduled send time so queueing behind
+        # the concurrency gate is not hidden (open-loop, no coordinated omission).
+        stats.samples_ms.append((time.perf_counter() - scheduled_at) * 1000.0)
+        if response is None:
+            stats.transport_errors += 1
+        elif response.status_code >= 500:
+            stats.server_errors += 1
+        elif response.status_code >= 400:
+            stats.client_errors += 1
+        elif operation == "create":
+            self.incident_ids.append(response.json()["incident_id"])
+
+    async def run(self) -> LoadReport:
+        schedule = build_schedule(self.profile)
+        gate = asyncio.Semaphore(self.profile.concurrency)
+        rss_start = self.memory_probe() if self.memory_probe else None
+        started = time.perf_counter()
+        tasks: list[asyncio.Task[None]] = []
+        for offset, operation, storm in schedule:
+            delay = started + offset - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(self._issue(started + offset, operation, storm, gate)))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+        rss_end = self.memory_probe() if self.memory_probe else None
+        return LoadReport(
+            elapsed_seconds=elapsed,
+            operations=self.operations,
+            rss_start_bytes=rss_start,
+            rss_end_bytes=rss_end,
+        )
+
+
+def build_offline_engine(workload: SyntheticWorkload, db_path: str) -> SentinelEngine:
+    settings = Settings(pattern_db_path=db_path, github_mode="mock")
+    return SentinelEngine(
+        settings=settings,
+        azure_tool=MockAzureMonitorTool(dataset=workload.dataset()),
+        github_client=GitHubClient(owner=settings.github_owner, repo=settings.github_repo, mode="mock"),
+        ci_runner=CIRunner(),
+        pattern_store=PatternStore(db_path),
+    )
+
+
+async def run_in_process(profile: LoadProfile, workload: SyntheticWorkload, db_path: str) -> LoadReport:
+    previous = orchestrator_app_module.engine
+    engine = orchestrator_app_module.engine = build_offline_engine(workload, db_path)
+    try:
+        targets = [(service, endpoint) for service, _ in workload.buckets() for endpoint in workload.endpoints(service)]
+        transport = httpx.ASGITransport(app=orchestrator_app_module.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://sentinel.local") as client:
+            return await LoadGenerator(client, profile, targets, memory_probe=rss_bytes).run()
+    finally:
+        orchestrator_app_module.engine = previous
+        engine.close()
+
+
+async def run_against_url(
+    profile: LoadProfile,
+    base_url: str,
+    targets: list[tuple[str, str]],
+    server_pid: int | None = None,
+) -> LoadReport:
+    limits = httpx.Limits(max_connections=profile.concurrency, max_keepalive_connections=profile.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        probe = (lambda: rss_bytes(server_pid)) if server_pid else None
+        return await LoadGenerator(client, profile, targets, memory_probe=probe).run()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+def spawn_uvicorn(db_path: str) -> tuple[subprocess.Popen[bytes], str]:
+    port = _free_port()
+    env = dict(os.environ, SENTINEL_GITHUB_MODE="mock", SENTINEL_PATTERN_DB_PATH=db_path)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "services.orchestrator.app:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30.0
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn exited early with code {process.returncode}")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1.0).status_code == 200:
+                return process, base_url
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("uvicorn did not become healthy within 30s")
+
+
+def format_report(report: LoadReport) -> str:
+    data = report.to_dict()
+    lines = [
+        f"requests={data['total_requests']} elapsed={data['elapsed_seconds']}s "
+        f"throughput={data['throughput_per_s']}/s rss_growth={data['rss_growth_bytes']}",
+        f"{'operation':<10} {'count':>6} {'err%':>7} {'4xx':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}",
+    ]
+    for name, stats in data["operations"].items():
+        lines.append(
+            f"{name:<10} {stats['count']:>6} {stats['error_rate'] * 100:>6.2f}% {stats['client_errors']:>5} "
+            f"{stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test the Sentinel orchestrator API.")
+    parser.add_argument("--url", help="Target a running orchestrator instead of the in-process ASGI app.")
+    parser.add_argument("--spawn-uvicorn", action="store_true", help="Start a local uvicorn worker in mock mode.")
+    parser.add_argument("--duration", type=float, default=LoadProfile.duration_seconds)
+    parser.add_argument("--create-rate", type=float, default=LoadProfile.create_rate)
+    parser.add_argument("--list-rate", type=float, default=LoadProfile.list_rate)
+    parser.add_argument("--get-rate", type=float, default=LoadProfile.get_rate)
+    parser.add_argument("--approve-rate", type=float, default=LoadProfile.approve_rate)
+    parser.add_argument("--retry-rate", type=float, default=LoadProfile.retry_rate)
+    parser.add_argument("--storm-interval", type=float, default=LoadProfile.storm_interval_seconds)
+    parser.add_argument("--storm-size", type=int, default=LoadProfile.storm_size)
+    parser.add_argument("--concurrency", type=int, default=LoadProfile.concurrency)
+    parser.add_argument("--services", type=int, default=3, help="Synthetic services for in-process runs.")
+    parser.add_argument("--seed", type=int, default=LoadProfile.seed)
+    parser.add_argument("--json", type=Path, help="Write the full report, including histograms, to this file.")
+    args = parser.parse_args(argv)
+
+    profile = LoadProfile(
+        duration_seconds=args.duration,
+        create_rate=args.create_rate,
+        list_rate=args.list_rate,
+        get_rate=args.get_rate,
+        approve_rate=args.approve_rate,
+        retry_rate=args.retry_rate,
+        storm_interval_seconds=args.storm_interval,
+        storm_size=args.storm_size,
+        concurrency=args.concurrency,
+        seed=args.seed,
+    )
+    remote_targets = [("checkout-api", "/checkout")]
+    with tempfile.TemporaryDirectory() as workdir:
+        db_path = str(Path(workdir) / "patterns.db")
+        if args.spawn_uvicorn:
+            process, base_url = spawn_uvicorn(db_path)
+            try:
+                report = asyncio.run(run_against_url(profile, base_url, remote_targets, server_pid=process.pid))
+            finally:
+                process.terminate()
+                process.wait(timeout=10)
+        elif args.url:
+            report = asyncio.run(run_against_url(profile, args.url, remote_targets))
+        else:
+            workload = SyntheticWorkload(WorkloadSpec(seed=args.seed, services=args.services))
+            report = asyncio.run(run_in_process(profile, workload, db_path))
+
+    print(format_report(report))
+    if args.json:
+        args.json.write_text(json.dumps(report.to_dict(), indent=2) + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+
+from contracts import IncidentEnvelope, PatternRecord
+from services.orchestrator.config import Settings
+from services.orchestrator.engine import SentinelEngine
+from services.tools import CIRunner, GitHubClient, MockAzureMonitorTool, SyntheticWorkload, WorkloadSpec
+from services.tools.github_client import PullRequestInfo
+from storage import PatternStore
+
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baselines" / "pipeline.json"
+DEFAULT_THRESHOLD = 0.5
+# Regressions are judged by the relative threshold, but a p95 must also grow
+# by more than this floor: sub-millisecond stages move by a fraction of a
+# millisecond between runs on a shared machine.
+DEFAULT_MIN_DELTA_MS = 2.0
+
+BENCHMARK_SIZES: dict[str, tuple[WorkloadSpec, int]] = {
+    "small": (WorkloadSpec(seed=1, endpoints_per_service=3, duration_minutes=60, logs_per_minute=10), 50),
+    "medium": (WorkloadSpec(seed=2, endpoints_per_service=20, duration_minutes=1440, logs_per_minute=30), 10),
+    "large": (WorkloadSpec(seed=3, endpoints_per_service=50, duration_minutes=2880, logs_per_minute=20), 3),
+}
+
+
+@dataclass
+class StageResult:
+    size: str
+    stage: str
+    iterations: int
+    total_seconds: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+    @property
+    def throughput_per_s(self) -> float:
+        if self.total_seconds <= 0:
+            return 0.0
+        return self.iterations / self.total_seconds
+
+    def to_dict(self) -> dict[str, float]:
+        return {
+            "iterations": self.iterations,
+            "throughput_per_s": round(self.throughput_per_s, 3),
+            "p50_ms": round(self.p50_ms, 4),
+            "p95_ms": round(self.p95_ms, 4),
+            "p99_ms": round(self.p99_ms, 4),
+        }
+
+
+def summarize(size: str, stage: str, samples_ns: list[int]) -> StageResult:
+    samples_ms = np.asarray(samples_ns, dtype=np.float64) / 1e6
+    p50, p95, p99 = np.percentile(samples_ms, [50, 95, 99])
+    return StageResult(
+        size=size,
+        stage=stage,
+        iterations=len(samples_ns),
+        total_seconds=float(samples_ms.sum()) / 1000.0,
+        p50_ms=float(p50),
+        p95_ms=float(p95),
+        p99_ms=float(p99),
+    )
+
+
+def _measure(iterations: int, action: Callable[[int], Any]) -> list[int]:
+    samples: list[int] = []
+    for iteration in range(iterations):
+        started = time.perf_counter_ns()
+        action(iteration)
+        samples.append(time.perf_counter_ns() - started)
+    return samples
+
+
+def build_benchmark_engine(workload: SyntheticWorkload, db_path: str) -> SentinelEngine:
+    settings = Settings(
+        pattern_db_path=db_path,
+        github_mode="mock",
+        telemetry_cache_ttl_seconds=0.0,
+        verification_cache_ttl_seconds=0.0,
+    )
+    return SentinelEngine(
+        settings=settings,
+        azure_tool=MockAzureMonitorTool(dataset=workload.dataset()),
+        github_client=GitHubClient(owner=settings.github_owner, repo=settings.github_repo, mode="mock"),
+        ci_runner=CIRunner(),
+        pattern_store=PatternStore(db_path),
+    )
+
+
+def run_size(size: str, spec: WorkloadSpec, iterations: int) -> list[StageResult]:
+    workload = SyntheticWorkload(replace(spec, regression_probability=1.0, alert_storm_size=1))
+    template = next(workload.iter_incidents())
+
+    def incident(label: str, iteration: int) -> IncidentEnvelope:
+        payload = dict(template, incident_id=f"bench-{size}-{label}-{iteration:05d}")
+        payload["signal_payload"] = dict(template["signal_payload"], endpoint=f"/bench/{label}/{iteration}")
+        return IncidentEnvelope.from_dict(payload)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = build_benchmark_engine(workload, str(Path(workdir) / "patterns.db"))
+        subject = incident("stage", 0)
+        investigation = engine.investigation_agent.investigate(subject)
+        patch = engine.patch_agent.propose_patch(subject, investigation, attempt=1)
+        verification = engine.verification_runner.verify(subject, patch)
+        placeholder_pr = PullRequestInfo(
+            pr_url="pending",
+            number=None,
+            title="benchmark",
+            head_branch=patch.branch,
+            base_branch=engine.settings.base_branch,
+        )
+
+        def triage(_: int) -> None:
+            duplicates = engine.state_store.find_recent_duplicates(
+                subject.fingerprint,
+                exclude_incident_id=subject.incident_id,
+                dedupe_window_minutes=engine.settings.dedupe_window_minutes,
+            )
+            engine.triage_agent.evaluate(subject, has_duplicates=bool(duplicates))
+
+        def approval_package(_: int) -> None:
+            package = engine.approval_agent.build_approval_package(
+                subject, investigation, patch, verification, placeholder_pr
+            )
+            engine.approval_agent.build_pr_body(subject, investigation, patch, verification, package)
+
+        def pattern_save(iteration: int) -> None:
+            engine.pattern_store.save(
+                PatternRecord(
+                    fingerprint=f"{subject.fingerprint}:{iteration}",
+                    root_cause=investigation.reason,
+                    fix_signature=patch.diff_summary,
+                    outcome="pending_approval",
+                )
+            )
+
+        stages: dict[str, Callable[[int], Any]] = {
+            "triage": triage,
+            "investigation": lambda _: engine.investigation_agent.investigate(subject),
+            "patch": lambda iteration: engine.patch_agent.propose_patch(subject, investigation, attempt=1),
+            "verification": lambda _: engine.verification_runner.verify(subject, patch),
+            "approval_package": approval_package,
+            "pattern_save": pattern_save,
+            "end_to_end": lambda iteration: engine.ingest_incident(incident("e2e", iteration)),
+        }
+        return [summarize(size, stage, _measure(iterations, action)) for stage, action in stages.items()]
+
+
+def results_to_baseline(results: list[StageResult]) -> dict[str, dict[str, dict[str, float]]]:
+    baseline: dict[str, dict[str, dict[str, float]]] = {}
+    for result in results:
+        baseline.setdefault(result.size, {})[result.stage] = result.to_dict()
+    return baseline
+
+
+def machine_fingerprint() -> str:
+    # Baselines only compare meaningfully against runs on the same kind of machine.
+    return f"{platform.system()}-{platform.machine()}-{os.cpu_count()}cpu"
+
+
+def load_baseline(path: Path) -> dict[str, Any]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def save_baseline(path: Path, results: list[StageResult]) -> None:
+    baseline = load_baseline(path)
+    sizes = baseline.setdefault("sizes", {})
+    sizes.update(results_to_baseline(results))
+    baseline["python"] = sys.version.split()[0]
+    baseline["machine"] = machine_fingerprint()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def find_regressions(
+    results: list[StageResult],
+    baseline: dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+    min_delta_ms: float = DEFAULT_MIN_DELTA_MS,
+) -> list[str]:
+    regressions: list[str] = []
+    sizes = baseline.get("sizes", {})
+    for result in results:
+        reference = sizes.get(result.size, {}).get(result.stage)
+        if not reference:
+            continue
+        allowed = reference["p95_ms"] * (1.0 + threshold)
+        if result.p95_ms > allowed and result.p95_ms - reference["p95_ms"] > min_delta_ms:
+            regressions.append(
+                f"{result.size}/{result.stage}: p95 {result.p95_ms:.3f}ms exceeds baseline "
+                f"{reference['p95_ms']:.3f}ms by more than {threshold:.0%}"
+            )
+    return regressions
+
+
+def format_report(results: list[StageResult]) -> str:
+    lines = [f"{'size':<8} {'stage':<18} {'iters':>6} {'ops/s':>10} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10}"]
+    for result in results:
+        lines.append(
+            f"{result.size:<8} {result.stage:<18} {result.iterations:>6} {result.throughput_per_s:>10.1f} "
+            f"{result.p50_ms:>10.3f} {result.p95_ms:>10.3f} {result.p99_ms:>10.3f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Sentinel pipeline benchmarks.")
+    parser.add_argument("--sizes", default="small,medium", help="Comma-separated subset of: " + ",".join(BENCHMARK_SIZES))
+    parser.add_argument("--iterations", type=int, default=None, help="Override iterations per stage.")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS)
+    args = parser.parse_args(argv)
+
+    results: list[StageResult] = []
+    for size in [item.strip() for item in args.sizes.split(",") if item.strip()]:
+        if size not in BENCHMARK_SIZES:
+            parser.error(f"Unknown benchmark size: {size}")
+        spec, iterations = BENCHMARK_SIZES[size]
+        results.extend(run_size(size, spec, args.iterations or iterations))
+    print(format_report(results))
+
+    if args.update_baseline:
+        save_baseline(args.baseline, results)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if baseline.get("machine") != machine_fingerprint():
+        print(
+            f"WARNING baseline was recorded on {baseline.get('machine', 'an unknown machine')}, not "
+            f"{machine_fingerprint()}; regenerate it on this machine with --update-baseline before comparing.",
+            file=sys.stderr,
+        )
+    regressions = find_regressions(results, baseline, args.threshold, args.min_delta_ms)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
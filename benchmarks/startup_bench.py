@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+
+DEFAULT_RUNS = 5
+DEFAULT_MAX_HEALTH_MS = 1500.0
+ROOT_DIR = Path(__file__).resolve().parents[1]
+
+# Runs in a fresh interpreter, like a new uvicorn worker: import the app,
+# drive the ASGI lifespan and poll /health then /ready. Only stdlib asyncio
+# is used so the probe needs neither httpx nor a socket.
+_PROBE = r"""
+import asyncio
+import json
+import time
+
+started = time.perf_counter()
+import services.orchestrator.app as module
+
+imported = time.perf_counter()
+heavy = ["numpy", "services.orchestrator.engine", "services.tools.github_client"]
+loaded_at_import = [name for name in heavy if name in __import__("sys").modules]
+
+
+async def get(path):
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "client": ("127.0.0.1", 0),
+        "server": ("127.0.0.1", 80),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await module.app(scope, receive, send)
+    return messages[0]["status"]
+
+
+async def main():
+    inbox, outbox = asyncio.Queue(), asyncio.Queue()
+    lifespan = asyncio.create_task(
+        module.app({"type": "lifespan", "asgi": {"version": "3.0"}, "state": {}}, inbox.get, outbox.put)
+    )
+    await inbox.put({"type": "lifespan.startup"})
+    assert (await outbox.get())["type"] == "lifespan.startup.complete"
+    assert await get("/health") == 200
+    healthy = time.perf_counter()
+    while await get("/ready") != 200:
+        await asyncio.sleep(0.002)
+    ready = time.perf_counter()
+    await inbox.put({"type": "lifespan.shutdown"})
+    await outbox.get()
+    await lifespan
+    return healthy, ready
+
+
+healthy, ready = asyncio.run(main())
+print(json.dumps({
+    "import_ms": (imported - started) * 1000.0,
+    "health_ms": (healthy - started) * 1000.0,
+    "ready_ms": (ready - started) * 1000.0,
+    "loaded_at_import": loaded_at_import,
+}))
+"""
+
+
+@dataclass
+class StartupResult:
+    runs: int
+    import_ms: float
+    health_ms: float
+    ready_ms: float
+    process_ms: float
+    loaded_at_import: list[str]
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "runs": self.runs,
+            "import_ms": round(self.import_ms, 2),
+            "health_ms": round(self.health_ms, 2),
+            "ready_ms": round(self.ready_ms, 2),
+            "process_ms": round(self.process_ms, 2),
+            "loaded_at_import": self.loaded_at_import,
+        }
+
+
+def probe_once(storage_dir: str) -> dict[str, object]:
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(filter(None, [str(ROOT_DIR), os.environ.get("PYTHONPATH")])),
+        "SENTINEL_PATTERN_DB_PATH": str(Path(storage_dir) / "patterns.db"),
+    }
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=storage_dir,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    sample = json.loads(completed.stdout.strip().splitlines()[-1])
+    sample["process_ms"] = (time.perf_counter() - started) * 1000.0
+    return sample
+
+
+def run(runs: int = DEFAULT_RUNS) -> StartupResult:
+    samples = []
+    for _ in range(runs):
+        # A fresh storage directory per run so every worker pays the cold
+        # SQLite setup, as a new pod would.
+        with tempfile.TemporaryDirectory() as storage_dir:
+            samples.append(probe_once(storage_dir))
+    return StartupResult(
+        runs=runs,
+        import_ms=statistics.median(sample["import_ms"] for sample in samples),
+        health_ms=statistics.median(sample["health_ms"] for sample in samples),
+        ready_ms=statistics.median(sample["ready_ms"] for sample in samples),
+        process_ms=statistics.median(sample["process_ms"] for sample in samples),
+        loaded_at_import=sorted({name for sample in samples for name in sample["loaded_at_import"]}),
+    )
+
+
+def format_report(result: StartupResult) -> str:
+    lines = [
+        f"median of {result.runs} fresh processes",
+        f"{'import app':<22} {result.import_ms:>9.1f} ms",
+        f"{'first /health':<22} {result.health_ms:>9.1f} ms",
+        f"{'/ready (engine built)':<22} {result.ready_ms:>9.1f} ms",
+        f"{'process wall time':<22} {result.process_ms:>9.1f} ms",
+    ]
+    if result.loaded_at_import:
+        lines.append(f"heavy modules loaded at import: {', '.join(result.loaded_at_import)}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Cold-start benchmark for the orchestrator API.")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument("--max-health-ms", type=float, default=DEFAULT_MAX_HEALTH_MS)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON instead of a table.")
+    args = parser.parse_args(argv)
+
+    result = run(args.runs)
+    if args.json:
+        print(json.dumps(result.to_dict(), indent=2))
+    else:
+        print(format_report(result))
+    failures = []
+    if result.health_ms > args.max_health_ms:
+        failures.append(f"first /health after {result.health_ms:.1f}ms > {args.max_health_ms:.1f}ms")
+    if result.loaded_at_import:
+        failures.append(f"importing the app loads {', '.join(result.loaded_at_import)}")
+    for failure in failures:
+        print(f"OVER BUDGET {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,3 +1,14 @@
+from contracts.clock import SYSTEM_CLOCK, Clock, SystemClock, VirtualClock
+from contracts.deadline import (
+    Deadline,
+    DeadlineExceeded,
+    check_deadline,
+    current_deadline,
+    deadline_scope,
+    remaining_time,
+    run_with_deadline,
+)
+from contracts.diff import FileDiff, Hunk, UnifiedDiff, iter_file_diffs, parse_unified_diff, patch_content_hash
 from contracts.events import PipelineEvent
 from contracts.models import (
     ApprovalPackage,
@@ -20,8 +31,13 @@ from contracts.models import (
 __all__ = [
     "ApprovalPackage",
     "ApproveRequest",
+    "Clock",
+    "Deadline",
+    "DeadlineExceeded",
     "Decision",
     "EventLog",
+    "FileDiff",
+    "Hunk",
     "IncidentEnvelope",
     "IncidentRecord",
     "IncidentStatus",
@@ -30,8 +46,20 @@ __all__ = [
     "PatternRecord",
     "PipelineEvent",
     "RetryRequest",
+    "SYSTEM_CLOCK",
     "Severity",
+    "SystemClock",
+    "UnifiedDiff",
     "VerificationReport",
+    "VirtualClock",
+    "check_deadline",
+    "current_deadline",
+    "deadline_scope",
+    "iter_file_diffs",
+    "parse_unified_diff",
+    "patch_content_hash",
+    "remaining_time",
+    "run_with_deadline",
     "to_primitive",
     "utcnow_iso",
 ]
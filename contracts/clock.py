@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import time
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+from typing import Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class Clock:
+    def now(self) -> datetime:
+        raise NotImplementedError
+
+    def monotonic(self) -> float:
+        raise NotImplementedError
+
+    def sleep(self, seconds: float) -> None:
+        raise NotImplementedError
+
+    def iso(self) -> str:
+        return self.now().replace(microsecond=0).isoformat()
+
+    def branches(self) -> ClockBranches:
+        return ClockBranches()
+
+
+class ClockBranches:
+    # Jobs run concurrently on wall time overlap by themselves; a virtual
+    # clock has to be told (see VirtualClock.branches).
+    def wrap(self, action: Callable[[], T]) -> Callable[[], T]:
+        return action
+
+    def join(self) -> None:
+        return None
+
+
+class _Timeline:
+    __slots__ = ("clock", "parent", "elapsed")
+
+    def __init__(self, clock: VirtualClock, parent: _Timeline | None) -> None:
+        self.clock = clock
+        self.parent = parent
+        self.elapsed = 0.0
+
+    def offset(self) -> float:
+        return self.elapsed + (self.parent.offset() if self.parent is not None else 0.0)
+
+
+_TIMELINE: ContextVar[_Timeline | None] = ContextVar("virtual_clock_timeline", default=None)
+
+
+class SystemClock(Clock):
+    def now(self) -> datetime:
+        return datetime.now(timezone.utc)
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+class VirtualClock(Clock):
+    def __init__(self, start: datetime | None = None) -> None:
+        start = start or datetime.now(timezone.utc)
+        if start.tzinfo is None:
+            start = start.replace(tzinfo=timezone.utc)
+        self._start = start
+        self._elapsed = 0.0
+        self._lock = Lock()
+
+    def _timeline(self) -> _Timeline | None:
+        timeline = _TIMELINE.get()
+        return timeline if timeline is not None and timeline.clock is self else None
+
+    def _offset(self) -> float:
+        timeline = self._timeline()
+        return timeline.offset() if timeline is not None else 0.0
+
+    def now(self) -> datetime:
+        with self._lock:
+            return self._start + timedelta(seconds=self._elapsed + self._offset())
+
+    def monotonic(self) -> float:
+        with self._lock:
+            return self._elapsed + self._offset()
+
+    def sleep(self, seconds: float) -> None:
+        # Inside a branch only that branch's timeline moves; the shared clock
+        # catches up when the branches are joined.
+        timeline = self._timeline()
+        if timeline is None:
+            self.advance(seconds)
+        elif seconds > 0:
+            timeline.elapsed += seconds
+
+    def branches(self) -> ClockBranches:
+        return _VirtualBranches(self)
+
+    def advance(self, seconds: float) -> None:
+        if seconds <= 0:
+            return
+        with self._lock:
+            self._elapsed += seconds
+
+    def advance_to(self, moment: datetime) -> None:
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        with self._lock:
+            self._elapsed = max(self._elapsed, (moment - self._start).total_seconds())
+
+
+class _VirtualBranches(ClockBranches):
+    def __init__(self, clock: VirtualClock) -> None:
+        self.clock = clock
+        self.timelines: list[_Timeline] = []
+
+    def wrap(self, action: Callable[[], T]) -> Callable[[], T]:
+        timeline = _Timeline(self.clock, self.clock._timeline())
+        self.timelines.append(timeline)
+
+        def run() -> T:
+            token = _TIMELINE.set(timeline)
+            try:
+                return action()
+            finally:
+                _TIMELINE.reset(token)
+
+        return run
+
+    def join(self) -> None:
+        # Concurrent jobs cost the longest of them, not their sum.
+        if self.timelines:
+            self.clock.sleep(max(timeline.elapsed for timeline in self.timelines))
+
+
+SYSTEM_CLOCK = SystemClock()
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import math
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from dataclasses import dataclass
+from threading import Event, Thread
+from typing import Any, Callable, Iterator, TypeVar
+
+from contracts.clock import SYSTEM_CLOCK, Clock
+
+
+T = TypeVar("T")
+
+
+class DeadlineExceeded(TimeoutError):
+    def __init__(self, stage: str, budget_seconds: float) -> None:
+        super().__init__(f"Time budget exhausted during {stage} ({budget_seconds:.1f}s).")
+        self.stage = stage
+        self.budget_seconds = budget_seconds
+
+
+@dataclass(frozen=True)
+class Deadline:
+    expires_at: float
+    budget_seconds: float
+    clock: Clock = SYSTEM_CLOCK
+
+    @classmethod
+    def after(cls, seconds: float | None, clock: Clock | None = None) -> "Deadline":
+        clock = clock or SYSTEM_CLOCK
+        if seconds is None or seconds <= 0:
+            return cls(math.inf, math.inf, clock)
+        return cls(clock.monotonic() + seconds, seconds, clock)
+
+    @property
+    def bounded(self) -> bool:
+        return not math.isinf(self.expires_at)
+
+    @property
+    def expired(self) -> bool:
+        return self.clock.monotonic() >= self.expires_at
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - self.clock.monotonic())
+
+    def cap(self, timeout: float) -> float:
+        return min(timeout, self.remaining())
+
+    def within(self, seconds: float | None) -> "Deadline":
+        # A stage budget can only tighten the overall deadline, never extend it.
+        if seconds is None or seconds <= 0:
+            return self
+        expires_at = self.clock.monotonic() + seconds
+        if expires_at >= self.expires_at:
+            return self
+        return Deadline(expires_at, seconds, self.clock)
+
+    def check(self, stage: str) -> None:
+        if self.expired:
+            raise DeadlineExceeded(stage, self.budget_seconds)
+
+
+_CURRENT: ContextVar[Deadline | None] = ContextVar("sentinel_deadline", default=None)
+
+
+def current_deadline() -> Deadline | None:
+    return _CURRENT.get()
+
+
+def remaining_time(timeout: float) -> float:
+    deadline = _CURRENT.get()
+    return timeout if deadline is None else deadline.cap(timeout)
+
+
+def check_deadline(stage: str) -> None:
+    deadline = _CURRENT.get()
+    if deadline is not None:
+        deadline.check(stage)
+
+
+@contextmanager
+def deadline_scope(deadline: Deadline | None) -> Iterator[Deadline | None]:
+    token = _CURRENT.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _CURRENT.reset(token)
+
+
+def _run_scoped(deadline: Deadline, action: Callable[[], T]) -> T:
+    with deadline_scope(deadline):
+        return action()
+
+
+def run_with_deadline(action: Callable[[], T], deadline: Deadline, stage: str) -> T:
+    # The action runs on a daemon thread so a hung tool call cannot hold the
+    # pipeline past its budget. An abandoned call keeps running until its
+    # next deadline check (or its own I/O timeout); its result is discarded.
+    deadline.check(stage)
+    context = copy_context()
+    outcome: dict[str, Any] = {}
+    done = Event()
+
+    def target() -> None:
+        try:
+            outcome["result"] = context.run(_run_scoped, deadline, action)
+        except BaseException as exc:
+            outcome["error"] = exc
+        finally:
+            done.set()
+
+    Thread(target=target, name=f"sentinel-{stage}", daemon=True).start()
+    if not done.wait(deadline.remaining() if deadline.bounded else None):
+        raise DeadlineExceeded(stage, deadline.budget_seconds)
+    if "error" in outcome:
+        raise outcome["error"]
+    # Under a virtual clock the call may return promptly in wall time while
+    # having consumed more than its budget in simulated time.
+    deadline.check(stage)
+    return outcome["result"]
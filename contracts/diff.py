@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Iterable, Iterator
+
+
+_HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@(.*)$")
+_DEV_NULL = "/dev/null"
+
+
+def _strip_prefix(path: str) -> str:
+    path = path.split("\t", 1)[0].strip()
+    if path != _DEV_NULL and path[:2] in ("a/", "b/"):
+        return path[2:]
+    return path
+
+
+@dataclass(frozen=True)
+class Hunk:
+    old_start: int
+    old_count: int
+    new_start: int
+    new_count: int
+    lines: tuple[str, ...]
+    section: str = ""
+
+    @property
+    def added(self) -> tuple[str, ...]:
+        return tuple(line[1:] for line in self.lines if line.startswith("+"))
+
+    @property
+    def removed(self) -> tuple[str, ...]:
+        return tuple(line[1:] for line in self.lines if line.startswith("-"))
+
+    @property
+    def old_range(self) -> tuple[int, int]:
+        return self.old_start, self.old_start + max(self.old_count, 1) - 1
+
+    @property
+    def new_range(self) -> tuple[int, int]:
+        return self.new_start, self.new_start + max(self.new_count, 1) - 1
+
+    def canonical(self) -> str:
+        # Counts are recomputed from the body, so hand-written headers with
+        # stale counts still hash the same as a freshly generated diff.
+        old_count = sum(1 for line in self.lines if not line.startswith("+"))
+        new_count = sum(1 for line in self.lines if not line.startswith("-"))
+        body = "".join(f"{line}\n" for line in self.lines)
+        return f"@@ -{self.old_start},{old_count} +{self.new_start},{new_count} @@\n{body}"
+
+
+@dataclass(frozen=True)
+class FileDiff:
+    old_path: str
+    new_path: str
+    hunks: tuple[Hunk, ...]
+
+    @property
+    def path(self) -> str:
+        return self.old_path if self.new_path == _DEV_NULL else self.new_path
+
+    @property
+    def is_new(self) -> bool:
+        return self.old_path == _DEV_NULL
+
+    @property
+    def is_deleted(self) -> bool:
+        return self.new_path == _DEV_NULL
+
+    @property
+    def added_lines(self) -> int:
+        return sum(len(hunk.added) for hunk in self.hunks)
+
+    @property
+    def removed_lines(self) -> int:
+        return sum(len(hunk.removed) for hunk in self.hunks)
+
+    def canonical(self) -> str:
+        old_path = self.old_path if self.is_new else f"a/{self.old_path}"
+        new_path = self.new_path if self.is_deleted else f"b/{self.new_path}"
+        return f"--- {old_path}\n+++ {new_path}\n" + "".join(hunk.canonical() for hunk in self.hunks)
+
+
+@dataclass(frozen=True)
+class UnifiedDiff:
+    files: tuple[FileDiff, ...]
+
+    @cached_property
+    def content_hash(self) -> str:
+        return hashlib.sha256(self.canonical().encode("utf-8")).hexdigest()
+
+    @cached_property
+    def changed_files(self) -> tuple[str, ...]:
+        return tuple(sorted({file_diff.path for file_diff in self.files}))
+
+    @property
+    def added_lines(self) -> int:
+        return sum(file_diff.added_lines for file_diff in self.files)
+
+    @property
+    def removed_lines(self) -> int:
+        return sum(file_diff.removed_lines for file_diff in self.files)
+
+    def canonical(self) -> str:
+        return "".join(file_diff.canonical() for file_diff in sorted(self.files, key=lambda item: item.path))
+
+    def iter_changes(self) -> Iterator[tuple[str, str, str]]:
+        for file_diff in self.files:
+            for hunk in file_diff.hunks:
+                for line in hunk.lines:
+                    if line[:1] in ("+", "-"):
+                        yield file_diff.path, line[0], line[1:]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, UnifiedDiff):
+            return NotImplemented
+        return self.content_hash == other.content_hash
+
+    def __hash__(self) -> int:
+        return hash(self.content_hash)
+
+
+def iter_file_diffs(lines: Iterable[str]) -> Iterator[FileDiff]:
+    # Single pass over the lines: each file is yielded as soon as the next
+    # file header (or the end of input) is reached, so callers can stream very
+    # large multi-file patches. Generated patches are often sloppy, so a
+    # "--- " line followed by "+++ " always starts a new file even when a hunk
+    # header over-counts its body, and change lines after a file header
+    # without any "@@" header form an implicit hunk.
+    old_path: str | None = None
+    new_path = ""
+    hunks: list[Hunk] = []
+    header: tuple[int, int, int, int, str] | None = None
+    hunk_lines: list[str] = []
+    pending_old: str | None = None
+    blank_lines = 0
+
+    def close_hunk() -> None:
+        nonlocal header, hunk_lines, blank_lines
+        if header is not None:
+            hunks.append(Hunk(*header[:4], lines=tuple(hunk_lines), section=header[4]))
+        header, hunk_lines, blank_lines = None, [], 0
+
+    for raw in lines:
+        line = raw.rstrip("\r\n")
+        if pending_old is not None:
+            if line.startswith("+++ "):
+                close_hunk()
+                if old_path is not None:
+                    yield FileDiff(old_path, new_path, tuple(hunks))
+                old_path, new_path, hunks = _strip_prefix(pending_old), _strip_prefix(line[4:]), []
+                pending_old = None
+                continue
+            if header is not None:
+                hunk_lines.append("--- " + pending_old)
+            pending_old = None
+        if line.startswith("--- "):
+            pending_old = line[4:]
+            continue
+        if line.startswith("@@"):
+            match = _HUNK_HEADER.match(line)
+            if match and old_path is not None:
+                close_hunk()
+                old_start, old_count, new_start, new_count, section = match.groups()
+                header = (int(old_start), int(old_count or 1), int(new_start), int(new_count or 1), section.strip())
+            continue
+        if not line:
+            # Editors strip the space off empty context lines; only keep them
+            # when more hunk content follows, so trailing newlines do not count.
+            blank_lines += header is not None
+            continue
+        if old_path is not None and line[:1] in (" ", "+", "-"):
+            if header is None:
+                if line[0] == " ":
+                    continue
+                header = (0, 0, 0, 0, "")
+            hunk_lines.extend([" "] * blank_lines)
+            blank_lines = 0
+            hunk_lines.append(line)
+        elif header is not None and line.startswith("\\"):
+            continue
+        else:
+            close_hunk()
+
+    if pending_old is not None and header is not None:
+        hunk_lines.append("--- " + pending_old)
+    close_hunk()
+    if old_path is not None:
+        yield FileDiff(old_path, new_path, tuple(hunks))
+
+
+def parse_unified_diff(text: str) -> UnifiedDiff:
+    return UnifiedDiff(files=tuple(iter_file_diffs(text.splitlines())))
+
+
+def patch_content_hash(patch_text: str, diff: UnifiedDiff | None = None) -> str:
+    # Text that does not parse as a unified diff is hashed verbatim, so two
+    # different free-form proposals never collide on the empty diff.
+    diff = diff if diff is not None else parse_unified_diff(patch_text)
+    if diff.files:
+        return diff.content_hash
+    return hashlib.sha256(patch_text.encode("utf-8")).hexdigest()
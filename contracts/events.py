@@ -8,6 +8,8 @@ class PipelineEvent(str, Enum):
     PATCH_GENERATED = "PatchGenerated"
     VERIFICATION_COMPLETED = "VerificationCompleted"
     APPROVAL_PACKAGE_READY = "ApprovalPackageReady"
+    PR_PUBLISHED = "PullRequestPublished"
+    PR_PUBLISH_FAILED = "PullRequestPublishFailed"
     INCIDENT_ESCALATED = "IncidentEscalated"
     INCIDENT_APPROVED = "IncidentApproved"
     INCIDENT_REJECTED = "IncidentRejected"
@@ -5,11 +5,13 @@ from datetime import datetime, timezone
 from enum import Enum
 from typing import Any
 
+from contracts.clock import SYSTEM_CLOCK, Clock
+from contracts.diff import UnifiedDiff, parse_unified_diff, patch_content_hash
 from contracts.events import PipelineEvent
 
 
-def utcnow_iso() -> str:
-    return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+def utcnow_iso(clock: Clock | None = None) -> str:
+    return (clock or SYSTEM_CLOCK).iso()
 
 
 def parse_iso(value: str) -> datetime:
@@ -35,7 +37,7 @@ def dataclass_from_dict(data_class: type[Any], payload: dict[str, Any]) -> Any:
 
 def to_primitive(value: Any) -> Any:
     if is_dataclass(value):
-        return {key: to_primitive(val) for key, val in value.__dict__.items()}
+        return {key: to_primitive(val) for key, val in value.__dict__.items() if not key.startswith("_")}
     if isinstance(value, Enum):
         return value.value
     if isinstance(value, dict):
@@ -123,6 +125,25 @@ class PatchProposal:
     hypothesis: str
     risk_level: str
     patch_text: str
+    source: str = "generator"
+
+    def __post_init__(self) -> None:
+        if not self.changed_files and self.patch_text:
+            self.changed_files = list(self.diff.changed_files)
+
+    @property
+    def diff(self) -> UnifiedDiff:
+        # Parsed once per patch text and kept under a private key, which
+        # to_primitive skips; reassigning patch_text invalidates it.
+        cached = self.__dict__.get("_diff")
+        if cached is None or cached[0] is not self.patch_text:
+            cached = (self.patch_text, parse_unified_diff(self.patch_text))
+            self.__dict__["_diff"] = cached
+        return cached[1]
+
+    @property
+    def content_hash(self) -> str:
+        return patch_content_hash(self.patch_text, self.diff)
 
 
 @dataclass
@@ -131,6 +152,8 @@ class VerificationReport:
     canary_replay_result: dict[str, Any]
     regression_flags: list[str]
     pass_fail: bool
+    durations_ms: dict[str, float] = field(default_factory=dict)
+    cache_hit: bool = False
 
 
 @dataclass
@@ -149,6 +172,11 @@ class PatternRecord:
     fix_signature: str
     outcome: str
     created_at: str = field(default_factory=utcnow_iso)
+    incident_id: str = ""
+    patch_text: str = ""
+    changed_files: list[str] = field(default_factory=list)
+    evidence_terms: list[str] = field(default_factory=list)
+    risk_level: str = ""
 
 
 @dataclass
@@ -172,6 +200,8 @@ class IncidentRecord:
     verification: VerificationReport | None = None
     approval_package: ApprovalPackage | None = None
     patch_attempts: int = 0
+    deadline_seconds: float | None = None
+    stage_durations_ms: dict[str, float] = field(default_factory=dict)
     created_at: str = field(default_factory=utcnow_iso)
     updated_at: str = field(default_factory=utcnow_iso)
     started_at: str = field(default_factory=utcnow_iso)
@@ -183,8 +213,8 @@ class IncidentRecord:
         start = parse_iso(self.started_at)
         return max(0.0, (end - start).total_seconds())
 
-    def mark_updated(self) -> None:
-        self.updated_at = utcnow_iso()
+    def mark_updated(self, clock: Clock | None = None) -> None:
+        self.updated_at = utcnow_iso(clock)
 
 
 @dataclass
@@ -202,10 +232,30 @@ class ApproveRequest:
         )
 
 
+_TRUE_VALUES = ("1", "true", "yes")
+_FALSE_VALUES = ("", "0", "false", "no")
+
+
+def parse_flag(value: Any, field_name: str) -> bool:
+    if isinstance(value, bool):
+        return value
+    if value is None:
+        return False
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str) and value.strip().lower() in _TRUE_VALUES + _FALSE_VALUES:
+        return value.strip().lower() in _TRUE_VALUES
+    raise ValueError(f"{field_name} must be a boolean, got {value!r}.")
+
+
 @dataclass
 class RetryRequest:
     stage: str = "triage"
+    force_verification: bool = False
 
     @classmethod
     def from_dict(cls, payload: dict[str, Any]) -> "RetryRequest":
-        return cls(stage=str(payload.get("stage", "triage")))
+        return cls(
+            stage=str(payload.get("stage", "triage")),
+            force_verification=parse_flag(payload.get("force_verification"), "force_verification"),
+        )
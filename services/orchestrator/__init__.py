@@ -1,3 +1,18 @@
-from services.orchestrator.engine import SentinelEngine
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from services.orchestrator.engine import SentinelEngine
 
 __all__ = ["SentinelEngine"]
+
+
+def __getattr__(name: str) -> Any:
+    # Resolved on first access so importing a submodule such as the API app
+    # does not drag in the engine and its tool stack.
+    if name == "SentinelEngine":
+        from services.orchestrator.engine import SentinelEngine
+
+        return SentinelEngine
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
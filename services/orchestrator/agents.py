@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from itertools import islice
 
+from contracts.clock import SYSTEM_CLOCK, Clock
+from contracts.deadline import check_deadline
 from contracts.models import (
     ApprovalPackage,
     IncidentEnvelope,
@@ -12,9 +14,11 @@ from contracts.models import (
     Severity,
     VerificationReport,
 )
+from services.orchestrator.analytics import analyze_metrics
 from services.tools.azure_monitor import AzureMonitorTool
 from services.tools.copilot_agent import CopilotPatchGenerator
 from services.tools.github_client import PullRequestInfo
+from services.tools.log_index import tokenize
 from storage.pattern_store import PatternStore
 
 
@@ -30,15 +34,19 @@ class TriageAgent:
     def __init__(self, autonomous_envs: tuple[str, ...]) -> None:
         self.autonomous_envs = set(autonomous_envs)
 
-    def evaluate(self, incident: IncidentEnvelope, has_duplicates: bool) -> TriageResult:
+    @staticmethod
+    def severity_for(incident: IncidentEnvelope) -> Severity:
         error_rate = float(incident.signal_payload.get("error_rate", 0.0))
-        severity = Severity.LOW
         if error_rate >= 0.20:
-            severity = Severity.CRITICAL
-        elif error_rate >= 0.12:
-            severity = Severity.HIGH
-        elif error_rate >= 0.05:
-            severity = Severity.MEDIUM
+            return Severity.CRITICAL
+        if error_rate >= 0.12:
+            return Severity.HIGH
+        if error_rate >= 0.05:
+            return Severity.MEDIUM
+        return Severity.LOW
+
+    def evaluate(self, incident: IncidentEnvelope, has_duplicates: bool) -> TriageResult:
+        severity = self.severity_for(incident)
 
         if has_duplicates:
             return TriageResult(
@@ -73,30 +81,79 @@ class TriageAgent:
 
 
 class InvestigationAgent:
-    def __init__(self, azure_tool: AzureMonitorTool, pattern_store: PatternStore) -> None:
+    def __init__(
+        self,
+        azure_tool: AzureMonitorTool,
+        pattern_store: PatternStore,
+        max_log_evidence: int = 5,
+    ) -> None:
         self.azure_tool = azure_tool
         self.pattern_store = pattern_store
+        self.max_log_evidence = max_log_evidence
 
     def investigate(self, incident: IncidentEnvelope) -> InvestigationPacket:
-        deployments = self.azure_tool.get_recent_deployments(incident.service, incident.env)
-        metrics = self.azure_tool.query_metrics(incident.service, incident.env, metric_name="http_5xx_rate")
-        logs = self.azure_tool.query_logs(incident.service, incident.env)
+        latest_deployment = next(self.azure_tool.iter_recent_deployments(incident.service, incident.env), None)
 
         confidence = 0.30
         reason_parts = []
 
         suspected_release = "unknown"
-        if deployments:
-            suspected_release = deployments[0].get("version", deployments[0].get("deployment_id", "unknown"))
+        deployment_time = None
+        if latest_deployment:
+            suspected_release = latest_deployment.get("version", latest_deployment.get("deployment_id", "unknown"))
+            deployment_time = latest_deployment.get("timestamp")
             confidence += 0.25
             reason_parts.append(f"Error spike follows deployment {suspected_release}.")
 
-        max_5xx_rate = max((float(metric.get("value", 0.0)) for metric in metrics), default=0.0)
+        check_deadline("investigation")
+        series = analyze_metrics(
+            self.azure_tool.iter_metrics(incident.service, incident.env),
+            deployment_time=deployment_time,
+        )
+        error_series = [item for item in series if item.metric == "http_5xx_rate"]
+        latency_series = [item for item in series if item.metric == "p95_latency_ms"]
+
+        max_5xx_rate = max((item.max for item in error_series), default=0.0)
         if max_5xx_rate >= 0.05:
             confidence += 0.20
             reason_parts.append(f"Observed elevated 5xx rate at {max_5xx_rate:.2f}.")
 
-        log_messages = [str(item.get("message", "")) for item in logs if item.get("level") in {"ERROR", "CRITICAL"}]
+        signal_baseline = float(incident.signal_payload.get("baseline_error_rate", 0.0))
+        baseline_5xx_rate = max(
+            (item.pre_deploy_mean for item in error_series if item.pre_deploy_mean is not None),
+            default=signal_baseline,
+        )
+        post_deploy_5xx_rate = max(
+            (item.post_deploy_mean for item in error_series if item.post_deploy_mean is not None),
+            default=None,
+        )
+        post_deploy_5xx_delta = None
+        if post_deploy_5xx_rate is not None:
+            post_deploy_5xx_delta = post_deploy_5xx_rate - baseline_5xx_rate
+            if post_deploy_5xx_delta >= 0.05:
+                confidence += 0.05
+                reason_parts.append(
+                    f"5xx rate rose from {baseline_5xx_rate:.2f} to {post_deploy_5xx_rate:.2f} after deployment."
+                )
+
+        latency_regressions = [
+            item
+            for item in latency_series
+            if item.pre_deploy_mean and item.post_deploy_mean
+            and item.post_deploy_mean >= 1.5 * item.pre_deploy_mean
+        ]
+        if latency_regressions:
+            confidence += 0.05
+            reason_parts.append("p95 latency regressed after deployment.")
+
+        check_deadline("investigation")
+        error_logs = self.azure_tool.iter_logs(
+            incident.service,
+            incident.env,
+            levels=("ERROR", "CRITICAL"),
+            newest_first=True,
+        )
+        log_messages = [str(item.get("message", "")) for item in islice(error_logs, self.max_log_evidence)]
         if log_messages:
             confidence += 0.20
             reason_parts.append("Error logs indicate upstream timeout/retry exhaustion.")
@@ -110,30 +167,79 @@ class InvestigationAgent:
         if not reason_parts:
             reason_parts.append("Insufficient telemetry correlation for root-cause confidence.")
 
+        elevated_threshold = max(0.05, baseline_5xx_rate * 2)
         endpoints = sorted(
-            set(
-                metric.get("endpoint") for metric in metrics if metric.get("endpoint")
-            )
+            {item.endpoint for item in error_series if item.max >= elevated_threshold}
         ) or [str(incident.signal_payload.get("endpoint", "global"))]
         correlated_metrics = {
             "max_5xx_rate": max_5xx_rate,
-            "metric_points": len(metrics),
+            "baseline_5xx_rate": baseline_5xx_rate,
+            "post_deploy_5xx_rate": post_deploy_5xx_rate,
+            "post_deploy_5xx_delta": post_deploy_5xx_delta,
+            "max_p95_latency_ms": max((item.max for item in latency_series), default=None),
+            "metric_points": sum(item.points for item in series),
             "log_points": len(log_messages),
-            "deployments_seen": len(deployments),
+            "series": {
+                f"{item.metric}:{item.endpoint}": item.to_dict()
+                for item in series
+                if item.endpoint in endpoints
+            },
         }
         return InvestigationPacket(
             suspected_release=suspected_release,
             affected_endpoints=endpoints,
             correlated_metrics=correlated_metrics,
-            log_evidence=log_messages[:5],
+            log_evidence=log_messages,
             confidence=confidence,
             reason=" ".join(reason_parts),
         )
 
 
+def evidence_terms(investigation: InvestigationPacket) -> list[str]:
+    terms = {token for line in investigation.log_evidence for token in tokenize(line)}
+    return sorted(term for term in terms if len(term) > 3 and not term.isdigit())
+
+
 class PatchAgent:
-    def __init__(self, generator: CopilotPatchGenerator) -> None:
+    def __init__(
+        self,
+        generator: CopilotPatchGenerator,
+        pattern_store: PatternStore | None = None,
+        min_evidence_overlap: float = 0.5,
+    ) -> None:
         self.generator = generator
+        self.pattern_store = pattern_store
+        self.min_evidence_overlap = min_evidence_overlap
+
+    def _evidence_consistent(self, stored: list[str], current: list[str]) -> bool:
+        if not stored and not current:
+            return True
+        stored_terms, current_terms = set(stored), set(current)
+        overlap = len(stored_terms & current_terms) / len(stored_terms | current_terms)
+        return overlap >= self.min_evidence_overlap
+
+    def reuse_proven_fix(
+        self,
+        incident: IncidentEnvelope,
+        investigation: InvestigationPacket,
+        attempt: int,
+    ) -> PatchProposal | None:
+        if self.pattern_store is None:
+            return None
+        pattern = self.pattern_store.find_reusable_fix(incident.fingerprint)
+        if pattern is None or not self._evidence_consistent(pattern.evidence_terms, evidence_terms(investigation)):
+            return None
+        return PatchProposal(
+            repo=self.generator.repo_slug,
+            branch=f"sentinel/{incident.incident_id}-attempt-{attempt}",
+            changed_files=list(pattern.changed_files),
+            diff_summary=pattern.fix_signature,
+            hypothesis=investigation.reason,
+            # Records saved before risk was stored get no benefit of the doubt.
+            risk_level=pattern.risk_level or "medium",
+            patch_text=pattern.patch_text,
+            source=f"pattern:{pattern.incident_id}",
+        )
 
     def propose_patch(
         self,
@@ -141,12 +247,19 @@ class PatchAgent:
         investigation: InvestigationPacket,
         attempt: int,
     ) -> PatchProposal:
+        # Only the first attempt reuses a proven fix; if it no longer verifies,
+        # later attempts fall back to the generator.
+        if attempt == 1:
+            reused = self.reuse_proven_fix(incident, investigation, attempt)
+            if reused is not None:
+                return reused
         return self.generator.generate_patch(incident, investigation, attempt=attempt)
 
 
 class ApprovalAgent:
-    def __init__(self, base_branch: str) -> None:
+    def __init__(self, base_branch: str, clock: Clock | None = None) -> None:
         self.base_branch = base_branch
+        self.clock = clock or SYSTEM_CLOCK
 
     def build_approval_package(
         self,
@@ -178,7 +291,7 @@ class ApprovalAgent:
             "env": incident.env,
             "max_5xx_rate": investigation.correlated_metrics.get("max_5xx_rate"),
             "canary_post_patch_5xx_rate": verification.canary_replay_result.get("post_patch_5xx_rate"),
-            "generated_at": datetime.now(timezone.utc).replace(microsecond=0).isoformat(),
+            "generated_at": self.clock.iso(),
         }
         rca_summary = (
             f"Deployment {investigation.suspected_release} introduced elevated 5xx responses "
@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from datetime import timezone
+from typing import Any, Iterable
+
+import numpy as np
+
+from contracts.models import parse_iso
+
+
+DEFAULT_BASELINE_WINDOW = 30
+PERCENTILES = (50.0, 95.0, 99.0)
+
+
+def _parse_one(value: str) -> np.datetime64:
+    try:
+        parsed = parse_iso(value)
+    except ValueError:
+        return np.datetime64("NaT", "ms")
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return np.datetime64(parsed, "ms")
+
+
+def to_datetime64(timestamps: Iterable[str | None]) -> np.ndarray:
+    # Missing or unparseable timestamps come back as NaT. UTC timestamps (the
+    # common case) are parsed in one vectorised pass; other offsets fall back
+    # to parse_iso one at a time.
+    text = np.array([value or "" for value in timestamps], dtype=str)
+    parsed = np.full(text.shape, np.datetime64("NaT", "ms"))
+    if text.size == 0:
+        return parsed
+    text = np.char.replace(np.char.replace(text, "+00:00", ""), "Z", "")
+    naive = (np.char.str_len(text) >= 10) & (np.char.find(text, "+") < 0) & (np.char.rfind(text, "-") < 10)
+    try:
+        parsed[naive] = text[naive].astype("datetime64[ms]")
+    except ValueError:
+        for index in np.flatnonzero(naive):
+            parsed[index] = _parse_one(str(text[index]))
+    for index in np.flatnonzero(~naive & (text != "")):
+        parsed[index] = _parse_one(str(text[index]))
+    return parsed
+
+
+def to_epoch_seconds(timestamps: Iterable[str | None]) -> np.ndarray:
+    return to_datetime64(timestamps).astype(np.int64) // 1000
+
+
+@dataclass(frozen=True)
+class MetricFrame:
+    keys: tuple[tuple[str, str], ...]
+    group_ids: np.ndarray
+    timestamps: np.ndarray
+    values: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.values.shape[0])
+
+    @classmethod
+    def from_records(cls, metrics: Iterable[dict[str, Any]]) -> "MetricFrame":
+        key_index: dict[tuple[str, str], int] = {}
+        group_ids: list[int] = []
+        timestamps: list[str | None] = []
+        values: list[float] = []
+        for metric in metrics:
+            key = (str(metric.get("name", "unknown")), str(metric.get("endpoint") or "global"))
+            group_ids.append(key_index.setdefault(key, len(key_index)))
+            timestamps.append(metric.get("timestamp"))
+            values.append(float(metric.get("value", 0.0)))
+        # Points without a usable timestamp cannot be placed in a series and are dropped.
+        parsed = to_datetime64(timestamps)
+        valid = ~np.isnat(parsed)
+        return cls(
+            keys=tuple(key_index),
+            group_ids=np.asarray(group_ids, dtype=np.int64)[valid],
+            timestamps=parsed[valid].astype(np.int64) // 1000,
+            values=np.asarray(values, dtype=np.float64)[valid],
+        )
+
+    @classmethod
+    def from_arrays(
+        cls,
+        keys: Iterable[tuple[str, str]],
+        group_ids: np.ndarray,
+        timestamps: np.ndarray,
+        values: np.ndarray,
+    ) -> "MetricFrame":
+        return cls(
+            keys=tuple(keys),
+            group_ids=np.asarray(group_ids, dtype=np.int64),
+            timestamps=np.asarray(timestamps, dtype=np.int64),
+            values=np.asarray(values, dtype=np.float64),
+        )
+
+
+@dataclass(frozen=True)
+class SeriesStats:
+    metric: str
+    endpoint: str
+    points: int
+    latest: float
+    mean: float
+    max: float
+    p50: float
+    p95: float
+    p99: float
+    trailing_baseline: float | None
+    rate_of_change_per_min: float | None
+    pre_deploy_mean: float | None
+    post_deploy_mean: float | None
+
+    @property
+    def deploy_delta(self) -> float | None:
+        if self.pre_deploy_mean is None or self.post_deploy_mean is None:
+            return None
+        return self.post_deploy_mean - self.pre_deploy_mean
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "points": self.points,
+            "latest": self.latest,
+            "mean": self.mean,
+            "max": self.max,
+            "p50": self.p50,
+            "p95": self.p95,
+            "p99": self.p99,
+            "trailing_baseline": self.trailing_baseline,
+            "rate_of_change_per_min": self.rate_of_change_per_min,
+            "pre_deploy_mean": self.pre_deploy_mean,
+            "post_deploy_mean": self.post_deploy_mean,
+            "deploy_delta": self.deploy_delta,
+        }
+
+
+def _optional(value: float) -> float | None:
+    return None if math.isnan(value) else float(value)
+
+
+def _safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    result = np.full(numerator.shape, np.nan, dtype=np.float64)
+    np.divide(numerator, denominator, out=result, where=denominator > 0)
+    return result
+
+
+def compute_series_stats(
+    frame: MetricFrame,
+    deployment_epoch: int | None = None,
+    baseline_window: int = DEFAULT_BASELINE_WINDOW,
+) -> list[SeriesStats]:
+    total = len(frame)
+    if total == 0:
+        return []
+
+    # Sort once by (series, time) so every series is a contiguous slice and
+    # all per-series reductions become segment reductions over the same array.
+    group_ids, timestamps, values = frame.group_ids, frame.timestamps, frame.values
+    group_step = np.diff(group_ids)
+    if not np.all((group_step > 0) | ((group_step == 0) & (np.diff(timestamps) >= 0))):
+        order = np.lexsort((timestamps, group_ids))
+        group_ids = group_ids[order]
+        timestamps = timestamps[order]
+        values = values[order]
+
+    starts = np.flatnonzero(np.r_[True, group_ids[1:] != group_ids[:-1]])
+    ends = np.r_[starts[1:], total]
+    counts = ends - starts
+    last_index = ends - 1
+
+    sums = np.add.reduceat(values, starts)
+    maxima = np.maximum.reduceat(values, starts)
+    means = sums / counts
+    latest = values[last_index]
+
+    # Segment-wise sorts stay cache-local and beat one global lexsort on
+    # (series, value) by an order of magnitude for long series.
+    sorted_values = np.empty_like(values)
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        sorted_values[start:end] = np.sort(values[start:end])
+    percentiles: dict[float, np.ndarray] = {}
+    for quantile in PERCENTILES:
+        position = starts + (quantile / 100.0) * (counts - 1)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.ceil(position).astype(np.int64)
+        fraction = position - lower
+        percentiles[quantile] = sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+
+    # Mean of the baseline_window points that precede each series' latest point.
+    cumulative = np.concatenate(([0.0], np.cumsum(values)))
+    window_start = np.maximum(starts, last_index - max(1, baseline_window))
+    trailing_baseline = _safe_divide(
+        cumulative[last_index] - cumulative[window_start],
+        (last_index - window_start).astype(np.float64),
+    )
+
+    previous_index = np.where(counts > 1, last_index - 1, last_index)
+    elapsed_minutes = (timestamps[last_index] - timestamps[previous_index]) / 60.0
+    rate_of_change = _safe_divide(latest - values[previous_index], elapsed_minutes)
+
+    if deployment_epoch is not None:
+        pre_mask = timestamps < deployment_epoch
+        pre_counts = np.add.reduceat(pre_mask.astype(np.float64), starts)
+        pre_sums = np.add.reduceat(np.where(pre_mask, values, 0.0), starts)
+        pre_means = _safe_divide(pre_sums, pre_counts)
+        post_means = _safe_divide(sums - pre_sums, counts - pre_counts)
+    else:
+        pre_means = np.full(counts.shape, np.nan)
+        post_means = np.full(counts.shape, np.nan)
+
+    stats: list[SeriesStats] = []
+    for position, group_id in enumerate(group_ids[starts]):
+        metric, endpoint = frame.keys[int(group_id)]
+        stats.append(
+            SeriesStats(
+                metric=metric,
+                endpoint=endpoint,
+                points=int(counts[position]),
+                latest=float(latest[position]),
+                mean=float(means[position]),
+                max=float(maxima[position]),
+                p50=float(percentiles[50.0][position]),
+                p95=float(percentiles[95.0][position]),
+                p99=float(percentiles[99.0][position]),
+                trailing_baseline=_optional(trailing_baseline[position]),
+                rate_of_change_per_min=_optional(rate_of_change[position]),
+                pre_deploy_mean=_optional(pre_means[position]),
+                post_deploy_mean=_optional(post_means[position]),
+            )
+        )
+    return stats
+
+
+def analyze_metrics(
+    metrics: Iterable[dict[str, Any]] | MetricFrame,
+    deployment_time: str | None = None,
+    baseline_window: int = DEFAULT_BASELINE_WINDOW,
+) -> list[SeriesStats]:
+    frame = metrics if isinstance(metrics, MetricFrame) else MetricFrame.from_records(metrics)
+    deployment_epoch = None
+    if deployment_time:
+        parsed = to_datetime64([deployment_time])[0]
+        if not np.isnat(parsed):
+            deployment_epoch = int(parsed.astype(np.int64)) // 1000
+    return compute_series_stats(frame, deployment_epoch=deployment_epoch, baseline_window=baseline_window)
@@ -1,6 +1,11 @@
 from __future__ import annotations
 
+import hmac
+import logging
+import threading
 import uuid
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, Callable
 
 from contracts import (
     ApprovalPackage,
@@ -10,16 +15,96 @@ from contracts import (
     to_primitive,
     utcnow_iso,
 )
-from services.orchestrator.engine import SentinelEngine
+from services.orchestrator.profiler import ProfilerBusyError, SamplingProfiler
+from services.orchestrator.telemetry import set_span_exporter
+from services.orchestrator.trace_export import BatchedFileSpanExporter
 
 try:
-    from fastapi import FastAPI, HTTPException
+    from fastapi import FastAPI, Header, HTTPException
+    from fastapi.responses import JSONResponse, PlainTextResponse, Response
 except ImportError as exc:  # pragma: no cover - runtime dependency guard
     raise RuntimeError("FastAPI is required to run the Sentinel API service.") from exc
 
 
-app = FastAPI(title="Sentinel Orchestrator", version="0.1.0")
-engine = SentinelEngine()
+if TYPE_CHECKING:
+    from services.orchestrator.engine import SentinelEngine
+
+
+logger = logging.getLogger(__name__)
+
+engine: SentinelEngine | None = None
+_engine_lock = threading.Lock()
+_warmup_error: BaseException | None = None
+
+
+def get_engine() -> SentinelEngine:
+    # Built on first use rather than at import: the engine pulls in the tool
+    # stack, numpy and the SQLite stores, none of which /health needs.
+    global engine
+    current = engine
+    if current is None:
+        with _engine_lock:
+            if engine is None:
+                from services.orchestrator.engine import SentinelEngine
+
+                engine = SentinelEngine()
+            current = engine
+    return current
+
+
+def _start_background_services(stops: list[Callable[[], None]]) -> None:
+    current = get_engine()
+    stops.append(current.close)
+    current.pr_publisher.start()
+    settings = current.settings
+    if settings.trace_export_dir:
+        exporter = BatchedFileSpanExporter(
+            settings.trace_export_dir,
+            max_queue_size=settings.trace_export_queue_size,
+            max_file_bytes=int(settings.trace_export_max_file_mb * 1024 * 1024),
+            max_files=settings.trace_export_max_files,
+        )
+        exporter.start()
+        set_span_exporter(exporter)
+
+        def stop_exporter() -> None:
+            set_span_exporter(None)
+            exporter.shutdown()
+
+        stops.append(stop_exporter)
+
+
+def _warm_up(stops: list[Callable[[], None]]) -> None:
+    # Nothing joins this thread until shutdown, so a failure is kept for
+    # /ready to report instead of dying with the thread.
+    global _warmup_error
+    try:
+        _start_background_services(stops)
+    except BaseException as exc:
+        logger.exception("Engine warm-up failed")
+        _warmup_error = exc
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    # The engine is warmed off the event loop so the worker accepts
+    # connections and answers /health straight away; /ready reports when
+    # the warm-up is done, and a request that needs the engine sooner waits.
+    global _warmup_error
+    _warmup_error = None
+    stops: list[Callable[[], None]] = []
+    warmup = threading.Thread(target=_warm_up, args=(stops,), name="engine-warmup", daemon=True)
+    warmup.start()
+    try:
+        yield
+    finally:
+        warmup.join()
+        for stop in reversed(stops):
+            stop()
+
+
+app = FastAPI(title="Sentinel Orchestrator", version="0.1.0", lifespan=lifespan)
+profiler = SamplingProfiler()
 
 
 def _ensure_incident_payload(payload: dict) -> dict:
@@ -29,17 +114,73 @@ def _ensure_incident_payload(payload: dict) -> dict:
     return result
 
 
+def _require_admin(token: str | None) -> None:
+    expected = get_engine().settings.admin_token
+    if not expected:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled; set SENTINEL_ADMIN_TOKEN.")
+    if not token or not hmac.compare_digest(token, expected):
+        raise HTTPException(status_code=401, detail="Invalid admin token.")
+
+
 @app.get("/health")
 def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/ready")
+def ready() -> dict[str, str]:
+    if _warmup_error is not None:
+        raise HTTPException(status_code=500, detail=f"Engine failed to start: {_warmup_error}")
+    if engine is None:
+        raise HTTPException(status_code=503, detail="Engine is still starting.")
+    return {"status": "ready"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+    return PlainTextResponse(get_engine().metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.post("/api/v1/admin/profile")
+def profile(
+    payload: dict | None = None,
+    x_sentinel_admin_token: str | None = Header(default=None),
+) -> Response:
+    _require_admin(x_sentinel_admin_token)
+    payload = payload or {}
+    try:
+        duration = min(float(payload.get("duration_seconds", 5.0)), get_engine().settings.profiler_max_seconds)
+        interval = float(payload.get("interval_ms", 10.0)) / 1000.0
+    except (TypeError, ValueError) as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid profile request: {exc}") from exc
+    try:
+        result = profiler.profile(duration, interval, include_idle=bool(payload.get("include_idle", False)))
+    except ProfilerBusyError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    if payload.get("format") == "json":
+        return JSONResponse(
+            {**result.to_dict(), "by_stage": result.by_tag("stage"), "by_incident": result.by_tag("incident")}
+        )
+    return PlainTextResponse(result.collapsed())
+
+
+@app.get("/api/v1/pr-outbox")
+def pr_outbox() -> dict:
+    current = get_engine()
+    return {"counts": current.pr_outbox.counts(), "publisher_running": current.pr_publisher.running}
+
+
+@app.get("/api/v1/tools/resilience")
+def tool_resilience() -> dict:
+    return get_engine().resilience.snapshot()
+
+
 @app.post("/api/v1/incidents")
 def create_incident(payload: dict) -> dict:
     try:
         normalized = _ensure_incident_payload(payload)
         incident = IncidentEnvelope.from_dict(normalized)
-        record = engine.ingest_incident(incident)
+        record = get_engine().ingest_incident(incident)
         return {"incident_id": incident.incident_id, "status": record.status.value}
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
@@ -49,13 +190,13 @@ def create_incident(payload: dict) -> dict:
 
 @app.get("/api/v1/incidents")
 def list_incidents() -> dict:
-    records = engine.list_incidents()
+    records = get_engine().list_incidents()
     return {"incidents": [to_primitive(record) for record in records]}
 
 
 @app.get("/api/v1/incidents/{incident_id}")
 def get_incident(incident_id: str) -> dict:
-    record = engine.get_incident(incident_id)
+    record = get_engine().get_incident(incident_id)
     if not record:
         raise HTTPException(status_code=404, detail="Incident not found.")
     return to_primitive(record)
@@ -65,7 +206,7 @@ def get_incident(incident_id: str) -> dict:
 def approve_incident(incident_id: str, payload: dict) -> dict:
     try:
         request = ApproveRequest.from_dict(payload)
-        transition = engine.approve_incident(incident_id, request)
+        transition = get_engine().approve_incident(incident_id, request)
         return {"state_transition": transition}
     except KeyError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
@@ -77,7 +218,7 @@ def approve_incident(incident_id: str, payload: dict) -> dict:
 def retry_incident(incident_id: str, payload: dict) -> dict:
     try:
         request = RetryRequest.from_dict(payload)
-        record = engine.retry_incident(incident_id, request)
+        record = get_engine().retry_incident(incident_id, request)
         return {"incident_id": incident_id, "status": record.status.value, "stage": record.stage}
     except KeyError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
@@ -103,7 +244,7 @@ def generate_synthetic_5xx(payload: dict | None = None) -> dict:
         "runbook_hint": payload.get("runbook_hint", "rollback_recent_release_or_adjust_timeout"),
     }
     incident = IncidentEnvelope.from_dict(incident_payload)
-    record = engine.ingest_incident(incident)
+    record = get_engine().ingest_incident(incident)
     response = {"incident_id": incident.incident_id, "status": record.status.value}
     if isinstance(record.approval_package, ApprovalPackage):
         response["pr_url"] = record.approval_package.pr_url
@@ -8,6 +8,13 @@ from pathlib import Path
 ROOT_DIR = Path(__file__).resolve().parents[2]
 
 
+def _float_pairs(value: str) -> tuple[tuple[str, float], ...]:
+    return tuple(
+        (name.strip(), float(number))
+        for name, _, number in (item.partition("=") for item in value.split(",") if item.strip())
+    )
+
+
 @dataclass(frozen=True)
 class Settings:
     confidence_threshold: float = 0.65
@@ -19,8 +26,43 @@ class Settings:
     github_repo: str = "demo-service"
     github_mode: str = "mock"
     github_token: str | None = None
+    github_api_url: str = "https://api.github.com"
+    github_timeout_seconds: float = 10.0
+    github_rate_limit_reserve: int = 10
     pattern_db_path: str = str(ROOT_DIR / "storage" / "patterns.db")
     autonomous_envs: tuple[str, ...] = ("prod", "staging")
+    telemetry_cache_ttl_seconds: float = 60.0
+    telemetry_cache_max_entries: int = 256
+    record_path: str | None = None
+    verification_timeout_seconds: float = 900.0
+    verification_suite_timeouts: tuple[tuple[str, float], ...] = ()
+    verification_fail_fast: bool = True
+    verification_cache_path: str | None = None
+    verification_cache_ttl_seconds: float = 86400.0
+    verification_cache_max_entries: int = 512
+    test_repo_path: str | None = None
+    test_commands: tuple[tuple[str, str], ...] = ()
+    test_workers: int = 4
+    incident_deadline_seconds: float = 600.0
+    severity_deadlines: tuple[tuple[str, float], ...] = ()
+    stage_budgets: tuple[tuple[str, float], ...] = ()
+    tool_backoff_base_seconds: float = 0.25
+    tool_backoff_max_seconds: float = 8.0
+    circuit_failure_threshold: int = 5
+    circuit_reset_seconds: float = 30.0
+    telemetry_hedging: bool = False
+    telemetry_hedge_percentile: float = 95.0
+    telemetry_hedge_budget: float = 0.1
+    pr_outbox_path: str | None = None
+    pr_publish_batch_size: int = 10
+    pr_publish_interval_seconds: float = 1.0
+    pr_publish_max_attempts: int = 5
+    admin_token: str | None = None
+    profiler_max_seconds: float = 30.0
+    trace_export_dir: str | None = None
+    trace_export_max_file_mb: float = 8.0
+    trace_export_max_files: int = 5
+    trace_export_queue_size: int = 4096
 
     @classmethod
     def from_env(cls) -> "Settings":
@@ -30,6 +72,14 @@ class Settings:
             for item in env_values.get("SENTINEL_AUTONOMOUS_ENVS", "prod,staging").split(",")
             if item.strip()
         )
+        test_commands = tuple(
+            (name.strip(), command.strip())
+            for name, _, command in (
+                item.partition("=")
+                for item in env_values.get("SENTINEL_TEST_COMMANDS", "").split(";")
+                if item.strip()
+            )
+        )
         return cls(
             confidence_threshold=float(env_values.get("SENTINEL_CONFIDENCE_THRESHOLD", "0.65")),
             max_patch_attempts=int(env_values.get("SENTINEL_MAX_PATCH_ATTEMPTS", "2")),
@@ -40,9 +90,45 @@ class Settings:
             github_repo=env_values.get("SENTINEL_GITHUB_REPO", "demo-service"),
             github_mode=env_values.get("SENTINEL_GITHUB_MODE", "mock"),
             github_token=env_values.get("GITHUB_TOKEN"),
+            github_api_url=env_values.get("SENTINEL_GITHUB_API_URL", "https://api.github.com"),
+            github_timeout_seconds=float(env_values.get("SENTINEL_GITHUB_TIMEOUT_SECONDS", "10")),
+            github_rate_limit_reserve=int(env_values.get("SENTINEL_GITHUB_RATE_LIMIT_RESERVE", "10")),
             pattern_db_path=env_values.get(
                 "SENTINEL_PATTERN_DB_PATH",
                 str(ROOT_DIR / "storage" / "patterns.db"),
             ),
             autonomous_envs=autonomous_envs,
+            telemetry_cache_ttl_seconds=float(env_values.get("SENTINEL_TELEMETRY_CACHE_TTL_SECONDS", "60")),
+            telemetry_cache_max_entries=int(env_values.get("SENTINEL_TELEMETRY_CACHE_MAX_ENTRIES", "256")),
+            record_path=env_values.get("SENTINEL_RECORD_PATH") or None,
+            verification_timeout_seconds=float(env_values.get("SENTINEL_VERIFICATION_TIMEOUT_SECONDS", "900")),
+            verification_suite_timeouts=_float_pairs(env_values.get("SENTINEL_VERIFICATION_SUITE_TIMEOUTS", "")),
+            verification_fail_fast=env_values.get("SENTINEL_VERIFICATION_FAIL_FAST", "true").lower()
+            not in ("0", "false", "no"),
+            verification_cache_path=env_values.get("SENTINEL_VERIFICATION_CACHE_PATH") or None,
+            verification_cache_ttl_seconds=float(env_values.get("SENTINEL_VERIFICATION_CACHE_TTL_SECONDS", "86400")),
+            verification_cache_max_entries=int(env_values.get("SENTINEL_VERIFICATION_CACHE_MAX_ENTRIES", "512")),
+            test_repo_path=env_values.get("SENTINEL_TEST_REPO_PATH") or None,
+            test_commands=test_commands,
+            test_workers=int(env_values.get("SENTINEL_TEST_WORKERS", "4")),
+            incident_deadline_seconds=float(env_values.get("SENTINEL_INCIDENT_DEADLINE_SECONDS", "600")),
+            severity_deadlines=_float_pairs(env_values.get("SENTINEL_SEVERITY_DEADLINES", "")),
+            stage_budgets=_float_pairs(env_values.get("SENTINEL_STAGE_BUDGETS", "")),
+            tool_backoff_base_seconds=float(env_values.get("SENTINEL_TOOL_BACKOFF_BASE_SECONDS", "0.25")),
+            tool_backoff_max_seconds=float(env_values.get("SENTINEL_TOOL_BACKOFF_MAX_SECONDS", "8")),
+            circuit_failure_threshold=int(env_values.get("SENTINEL_CIRCUIT_FAILURE_THRESHOLD", "5")),
+            circuit_reset_seconds=float(env_values.get("SENTINEL_CIRCUIT_RESET_SECONDS", "30")),
+            telemetry_hedging=env_values.get("SENTINEL_TELEMETRY_HEDGING", "false").lower() in ("1", "true", "yes"),
+            telemetry_hedge_percentile=float(env_values.get("SENTINEL_TELEMETRY_HEDGE_PERCENTILE", "95")),
+            telemetry_hedge_budget=float(env_values.get("SENTINEL_TELEMETRY_HEDGE_BUDGET", "0.1")),
+            pr_outbox_path=env_values.get("SENTINEL_PR_OUTBOX_PATH") or None,
+            pr_publish_batch_size=int(env_values.get("SENTINEL_PR_PUBLISH_BATCH_SIZE", "10")),
+            pr_publish_interval_seconds=float(env_values.get("SENTINEL_PR_PUBLISH_INTERVAL_SECONDS", "1")),
+            pr_publish_max_attempts=int(env_values.get("SENTINEL_PR_PUBLISH_MAX_ATTEMPTS", "5")),
+            admin_token=env_values.get("SENTINEL_ADMIN_TOKEN") or None,
+            profiler_max_seconds=float(env_values.get("SENTINEL_PROFILER_MAX_SECONDS", "30")),
+            trace_export_dir=env_values.get("SENTINEL_TRACE_EXPORT_DIR") or None,
+            trace_export_max_file_mb=float(env_values.get("SENTINEL_TRACE_EXPORT_MAX_FILE_MB", "8")),
+            trace_export_max_files=int(env_values.get("SENTINEL_TRACE_EXPORT_MAX_FILES", "5")),
+            trace_export_queue_size=int(env_values.get("SENTINEL_TRACE_EXPORT_QUEUE_SIZE", "4096")),
         )
@@ -1,7 +1,17 @@
 from __future__ import annotations
 
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
 from contracts import (
+    SYSTEM_CLOCK,
     ApproveRequest,
+    Clock,
+    Deadline,
+    DeadlineExceeded,
     Decision,
     IncidentEnvelope,
     IncidentRecord,
@@ -9,23 +19,49 @@ from contracts import (
     PatternRecord,
     PipelineEvent,
     RetryRequest,
+    VerificationReport,
+    run_with_deadline,
     to_primitive,
-    utcnow_iso,
 )
 from services.orchestrator.agents import (
     ApprovalAgent,
     InvestigationAgent,
     PatchAgent,
     TriageAgent,
+    evidence_terms,
 )
 from services.orchestrator.config import Settings
 from services.orchestrator.framework_adapters import detect_framework_status
+from services.orchestrator.metrics import MetricsRegistry
+from services.orchestrator.publisher import PullRequestPublisher
+from services.orchestrator.recording import (
+    RecordingAzureMonitorTool,
+    RecordingCIRunner,
+    RecordingGitHubClient,
+    TrafficRecorder,
+)
 from services.orchestrator.state import IncidentStateStore
-from services.orchestrator.telemetry import traced_span
-from services.tools import CIRunner, CopilotPatchGenerator, GitHubClient, MockAzureMonitorTool
+from services.orchestrator.telemetry import bind_span_tags, span_export_stats, traced_span
+from services.tools import (
+    CachingAzureMonitorTool,
+    CIRunner,
+    CopilotPatchGenerator,
+    GitHubClient,
+    GitHubTransport,
+    HedgedAzureMonitorTool,
+    MockAzureMonitorTool,
+    ResilientAzureMonitorTool,
+    ResilientCIRunner,
+    ResilientGitHubClient,
+    RetryPolicy,
+    SubprocessCIRunner,
+    ToolResilience,
+    telemetry_trace_source,
+)
 from services.tools.github_client import PullRequestInfo
 from services.verification import VerificationRunner
-from storage import PatternStore
+from storage import PatternStore, PullRequestJob, PullRequestOutbox, VerificationCache
+from storage.pr_outbox import PUBLISHED
 
 
 class SentinelEngine:
@@ -36,30 +72,243 @@ class SentinelEngine:
         github_client: GitHubClient | None = None,
         ci_runner: CIRunner | None = None,
         pattern_store: PatternStore | None = None,
+        clock: Clock | None = None,
     ) -> None:
         self.settings = settings or Settings.from_env()
+        self.clock = clock or SYSTEM_CLOCK
         self.framework_status = detect_framework_status()
-        self.state_store = IncidentStateStore()
+        self.metrics = MetricsRegistry()
+        self.stage_latency = self.metrics.histogram(
+            "stage_duration_seconds",
+            "Time spent in each pipeline stage.",
+            ("stage",),
+        )
+        self.tool_latency = self.metrics.histogram(
+            "tool_call_duration_seconds",
+            "Latency of each tool call attempt by backend, operation and outcome.",
+            ("backend", "operation", "outcome"),
+        )
+        self.pipeline_runs = self.metrics.counter(
+            "pipeline_runs_total",
+            "Pipeline runs by the incident status they ended in.",
+            ("status",),
+        )
+        self.state_store = IncidentStateStore(clock=self.clock)
         self.pattern_store = pattern_store or PatternStore(self.settings.pattern_db_path)
         self.azure_tool = azure_tool or MockAzureMonitorTool()
+        # Resources the engine built itself and therefore closes in close().
+        self._resources: list[Any] = []
         self.github_client = github_client or GitHubClient(
             owner=self.settings.github_owner,
             repo=self.settings.github_repo,
             token=self.settings.github_token,
             mode=self.settings.github_mode,
+            api_url=self.settings.github_api_url,
+            timeout_seconds=self.settings.github_timeout_seconds,
+            transport=GitHubTransport(
+                self.settings.github_token,
+                base_url=self.settings.github_api_url,
+                timeout_seconds=self.settings.github_timeout_seconds,
+                rate_limit_reserve=self.settings.github_rate_limit_reserve,
+            ),
+        )
+        if github_client is None:
+            self._resources.append(self.github_client.transport)
+        if ci_runner is None and self.settings.test_repo_path and self.settings.test_commands:
+            ci_runner = SubprocessCIRunner(
+                self.settings.test_repo_path,
+                dict(self.settings.test_commands),
+                base_ref=self.settings.base_branch,
+                max_workers=self.settings.test_workers,
+                timeout_seconds=self.settings.verification_timeout_seconds,
+                canary_trace_source=telemetry_trace_source(self.azure_tool),
+            )
+            self._resources.append(ci_runner)
+        self.ci_runner = ci_runner or CIRunner(canary_trace_source=telemetry_trace_source(self.azure_tool))
+        self.recorder: TrafficRecorder | None = None
+        if self.settings.record_path:
+            self.recorder = TrafficRecorder(self.settings.record_path, repo_slug=self.github_client.repo_slug)
+            self._resources.append(self.recorder)
+            self.azure_tool = RecordingAzureMonitorTool(self.azure_tool, self.recorder)
+            self.github_client = RecordingGitHubClient(self.github_client, self.recorder)
+            self.ci_runner = RecordingCIRunner(self.ci_runner, self.recorder)
+        self.hedged_azure_tool: HedgedAzureMonitorTool | None = None
+        if self.settings.telemetry_hedging:
+            self.hedged_azure_tool = HedgedAzureMonitorTool(
+                self.azure_tool,
+                percentile=self.settings.telemetry_hedge_percentile,
+                budget_ratio=self.settings.telemetry_hedge_budget,
+            )
+            self.azure_tool = self.hedged_azure_tool
+            self._resources.append(self.hedged_azure_tool)
+        # One resilience layer per engine, so breaker state is shared by every
+        # incident that talks to the same backend.
+        self.resilience = ToolResilience(
+            RetryPolicy(
+                attempts=self.settings.tool_retry_attempts,
+                base_delay_seconds=self.settings.tool_backoff_base_seconds,
+                max_delay_seconds=self.settings.tool_backoff_max_seconds,
+            ),
+            failure_threshold=self.settings.circuit_failure_threshold,
+            reset_timeout_seconds=self.settings.circuit_reset_seconds,
+            clock=self.clock,
+            on_call=lambda backend, operation, outcome, seconds: self.tool_latency.observe(
+                seconds, backend=backend, operation=operation, outcome=outcome
+            ),
         )
-        self.ci_runner = ci_runner or CIRunner()
+        self.azure_tool = ResilientAzureMonitorTool(self.azure_tool, self.resilience)
+        self.github_client = ResilientGitHubClient(self.github_client, self.resilience)
+        self.ci_runner = ResilientCIRunner(self.ci_runner, self.resilience)
+        if self.settings.telemetry_cache_ttl_seconds > 0:
+            self.azure_tool = CachingAzureMonitorTool(
+                self.azure_tool,
+                ttl_seconds=self.settings.telemetry_cache_ttl_seconds,
+                max_entries=self.settings.telemetry_cache_max_entries,
+                clock=self.clock.monotonic,
+            )
 
         self.triage_agent = TriageAgent(self.settings.autonomous_envs)
         self.investigation_agent = InvestigationAgent(self.azure_tool, self.pattern_store)
         self.patch_agent = PatchAgent(
             CopilotPatchGenerator(repo_slug=self.github_client.repo_slug),
+            pattern_store=self.pattern_store,
+        )
+        self.verification_cache: VerificationCache | None = None
+        if self.settings.verification_cache_ttl_seconds > 0:
+            self.verification_cache = VerificationCache(
+                self.settings.verification_cache_path
+                or str(Path(self.settings.pattern_db_path).with_name("verification_cache.db")),
+                ttl_seconds=self.settings.verification_cache_ttl_seconds,
+                max_entries=self.settings.verification_cache_max_entries,
+                clock=self.clock,
+            )
+        self.verification_runner = VerificationRunner(
+            self.ci_runner,
+            timeout_seconds=self.settings.verification_timeout_seconds,
+            suite_timeouts=dict(self.settings.verification_suite_timeouts),
+            fail_fast=self.settings.verification_fail_fast,
+            cache=self.verification_cache,
+            base_ref=self.settings.base_branch,
+            clock=self.clock,
+        )
+        self.approval_agent = ApprovalAgent(base_branch=self.settings.base_branch, clock=self.clock)
+        self.pr_outbox = PullRequestOutbox(
+            self.settings.pr_outbox_path or str(Path(self.settings.pattern_db_path).with_name("pr_outbox.db")),
+            clock=self.clock,
+        )
+        # Without a running publisher thread (tests, benchmarks, scripts) jobs
+        # are delivered inline right after they are committed to the outbox.
+        self.pr_publisher = PullRequestPublisher(
+            self.pr_outbox,
+            self.github_client,
+            on_published=self._on_pr_published,
+            on_failed=self._on_pr_publish_failed,
+            batch_size=self.settings.pr_publish_batch_size,
+            interval_seconds=self.settings.pr_publish_interval_seconds,
+            max_attempts=self.settings.pr_publish_max_attempts,
+        )
+        self._register_metrics()
+
+    def close(self) -> None:
+        # The publisher goes first since it still talks to GitHub; the rest
+        # close outermost first, so the recorder outlives the hedging pool.
+        self.pr_publisher.stop()
+        resources, self._resources = self._resources, []
+        for resource in reversed(resources):
+            resource.close()
+
+    def _register_metrics(self) -> None:
+        # Gauges and externally kept counters are read at scrape time, so the
+        # pipeline's hot path only pays for the histogram observations.
+        metrics = self.metrics
+
+        def incidents_by_status() -> dict[tuple[str, ...], float]:
+            counts = Counter(record.status.value for record in self.state_store.list_all())
+            return {(status.value,): float(counts.get(status.value, 0)) for status in IncidentStatus}
+
+        def breakers(value: Callable[[dict], float]) -> dict[tuple[str, ...], float]:
+            return {(name,): float(value(state)) for name, state in self.resilience.snapshot()["breakers"].items()}
+
+        metrics.gauge(
+            "incidents",
+            "Incidents currently held in the state store by status.",
+            incidents_by_status,
+            ("status",),
+        )
+        metrics.gauge("pattern_store_records", "Rows in the pattern store.", lambda: len(self.pattern_store))
+        metrics.gauge(
+            "pr_outbox_jobs",
+            "Draft-PR jobs in the outbox by status; pending is the publication queue depth.",
+            lambda: {(status,): float(count) for status, count in self.pr_outbox.counts().items()},
+            ("status",),
+        )
+        metrics.counter_callback(
+            "tool_retries_total",
+            "Tool call retries by backend.",
+            lambda: {(name,): float(count) for name, count in self.resilience.snapshot()["retries"].items()},
+            ("backend",),
+        )
+        metrics.gauge(
+            "circuit_open",
+            "1 while a backend's circuit breaker is open or half-open.",
+            lambda: breakers(lambda state: state["state"] != "closed"),
+            ("backend",),
         )
-        self.verification_runner = VerificationRunner(self.ci_runner)
-        self.approval_agent = ApprovalAgent(base_branch=self.settings.base_branch)
+        metrics.counter_callback(
+            "circuit_short_circuits_total",
+            "Calls rejected by an open circuit breaker.",
+            lambda: breakers(lambda state: state["short_circuits"]),
+            ("backend",),
+        )
+        metrics.counter_callback(
+            "trace_spans_total",
+            "Spans handed to the local trace exporter by result.",
+            lambda: {(result,): float(span_export_stats().get(result, 0)) for result in ("exported", "dropped")},
+            ("result",),
+        )
+        if isinstance(self.azure_tool, CachingAzureMonitorTool):
+            cache = self.azure_tool
+            metrics.gauge("telemetry_cache_entries", "Entries in the telemetry cache.", lambda: len(cache))
+            metrics.counter_callback(
+                "telemetry_cache_lookups_total",
+                "Telemetry cache lookups by result.",
+                lambda: {("hit",): float(cache.stats.hits), ("miss",): float(cache.stats.misses)},
+                ("result",),
+            )
+        if self.verification_cache is not None:
+            verification_cache = self.verification_cache
+            metrics.gauge(
+                "verification_cache_entries",
+                "Entries in the verification cache.",
+                lambda: len(verification_cache),
+            )
+            metrics.counter_callback(
+                "verification_cache_lookups_total",
+                "Verification cache lookups by result.",
+                lambda: {
+                    ("hit",): float(verification_cache.stats.hits),
+                    ("miss",): float(verification_cache.stats.misses),
+                },
+                ("result",),
+            )
+        if self.hedged_azure_tool is not None:
+            hedging = self.hedged_azure_tool.stats
+            metrics.counter_callback(
+                "telemetry_hedges_total",
+                "Hedged telemetry requests by kind.",
+                lambda: {
+                    ("request",): float(hedging.requests),
+                    ("hedge",): float(hedging.hedges),
+                    ("hedge_win",): float(hedging.hedge_wins),
+                },
+                ("kind",),
+            )
 
     def ingest_incident(self, incident: IncidentEnvelope) -> IncidentRecord:
-        record = IncidentRecord(incident=incident, started_at=utcnow_iso())
+        if self.recorder:
+            self.recorder.record_incident(incident)
+        now = self.clock.iso()
+        record = IncidentRecord(incident=incident, created_at=now, updated_at=now, started_at=now)
         self.state_store.create(record)
         self.state_store.append_event(
             incident.incident_id,
@@ -98,6 +347,7 @@ class SentinelEngine:
                 PipelineEvent.INCIDENT_APPROVED,
                 payload={"approved_by": approve_request.approved_by, "notes": approve_request.notes},
             )
+            self.pattern_store.update_outcome(incident_id, "approved")
         else:
             record.status = IncidentStatus.REJECTED
             record.stage = "rejected"
@@ -107,7 +357,8 @@ class SentinelEngine:
                 PipelineEvent.INCIDENT_REJECTED,
                 payload={"approved_by": approve_request.approved_by, "notes": approve_request.notes},
             )
-        record.mark_updated()
+            self.pattern_store.update_outcome(incident_id, "rejected")
+        record.mark_updated(self.clock)
         return transition
 
     def retry_incident(self, incident_id: str, retry_request: RetryRequest) -> IncidentRecord:
@@ -115,23 +366,80 @@ class SentinelEngine:
         self.state_store.append_event(
             incident_id,
             PipelineEvent.RETRY_TRIGGERED,
-            payload={"requested_stage": retry_request.stage},
+            payload={
+                "requested_stage": retry_request.stage,
+                "force_verification": retry_request.force_verification,
+            },
+        )
+        with self.state_store.locked():
+            record.last_error = None
+            record.finished_at = None
+            record.patch = None
+            record.verification = None
+            record.approval_package = None
+            record.linked_artifacts = {}
+            record.stage_durations_ms = {}
+        self._run_pipeline(
+            incident_id,
+            start_stage=retry_request.stage,
+            force_verification=retry_request.force_verification,
         )
-        record.last_error = None
-        record.finished_at = None
-        record.patch = None
-        record.verification = None
-        record.approval_package = None
-        record.linked_artifacts = {}
-        self._run_pipeline(incident_id, start_stage=retry_request.stage)
         return record
 
-    def _run_pipeline(self, incident_id: str, start_stage: str = "triage") -> None:
+    def _incident_deadline(self, incident: IncidentEnvelope) -> Deadline:
+        severity = self.triage_agent.severity_for(incident)
+        seconds = dict(self.settings.severity_deadlines).get(severity.value, self.settings.incident_deadline_seconds)
+        return Deadline.after(seconds, self.clock)
+
+    def _stage_deadline(self, deadline: Deadline, stage: str) -> Deadline:
+        return deadline.within(dict(self.settings.stage_budgets).get(stage))
+
+    @contextmanager
+    def _timed_stage(self, record: IncidentRecord, stage: str) -> Iterator[None]:
+        started = self.clock.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = self.clock.monotonic() - started
+            self.stage_latency.observe(elapsed, stage=stage)
+            elapsed_ms = elapsed * 1000.0
+            record.stage_durations_ms[stage] = round(record.stage_durations_ms.get(stage, 0.0) + elapsed_ms, 3)
+
+    def _run_pipeline(
+        self,
+        incident_id: str,
+        start_stage: str = "triage",
+        force_verification: bool = False,
+    ) -> None:
         record = self.require_incident(incident_id)
+        deadline = self._incident_deadline(record.incident)
+        record.deadline_seconds = deadline.budget_seconds if deadline.bounded else None
+        started = self.clock.monotonic()
+        try:
+            self._run_stages(record, deadline, start_stage, force_verification)
+        except DeadlineExceeded as exc:
+            # Tool calls still in flight are abandoned; only this thread
+            # touches the pipeline fields of the record (the publisher writes
+            # PR fields under the store lock), so escalation leaves it consistent.
+            self._escalate(record, str(exc), stage=exc.stage, budget_seconds=exc.budget_seconds)
+        finally:
+            self.stage_latency.observe(self.clock.monotonic() - started, stage="pipeline")
+            self.pipeline_runs.inc(status=record.status.value)
+
+    def _run_stages(
+        self,
+        record: IncidentRecord,
+        deadline: Deadline,
+        start_stage: str,
+        force_verification: bool,
+    ) -> None:
         incident = record.incident
+        incident_id = incident.incident_id
 
         if start_stage in {"received", "triage"}:
-            with traced_span("triage", {"incident_id": incident_id, "service": incident.service}):
+            with traced_span("triage", {"incident_id": incident_id, "service": incident.service}), self._timed_stage(
+                record, "triage"
+            ):
                 duplicates = self.state_store.find_recent_duplicates(
                     incident.fingerprint,
                     exclude_incident_id=incident_id,
@@ -151,35 +459,33 @@ class SentinelEngine:
                 record.stage = "triage"
                 if triage_result.status in {IncidentStatus.DUPLICATE, IncidentStatus.BLOCKED}:
                     record.last_error = triage_result.reason
-                    record.finished_at = utcnow_iso()
-                    record.mark_updated()
+                    record.finished_at = self.clock.iso()
+                    record.mark_updated(self.clock)
                     return
 
-        investigation = None
-        with traced_span("investigation", {"incident_id": incident_id}):
+        with traced_span("investigation", {"incident_id": incident_id}), self._timed_stage(record, "investigation"):
             record.status = IncidentStatus.INVESTIGATING
             record.stage = "investigating"
-            record.mark_updated()
-
-            investigation_error = None
-            for attempt in range(1, self.settings.tool_retry_attempts + 1):
-                try:
-                    investigation = self.investigation_agent.investigate(incident)
-                    break
-                except Exception as exc:  # pragma: no cover - defensive path
-                    investigation_error = f"Investigation attempt {attempt} failed: {exc}"
-                    self.state_store.append_event(
-                        incident_id,
-                        PipelineEvent.INVESTIGATION_COMPLETED,
-                        payload={
-                            "attempt": attempt,
-                            "status": "failed",
-                            "error": str(exc),
-                        },
-                    )
+            record.mark_updated(self.clock)
 
-            if investigation is None:
-                self._escalate(record, investigation_error or "Investigation failed.")
+            # Tool calls are retried with backoff by the resilience layer; a
+            # failure that reaches this point has exhausted those retries (or
+            # hit an open circuit), so the incident is escalated.
+            try:
+                investigation = run_with_deadline(
+                    bind_span_tags(lambda: self.investigation_agent.investigate(incident)),
+                    self._stage_deadline(deadline, "investigation"),
+                    "investigation",
+                )
+            except DeadlineExceeded:
+                raise
+            except Exception as exc:
+                self.state_store.append_event(
+                    incident_id,
+                    PipelineEvent.INVESTIGATION_COMPLETED,
+                    payload={"status": "failed", "error": str(exc)},
+                )
+                self._escalate(record, f"Investigation failed: {exc}")
                 return
 
             record.investigation = investigation
@@ -201,25 +507,71 @@ class SentinelEngine:
                 return
 
         with traced_span("patch_and_verify", {"incident_id": incident_id}):
+            failed_attempts: dict[str, tuple[int, VerificationReport]] = {}
             for attempt in range(1, self.settings.max_patch_attempts + 1):
                 record.status = IncidentStatus.PATCHING
                 record.stage = "patching"
-                patch = self.patch_agent.propose_patch(
-                    incident=incident,
-                    investigation=record.investigation,
-                    attempt=attempt,
-                )
+                with traced_span("patching", {"incident_id": incident_id}), self._timed_stage(record, "patching"):
+                    patch = run_with_deadline(
+                        bind_span_tags(
+                            lambda: self.patch_agent.propose_patch(
+                                incident=incident,
+                                investigation=record.investigation,
+                                attempt=attempt,
+                            )
+                        ),
+                        self._stage_deadline(deadline, "patching"),
+                        "patching",
+                    )
                 record.patch_attempts += 1
-                record.patch = patch
+                with self.state_store.locked():
+                    record.patch = patch
                 self.state_store.append_event(
                     incident_id,
                     PipelineEvent.PATCH_GENERATED,
-                    payload={"attempt": attempt, "branch": patch.branch, "files": patch.changed_files},
+                    payload={
+                        "attempt": attempt,
+                        "branch": patch.branch,
+                        "files": patch.changed_files,
+                        "source": patch.source,
+                        "content_hash": patch.content_hash,
+                    },
                 )
 
                 record.status = IncidentStatus.VERIFYING
                 record.stage = "verifying"
-                verification = self.verification_runner.verify(incident, patch)
+                # A candidate with the same diff content as one that already
+                # failed in this run would fail again; reuse its report, unless
+                # the caller asked for every candidate to be verified afresh.
+                duplicate_of, verification = (None, None)
+                if not force_verification:
+                    duplicate_of, verification = failed_attempts.get(patch.content_hash, (None, None))
+                if verification is None:
+                    try:
+                        with traced_span("verification", {"incident_id": incident_id}), self._timed_stage(
+                            record, "verification"
+                        ):
+                            verification = run_with_deadline(
+                                bind_span_tags(
+                                    lambda: self.verification_runner.verify(incident, patch, force=force_verification)
+                                ),
+                                self._stage_deadline(deadline, "verification"),
+                                "verification",
+                            )
+                    except DeadlineExceeded:
+                        raise
+                    except Exception as exc:
+                        # As in investigation: CI calls already went through
+                        # retries and the breaker, so another candidate would
+                        # meet the same outage.
+                        self.state_store.append_event(
+                            incident_id,
+                            PipelineEvent.VERIFICATION_COMPLETED,
+                            payload={"attempt": attempt, "status": "failed", "error": str(exc)},
+                        )
+                        self._escalate(record, f"Verification failed: {exc}")
+                        return
+                    failed_attempts[patch.content_hash] = (attempt, verification)
                 record.verification = verification
                 self.state_store.append_event(
                     incident_id,
@@ -228,10 +580,14 @@ class SentinelEngine:
                         "attempt": attempt,
                         "pass_fail": verification.pass_fail,
                         "regressions": verification.regression_flags,
+                        "cache_hit": verification.cache_hit,
+                        "duplicate_of": duplicate_of,
                     },
                 )
                 if verification.pass_fail:
-                    self._create_approval_package(record)
+                    with traced_span("approval", {"incident_id": incident_id}), self._timed_stage(record, "approval"):
+                        self._create_approval_package(record)
+                    self._dispatch_pr_jobs()
                     return
 
             self._escalate(record, "Verification failed after maximum patch attempts.")
@@ -266,34 +622,36 @@ class SentinelEngine:
             verification=verification,
             package=provisional_package,
         )
-        pr_info = self.github_client.create_draft_pr(
-            title=f"[Sentinel] Fix 5xx regression for {incident.service}",
-            body=pr_body,
-            head_branch=patch.branch,
-            base_branch=self.settings.base_branch,
-        )
-        approval_package = self.approval_agent.build_approval_package(
-            incident=incident,
-            investigation=investigation,
-            patch=patch,
-            verification=verification,
-            pr_info=pr_info,
+        job = self.pr_outbox.enqueue(
+            PullRequestJob(
+                head_branch=patch.branch,
+                incident_id=incident.incident_id,
+                title=placeholder_pr.title,
+                body=pr_body,
+                base_branch=self.settings.base_branch,
+            )
         )
         self.state_store.append_event(
             incident.incident_id,
             PipelineEvent.APPROVAL_PACKAGE_READY,
-            payload={"pr_url": approval_package.pr_url, "body_preview": pr_body[:200]},
+            payload={"pr_url": provisional_package.pr_url, "pr_job": job.head_branch, "body_preview": pr_body[:200]},
         )
 
-        record.approval_package = approval_package
-        record.linked_artifacts = {
-            "pr_url": approval_package.pr_url,
-            "evidence_links": approval_package.evidence_links,
-        }
-        record.status = IncidentStatus.PR_READY
-        record.stage = "approval"
-        record.finished_at = utcnow_iso()
-        record.mark_updated()
+        with self.state_store.locked():
+            record.approval_package = provisional_package
+            record.linked_artifacts = {
+                "pr_url": provisional_package.pr_url,
+                "evidence_links": provisional_package.evidence_links,
+            }
+            record.status = IncidentStatus.PR_READY
+            record.stage = "approval"
+            record.finished_at = self.clock.iso()
+            record.mark_updated(self.clock)
+        if job.status == PUBLISHED and job.pr_url:
+            self._on_pr_published(
+                job,
+                PullRequestInfo(job.pr_url, job.pr_number, job.title, job.head_branch, job.base_branch),
+            )
 
         self.pattern_store.save(
             PatternRecord(
@@ -301,21 +659,69 @@ class SentinelEngine:
                 root_cause=investigation.reason,
                 fix_signature=patch.diff_summary,
                 outcome="pending_approval",
+                created_at=self.clock.iso(),
+                incident_id=incident.incident_id,
+                patch_text=patch.patch_text,
+                changed_files=list(patch.changed_files),
+                evidence_terms=evidence_terms(investigation),
+                risk_level=patch.risk_level,
             )
         )
 
-    def _escalate(self, record: IncidentRecord, reason: str) -> None:
+    def _dispatch_pr_jobs(self) -> None:
+        if self.pr_publisher.running:
+            self.pr_publisher.wake()
+        else:
+            self.pr_publisher.publish_pending()
+
+    def _record_for_job(self, job: PullRequestJob) -> IncidentRecord | None:
+        # Jobs outlive the in-memory records (e.g. across restarts) and an
+        # incident may have been retried onto another branch since.
+        record = self.state_store.get(job.incident_id)
+        if record is None or record.approval_package is None or record.patch is None:
+            return None
+        return record if record.patch.branch == job.head_branch else None
+
+    # Both callbacks usually run on the publisher thread; the store lock keeps
+    # them from interleaving with a retry resetting the same record.
+    def _on_pr_published(self, job: PullRequestJob, pr_info: PullRequestInfo) -> None:
+        with self.state_store.locked():
+            record = self._record_for_job(job)
+            if record is None:
+                return
+            record.approval_package = replace(record.approval_package, pr_url=pr_info.pr_url)
+            record.linked_artifacts["pr_url"] = pr_info.pr_url
+            self.state_store.append_event(
+                job.incident_id,
+                PipelineEvent.PR_PUBLISHED,
+                payload={"pr_url": pr_info.pr_url, "pr_number": pr_info.number, "head_branch": job.head_branch},
+            )
+
+    def _on_pr_publish_failed(self, job: PullRequestJob, error: str) -> None:
+        with self.state_store.locked():
+            record = self._record_for_job(job)
+            if record is None:
+                return
+            record.last_error = f"Draft PR publication failed: {error}"
+            self.state_store.append_event(
+                job.incident_id,
+                PipelineEvent.PR_PUBLISH_FAILED,
+                payload={"head_branch": job.head_branch, "attempts": job.attempts + 1, "error": error},
+            )
+
+    def _escalate(self, record: IncidentRecord, reason: str, **details: object) -> None:
         record.status = IncidentStatus.ESCALATED
         record.stage = "escalated"
         record.last_error = reason
-        record.finished_at = utcnow_iso()
-        record.mark_updated()
+        record.finished_at = self.clock.iso()
+        record.mark_updated(self.clock)
         self.state_store.append_event(
             record.incident.incident_id,
             PipelineEvent.INCIDENT_ESCALATED,
-            payload={"reason": reason},
+            payload={"reason": reason, **details},
         )
 
     def snapshot(self, incident_id: str) -> dict:
         record = self.require_incident(incident_id)
-        return to_primitive(record)
+        with self.state_store.locked():
+            return to_primitive(record)
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import importlib.util
 from dataclasses import dataclass
+from functools import lru_cache
 
 
 @dataclass(frozen=True)
@@ -10,6 +11,7 @@ class FrameworkStatus:
     autogen_available: bool
 
 
+@lru_cache(maxsize=1)
 def detect_framework_status() -> FrameworkStatus:
     semantic_kernel_available = importlib.util.find_spec("semantic_kernel") is not None
     autogen_available = importlib.util.find_spec("autogen") is not None
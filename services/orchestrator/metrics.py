@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import math
+import threading
+from bisect import bisect_left
+from typing import Callable, Iterable, Iterator
+
+DEFAULT_LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+    300.0,
+    600.0,
+)
+
+Sample = tuple[str, tuple[tuple[str, str], ...], float]
+LabelValues = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _label_key(labelnames: tuple[str, ...], labels: dict[str, object]) -> LabelValues:
+    return tuple(str(labels.get(name, "")) for name in labelnames)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: object) -> float:
+        with self._lock:
+            return self._values.get(_label_key(self.labelnames, labels), 0.0)
+
+    def samples(self) -> Iterator[Sample]:
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            yield self.name, tuple(zip(self.labelnames, key)), value
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._local = threading.local()
+        self._shards: list[tuple[threading.Thread, dict[LabelValues, list[float]]]] = []
+        self._retired: dict[LabelValues, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def _shard(self) -> dict[LabelValues, list[float]]:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._lock:
+                # Folding here as well as on scrape keeps the shard list at
+                # the number of live threads even if nobody ever scrapes.
+                self._fold_finished()
+                self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def _fold_finished(self) -> None:
+        # Shards of finished threads (e.g. per-stage deadline workers) are
+        # folded into one accumulator; nothing writes to them any more.
+        live = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                live.append((thread, shard))
+                continue
+            for key, cells in shard.items():
+                total = self._retired.setdefault(key, [0.0] * len(cells))
+                for index, value in enumerate(cells):
+                    total[index] += value
+        self._shards = live
+
+    def observe(self, value: float, **labels: object) -> None:
+        # Every thread writes to its own shard, so observing takes no lock;
+        # scrapes merge the shards. Cells hold per-bucket (not cumulative)
+        # counts, an overflow bucket, then the sum.
+        key = _label_key(self.labelnames, labels)
+        shard = self._shard()
+        cells = shard.get(key)
+        if cells is None:
+            cells = shard[key] = [0.0] * (len(self.buckets) + 2)
+        cells[bisect_left(self.buckets, value)] += 1
+        cells[-1] += value
+
+    def _merged(self) -> dict[LabelValues, list[float]]:
+        with self._lock:
+            self._fold_finished()
+            merged = {key: list(cells) for key, cells in self._retired.items()}
+            shards = [shard for _, shard in self._shards]
+        for shard in shards:
+            for key, cells in list(shard.items()):
+                total = merged.setdefault(key, [0.0] * len(cells))
+                for index, value in enumerate(list(cells)):
+                    total[index] += value
+        return merged
+
+    def count(self, **labels: object) -> int:
+        cells = self._merged().get(_label_key(self.labelnames, labels))
+        return int(sum(cells[:-1])) if cells else 0
+
+    def quantile(self, q: float, **labels: object) -> float | None:
+        # Same estimate as PromQL's histogram_quantile: linear interpolation
+        # inside the bucket that holds the q-th observation.
+        cells = self._merged().get(_label_key(self.labelnames, labels))
+        if not cells:
+            return None
+        counts = cells[:-1]
+        total = sum(counts)
+        if total == 0:
+            return None
+        rank = q * total
+        seen = 0.0
+        for index, count in enumerate(counts):
+            if count and seen + count >= rank:
+                if index >= len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                return lower + (self.buckets[index] - lower) * ((rank - seen) / count)
+            seen += count
+        return self.buckets[-1]
+
+    def samples(self) -> Iterator[Sample]:
+        for key, cells in sorted(self._merged().items()):
+            labels = tuple(zip(self.labelnames, key))
+            cumulative = 0.0
+            for bound, count in zip((*self.buckets, math.inf), cells[:-1]):
+                cumulative += count
+                yield f"{self.name}_bucket", (*labels, ("le", _format_value(bound))), cumulative
+            yield f"{self.name}_sum", labels, cells[-1]
+            yield f"{self.name}_count", labels, cumulative
+
+
+class CallbackMetric:
+    def __init__(
+        self,
+        kind: str,
+        name: str,
+        help_text: str,
+        labelnames: Iterable[str],
+        callback: Callable[[], dict[LabelValues, float] | float],
+    ) -> None:
+        self.kind = kind
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.callback = callback
+
+    def samples(self) -> Iterator[Sample]:
+        values = self.callback()
+        if not isinstance(values, dict):
+            values = {(): values}
+        for key, value in sorted(values.items()):
+            yield self.name, tuple(zip(self.labelnames, key)), float(value)
+
+
+class MetricsRegistry:
+    def __init__(self, namespace: str = "sentinel") -> None:
+        self.namespace = namespace
+        self._metrics: dict[str, Counter | Histogram | CallbackMetric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: Counter | Histogram | CallbackMetric) -> Counter | Histogram | CallbackMetric:
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def _full_name(self, name: str) -> str:
+        return f"{self.namespace}_{name}" if self.namespace else name
+
+    def counter(self, name: str, help_text: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(self._full_name(name), help_text, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(self._full_name(name), help_text, labelnames, buckets))
+
+    def gauge(
+        self,
+        name: str,
+        help_text: str,
+        callback: Callable[[], dict[LabelValues, float] | float],
+        labelnames: Iterable[str] = (),
+    ) -> CallbackMetric:
+        return self._register(CallbackMetric("gauge", self._full_name(name), help_text, labelnames, callback))
+
+    def counter_callback(
+        self,
+        name: str,
+        help_text: str,
+        callback: Callable[[], dict[LabelValues, float] | float],
+        labelnames: Iterable[str] = (),
+    ) -> CallbackMetric:
+        return self._register(CallbackMetric("counter", self._full_name(name), help_text, labelnames, callback))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines: list[str] = []
+        for metric in metrics:
+            try:
+                samples = list(metric.samples())
+            except Exception:  # pragma: no cover - one broken source must not fail the scrape
+                continue
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in samples:
+                if labels:
+                    rendered = ",".join(f'{key}="{_escape(label)}"' for key, label in labels)
+                    lines.append(f"{name}{{{rendered}}} {_format_value(value)}")
+                else:
+                    lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from services.orchestrator.telemetry import SpanTags, thread_span_tags
+
+
+# Leaf frames of threads parked on a lock, queue or socket; sampling them
+# would bury the busy stacks under idle worker pools.
+_IDLE_LEAVES = {
+    ("threading", "wait"),
+    ("threading", "_wait_for_tstate_lock"),
+    ("selectors", "select"),
+    ("queue", "get"),
+    ("socket", "accept"),
+    ("concurrent.futures.thread", "_worker"),
+    ("asyncio.base_events", "_run_once"),
+}
+_THREAD_SUFFIX = re.compile(r"[-_ ]?\(?\d+(?:_\d+)?\)?$")
+
+
+class ProfilerBusyError(RuntimeError):
+    pass
+
+
+@dataclass
+class ProfileResult:
+    duration_seconds: float
+    interval_seconds: float
+    samples: int
+    stacks: Counter[str] = field(default_factory=Counter)
+
+    def collapsed(self) -> str:
+        # Brendan Gregg's folded format: "frame;frame;frame count" per line,
+        # readable by flamegraph.pl, speedscope and inferno.
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def by_tag(self, key: str) -> dict[str, int]:
+        marker = f"[{key}:"
+        totals: Counter[str] = Counter()
+        for stack, count in self.stacks.items():
+            for frame in stack.split(";"):
+                if frame.startswith(marker):
+                    totals[frame[len(marker) : -1]] += count
+                    break
+        return dict(totals)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "duration_seconds": round(self.duration_seconds, 3),
+            "interval_seconds": self.interval_seconds,
+            "samples": self.samples,
+            "stacks": dict(self.stacks.most_common()),
+        }
+
+
+class SamplingProfiler:
+    def __init__(
+        self,
+        interval_seconds: float = 0.01,
+        max_duration_seconds: float = 30.0,
+        max_depth: int = 64,
+        tags: Callable[[], dict[int, SpanTags]] = thread_span_tags,
+    ) -> None:
+        self.interval_seconds = interval_seconds
+        self.max_duration_seconds = max_duration_seconds
+        self.max_depth = max_depth
+        self.tags = tags
+        self._busy = threading.Lock()
+
+    def _stack(self, frame: Any) -> list[str]:
+        frames: list[str] = []
+        while frame is not None and len(frames) < self.max_depth:
+            frames.append(f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}")
+            frame = frame.f_back
+        frames.reverse()
+        return frames
+
+    def sample(self, stacks: Counter[str], include_idle: bool = False) -> int:
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        tags = self.tags()
+        taken = 0
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            if not include_idle and (frame.f_globals.get("__name__"), frame.f_code.co_name) in _IDLE_LEAVES:
+                continue
+            thread_name = _THREAD_SUFFIX.sub("", names.get(ident, "thread")) or "thread"
+            prefix = [thread_name, *(f"[{key}:{value}]" for key, value in tags.get(ident, ()))]
+            stacks[";".join(prefix + self._stack(frame))] += 1
+            taken += 1
+        return taken
+
+    def profile(
+        self,
+        duration_seconds: float,
+        interval_seconds: float | None = None,
+        include_idle: bool = False,
+    ) -> ProfileResult:
+        # Samples every thread's Python stack from this thread; nothing is
+        # installed in the profiled threads, so overhead ends with the call.
+        if not self._busy.acquire(blocking=False):
+            raise ProfilerBusyError("A profile is already running.")
+        try:
+            duration = min(max(0.0, duration_seconds), self.max_duration_seconds)
+            interval = max(0.001, interval_seconds or self.interval_seconds)
+            result = ProfileResult(duration_seconds=0.0, interval_seconds=interval, samples=0)
+            started = time.perf_counter()
+            deadline = started + duration
+            while True:
+                result.samples += self.sample(result.stacks, include_idle)
+                now = time.perf_counter()
+                if now >= deadline:
+                    break
+                time.sleep(min(interval, deadline - now))
+            result.duration_seconds = time.perf_counter() - started
+            return result
+        finally:
+            self._busy.release()
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import threading
+from typing import Callable
+
+from services.tools.github_client import GitHubClient, PullRequestInfo
+from storage.pr_outbox import PullRequestJob, PullRequestOutbox
+
+
+class PullRequestPublisher:
+    def __init__(
+        self,
+        outbox: PullRequestOutbox,
+        github_client: GitHubClient,
+        on_published: Callable[[PullRequestJob, PullRequestInfo], None] | None = None,
+        on_failed: Callable[[PullRequestJob, str], None] | None = None,
+        batch_size: int = 10,
+        interval_seconds: float = 1.0,
+        retry_seconds: float = 30.0,
+        max_attempts: int = 5,
+        lease_seconds: float = 120.0,
+    ) -> None:
+        self.outbox = outbox
+        self.github_client = github_client
+        self.on_published = on_published
+        self.on_failed = on_failed
+        self.batch_size = batch_size
+        self.interval_seconds = interval_seconds
+        self.retry_seconds = retry_seconds
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _publish(self, job: PullRequestJob) -> PullRequestInfo:
+        # A crash after GitHub accepted the PR but before the outbox was
+        # updated leaves the job claimed until its lease expires; adopt the
+        # existing PR on redelivery.
+        existing = self.github_client.find_pull_request(job.head_branch)
+        if existing is not None:
+            return existing
+        return self.github_client.create_draft_pr(job.title, job.body, job.head_branch, job.base_branch)
+
+    def publish_pending(self) -> int:
+        published = 0
+        while True:
+            jobs = self.outbox.claim(self.batch_size, self.lease_seconds)
+            if not jobs:
+                return published
+            for job in jobs:
+                try:
+                    pr_info = self._publish(job)
+                except Exception as exc:
+                    error = f"{type(exc).__name__}: {exc}"
+                    if job.attempts + 1 >= self.max_attempts:
+                        self.outbox.mark_failed(job.head_branch, error, None)
+                        if self.on_failed:
+                            self.on_failed(job, error)
+                    else:
+                        self.outbox.mark_failed(job.head_branch, error, self.retry_seconds * 2**job.attempts)
+                    continue
+                self.outbox.mark_published(job.head_branch, pr_info.pr_url, pr_info.number)
+                published += 1
+                if self.on_published:
+                    self.on_published(job, pr_info)
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.interval_seconds)
+            self._wake.clear()
+            if self._stop.is_set():
+                return
+            try:
+                self.publish_pending()
+            except Exception:  # pragma: no cover - keep the publisher alive across outbox errors
+                continue
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._wake.set()
+        self._thread = threading.Thread(target=self._run, name="pr-publisher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
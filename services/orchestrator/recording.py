@@ -0,0 +1,464 @@
+from __future__ import annotations
+
+import gzip
+import json
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from threading import Lock
+from typing import Any, Callable, Iterable, Iterator
+
+from contracts.clock import SYSTEM_CLOCK, Clock
+from contracts.models import IncidentEnvelope, IncidentRecord, PatchProposal, to_primitive, utcnow_iso
+from services.tools.azure_monitor import AzureMonitorTool
+from services.tools.ci_client import CIRunner
+from services.tools.github_client import GitHubClient, PullRequestInfo
+
+
+LOG_VERSION = 1
+_REPLAYABLE_ERRORS: dict[str, type[Exception]] = {
+    "TimeoutError": TimeoutError,
+    "ConnectionError": ConnectionError,
+    "RuntimeError": RuntimeError,
+    "ValueError": ValueError,
+}
+
+
+def _key(*parts: Any) -> str:
+    return json.dumps(parts, separators=(",", ":"))
+
+
+def _levels_key(levels: Iterable[str] | None) -> list[str] | None:
+    return sorted({str(level).upper() for level in levels}) if levels is not None else None
+
+
+class TrafficRecorder:
+    def __init__(self, path: str | Path, repo_slug: str = "") -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = Lock()
+        self._started = time.monotonic()
+        self._handle = gzip.open(self.path, "wt", encoding="utf-8")
+        self._write({"type": "header", "version": LOG_VERSION, "repo_slug": repo_slug, "started_at": utcnow_iso()})
+
+    def _offset(self) -> float:
+        return round(time.monotonic() - self._started, 6)
+
+    def _write(self, entry: dict[str, Any]) -> None:
+        with self._lock:
+            if self._handle.closed:
+                return
+            self._handle.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    def record_incident(self, incident: IncidentEnvelope) -> None:
+        self._write({"type": "incident", "t": self._offset(), "incident": to_primitive(incident)})
+
+    def record_call(
+        self,
+        tool: str,
+        key: str,
+        started: float,
+        result: Any = None,
+        error: BaseException | None = None,
+    ) -> None:
+        entry: dict[str, Any] = {
+            "type": "call",
+            "t": self._offset(),
+            "tool": tool,
+            "key": key,
+            "duration": round(time.perf_counter() - started, 6),
+        }
+        if error is not None:
+            entry["error"] = {"type": type(error).__name__, "message": str(error)}
+        else:
+            entry["result"] = to_primitive(result)
+        self._write(entry)
+
+    def call(self, tool: str, key: str, action: Callable[[], Any]) -> Any:
+        started = time.perf_counter()
+        try:
+            result = action()
+        except Exception as exc:
+            self.record_call(tool, key, started, error=exc)
+            raise
+        self.record_call(tool, key, started, result=result)
+        return result
+
+    def stream(self, tool: str, key: str, items: Iterator[Any]) -> Iterator[Any]:
+        started = time.perf_counter()
+        consumed: list[Any] = []
+        error: BaseException | None = None
+        try:
+            for item in items:
+                consumed.append(item)
+                yield item
+        except Exception as exc:
+            error = exc
+            raise
+        finally:
+            # Only what the consumer actually pulled is recorded, so replay
+            # reproduces early termination faithfully.
+            self.record_call(tool, key, started, result=consumed, error=error)
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._handle.closed:
+                self._handle.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._handle.closed:
+                self._handle.close()
+
+
+class RecordingAzureMonitorTool(AzureMonitorTool):
+    def __init__(self, backend: AzureMonitorTool, recorder: TrafficRecorder) -> None:
+        self.backend = backend
+        self.recorder = recorder
+
+    def get_recent_deployments(self, service: str, env: str) -> list[dict[str, Any]]:
+        return self.recorder.call(
+            "azure",
+            _key("get_recent_deployments", service, env),
+            lambda: self.backend.get_recent_deployments(service, env),
+        )
+
+    def query_metrics(self, service: str, env: str, metric_name: str | None = None) -> list[dict[str, Any]]:
+        return self.recorder.call(
+            "azure",
+            _key("query_metrics", service, env, metric_name),
+            lambda: self.backend.query_metrics(service, env, metric_name=metric_name),
+        )
+
+    def query_logs(
+        self,
+        service: str,
+        env: str,
+        contains: str | None = None,
+        levels: Iterable[str] | None = None,
+        endpoint: str | None = None,
+        start_time: str | None = None,
+        end_time: str | None = None,
+    ) -> list[dict[str, Any]]:
+        return self.recorder.call(
+            "azure",
+            _key("query_logs", service, env, contains, _levels_key(levels), endpoint, start_time, end_time),
+            lambda: self.backend.query_logs(
+                service,
+                env,
+                contains=contains,
+                levels=levels,
+                endpoint=endpoint,
+                start_time=start_time,
+                end_time=end_time,
+            ),
+        )
+
+    def iter_recent_deployments(self, service: str, env: str) -> Iterator[dict[str, Any]]:
+        return self.recorder.stream(
+            "azure",
+            _key("iter_recent_deployments", service, env),
+            self.backend.iter_recent_deployments(service, env),
+        )
+
+    def iter_metrics(self, service: str, env: str, metric_name: str | None = None) -> Iterator[dict[str, Any]]:
+        return self.recorder.stream(
+            "azure",
+            _key("iter_metrics", service, env, metric_name),
+            self.backend.iter_metrics(service, env, metric_name=metric_name),
+        )
+
+    def iter_logs(
+        self,
+        service: str,
+        env: str,
+        contains: str | None = None,
+        levels: Iterable[str] | None = None,
+        endpoint: str | None = None,
+        start_time: str | None = None,
+        end_time: str | None = None,
+        newest_first: bool = False,
+    ) -> Iterator[dict[str, Any]]:
+        return self.recorder.stream(
+            "azure",
+            _key("iter_logs", service, env, contains, _levels_key(levels), endpoint, start_time, end_time, newest_first),
+            self.backend.iter_logs(
+                service,
+                env,
+                contains=contains,
+                levels=levels,
+                endpoint=endpoint,
+                start_time=start_time,
+                end_time=end_time,
+                newest_first=newest_first,
+            ),
+        )
+
+
+class RecordingCIRunner(CIRunner):
+    def __init__(self, backend: CIRunner, recorder: TrafficRecorder) -> None:
+        super().__init__()
+        self.backend = backend
+        self.recorder = recorder
+        self.test_suites = backend.test_suites
+        self.batch_suites = backend.batch_suites
+
+    def config_fingerprint(self) -> dict[str, Any] | None:
+        return self.backend.config_fingerprint()
+
+    def run_suite(self, patch: PatchProposal, suite: str) -> str:
+        return self.recorder.call(
+            "ci",
+            _key("run_suite", patch.branch, suite),
+            lambda: self.backend.run_suite(patch, suite),
+        )
+
+    def run_tests(self, patch: PatchProposal) -> dict[str, str]:
+        return self.recorder.call("ci", _key("run_tests", patch.branch), lambda: self.backend.run_tests(patch))
+
+    def cancel(self, patch: PatchProposal) -> None:
+        self.backend.cancel(patch)
+
+    def run_canary_replay(self, incident: IncidentEnvelope, patch: PatchProposal) -> dict[str, float | str]:
+        return self.recorder.call(
+            "ci",
+            _key("run_canary_replay", incident.incident_id, patch.branch),
+            lambda: self.backend.run_canary_replay(incident, patch),
+        )
+
+
+class RecordingGitHubClient(GitHubClient):
+    def __init__(self, backend: GitHubClient, recorder: TrafficRecorder) -> None:
+        super().__init__(owner=backend.owner, repo=backend.repo, token=backend.token, mode=backend.mode)
+        self.backend = backend
+        self.recorder = recorder
+        self.created_prs = backend.created_prs
+
+    def find_pull_request(self, head_branch: str) -> PullRequestInfo | None:
+        return self.backend.find_pull_request(head_branch)
+
+    def create_draft_pr(
+        self,
+        title: str,
+        body: str,
+        head_branch: str,
+        base_branch: str = "main",
+    ) -> PullRequestInfo:
+        return self.recorder.call(
+            "github",
+            _key("create_draft_pr", head_branch),
+            lambda: self.backend.create_draft_pr(title, body, head_branch, base_branch),
+        )
+
+
+@dataclass
+class RecordedCall:
+    duration: float
+    result: Any = None
+    error: dict[str, str] | None = None
+
+
+class _CallBook:
+    def __init__(self, calls: dict[str, list[RecordedCall]], speed: float, clock: Clock | None = None) -> None:
+        self._queues = {key: deque(items) for key, items in calls.items()}
+        self._last: dict[str, RecordedCall] = {}
+        self._lock = Lock()
+        self.speed = speed
+        self.clock = clock or SYSTEM_CLOCK
+
+    def take(self, key: str) -> RecordedCall:
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue:
+                call = queue.popleft()
+                self._last[key] = call
+            elif key in self._last:
+                call = self._last[key]
+            else:
+                raise LookupError(f"No recorded response for {key}")
+        if self.speed > 0 and call.duration > 0:
+            self.clock.sleep(call.duration / self.speed)
+        return call
+
+    def result(self, key: str) -> Any:
+        call = self.take(key)
+        if call.error is not None:
+            error_type = _REPLAYABLE_ERRORS.get(call.error["type"], RuntimeError)
+            raise error_type(call.error["message"])
+        return call.result
+
+
+class RecordedAzureMonitorTool(AzureMonitorTool):
+    def __init__(self, book: _CallBook) -> None:
+        self.book = book
+
+    def get_recent_deployments(self, service: str, env: str) -> list[dict[str, Any]]:
+        return self.book.result(_key("get_recent_deployments", service, env))
+
+    def query_metrics(self, service: str, env: str, metric_name: str | None = None) -> list[dict[str, Any]]:
+        return self.book.result(_key("query_metrics", service, env, metric_name))
+
+    def query_logs(
+        self,
+        service: str,
+        env: str,
+        contains: str | None = None,
+        levels: Iterable[str] | None = None,
+        endpoint: str | None = None,
+        start_time: str | None = None,
+        end_time: str | None = None,
+    ) -> list[dict[str, Any]]:
+        return self.book.result(
+            _key("query_logs", service, env, contains, _levels_key(levels), endpoint, start_time, end_time)
+        )
+
+    def iter_recent_deployments(self, service: str, env: str) -> Iterator[dict[str, Any]]:
+        yield from self.book.result(_key("iter_recent_deployments", service, env))
+
+    def iter_metrics(self, service: str, env: str, metric_name: str | None = None) -> Iterator[dict[str, Any]]:
+        yield from self.book.result(_key("iter_metrics", service, env, metric_name))
+
+    def iter_logs(
+        self,
+        service: str,
+        env: str,
+        contains: str | None = None,
+        levels: Iterable[str] | None = None,
+        endpoint: str | None = None,
+        start_time: str | None = None,
+        end_time: str | None = None,
+        newest_first: bool = False,
+    ) -> Iterator[dict[str, Any]]:
+        yield from self.book.result(
+            _key("iter_logs", service, env, contains, _levels_key(levels), endpoint, start_time, end_time, newest_first)
+        )
+
+
+class RecordedCIRunner(CIRunner):
+    def __init__(self, book: _CallBook) -> None:
+        super().__init__()
+        self.book = book
+
+    def run_suite(self, patch: PatchProposal, suite: str) -> str:
+        try:
+            return self.book.result(_key("run_suite", patch.branch, suite))
+        except LookupError:
+            # Captures taken before suites ran individually only hold run_tests.
+            return self.run_tests(patch).get(suite, "failed")
+
+    def run_tests(self, patch: PatchProposal) -> dict[str, str]:
+        return self.book.result(_key("run_tests", patch.branch))
+
+    def run_canary_replay(self, incident: IncidentEnvelope, patch: PatchProposal) -> dict[str, float | str]:
+        return self.book.result(_key("run_canary_replay", incident.incident_id, patch.branch))
+
+
+class RecordedGitHubClient(GitHubClient):
+    def __init__(self, book: _CallBook, repo_slug: str) -> None:
+        owner, _, repo = repo_slug.partition("/")
+        super().__init__(owner=owner, repo=repo, mode="mock")
+        self.book = book
+
+    def create_draft_pr(
+        self,
+        title: str,
+        body: str,
+        head_branch: str,
+        base_branch: str = "main",
+    ) -> PullRequestInfo:
+        pr_info = PullRequestInfo(**self.book.result(_key("create_draft_pr", head_branch)))
+        self.created_prs.append(pr_info)
+        return pr_info
+
+
+@dataclass
+class ReplayResult:
+    wall_seconds: float
+    statuses: dict[str, str] = field(default_factory=dict)
+    processing_ms: dict[str, float] = field(default_factory=dict)
+    max_lag_ms: float = 0.0
+
+    def status_changes(self, other: "ReplayResult") -> dict[str, tuple[str | None, str | None]]:
+        incident_ids = sorted(set(self.statuses) | set(other.statuses))
+        return {
+            incident_id: (self.statuses.get(incident_id), other.statuses.get(incident_id))
+            for incident_id in incident_ids
+            if self.statuses.get(incident_id) != other.statuses.get(incident_id)
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "wall_seconds": round(self.wall_seconds, 4),
+            "incidents": len(self.statuses),
+            "max_lag_ms": round(self.max_lag_ms, 3),
+            "statuses": dict(self.statuses),
+            "processing_ms": {key: round(value, 3) for key, value in self.processing_ms.items()},
+        }
+
+
+class TrafficReplayer:
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.repo_slug = ""
+        self.incidents: list[tuple[float, IncidentEnvelope]] = []
+        self.calls: dict[str, dict[str, list[RecordedCall]]] = defaultdict(lambda: defaultdict(list))
+        with gzip.open(self.path, "rt", encoding="utf-8") as handle:
+            for line in handle:
+                entry = json.loads(line)
+                if entry["type"] == "header":
+                    self.repo_slug = entry.get("repo_slug", "")
+                elif entry["type"] == "incident":
+                    self.incidents.append((float(entry["t"]), IncidentEnvelope.from_dict(entry["incident"])))
+                elif entry["type"] == "call":
+                    self.calls[entry["tool"]][entry["key"]].append(
+                        RecordedCall(
+                            duration=float(entry.get("duration", 0.0)),
+                            result=entry.get("result"),
+                            error=entry.get("error"),
+                        )
+                    )
+        self.incidents.sort(key=lambda item: item[0])
+
+    def tools(self, speed: float = 1.0, clock: Clock | None = None) -> dict[str, Any]:
+        return {
+            "azure_tool": RecordedAzureMonitorTool(_CallBook(self.calls["azure"], speed, clock)),
+            "ci_runner": RecordedCIRunner(_CallBook(self.calls["ci"], speed, clock)),
+            "github_client": RecordedGitHubClient(
+                _CallBook(self.calls["github"], speed, clock),
+                self.repo_slug or "demo-org/demo-service",
+            ),
+        }
+
+    def replay(self, engine: Any, speed: float = 1.0, max_workers: int = 8) -> ReplayResult:
+        # speed 1.0 keeps the original arrival times, N > 1 compresses them,
+        # and 0 submits every incident immediately (as fast as possible).
+        records: dict[str, IncidentRecord] = {}
+        processing_ms: dict[str, float] = {}
+        lags: list[float] = []
+        started = time.monotonic()
+
+        def ingest(incident: IncidentEnvelope) -> None:
+            ingest_started = time.perf_counter()
+            records[incident.incident_id] = engine.ingest_incident(incident)
+            processing_ms[incident.incident_id] = (time.perf_counter() - ingest_started) * 1000.0
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = []
+            for offset, incident in self.incidents:
+                if speed > 0:
+                    delay = started + offset / speed - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                    lags.append(max(0.0, time.monotonic() - started - offset / speed) * 1000.0)
+                futures.append(executor.submit(ingest, incident))
+            for future in futures:
+                future.result()
+
+        return ReplayResult(
+            wall_seconds=time.monotonic() - started,
+            statuses={incident_id: record.status.value for incident_id, record in records.items()},
+            processing_ms=processing_ms,
+            max_lag_ms=max(lags, default=0.0),
+        )
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator
+
+from contracts.clock import VirtualClock
+from contracts.models import IncidentEnvelope, PatchProposal, parse_iso
+from services.tools.azure_monitor import AzureMonitorTool
+from services.tools.ci_client import CIRunner
+from services.tools.github_client import GitHubClient, PullRequestInfo
+
+
+# Rough production latencies (seconds) for each tool call. Under a virtual
+# clock these only advance simulated time, so a day of incidents with multi
+# minute CI runs replays in a few wall-clock seconds.
+DEFAULT_TOOL_LATENCIES: dict[str, float] = {
+    "get_recent_deployments": 0.4,
+    "query_metrics": 1.2,
+    "query_logs": 1.8,
+    "run_suite.unit": 90.0,
+    "run_suite.integration": 420.0,
+    "run_suite.smoke": 120.0,
+    "run_tests": 420.0,
+    "run_canary_replay": 180.0,
+    "create_draft_pr": 1.5,
+}
+
+
+class _Latency:
+    def __init__(self, clock: VirtualClock, latencies: dict[str, float] | None) -> None:
+        self.clock = clock
+        self.latencies = {**DEFAULT_TOOL_LATENCIES, **(latencies or {})}
+
+    def wait(self, operation: str) -> None:
+        self.clock.sleep(self.latencies.get(operation, 0.0))
+
+
+class SimulatedAzureMonitorTool(AzureMonitorTool):
+    def __init__(self, backend: AzureMonitorTool, latency: _Latency) -> None:
+        self.backend = backend
+        self.latency = latency
+
+    def get_recent_deployments(self, service: str, env: str) -> list[dict[str, Any]]:
+        self.latency.wait("get_recent_deployments")
+        return self.backend.get_recent_deployments(service, env)
+
+    def query_metrics(self, service: str, env: str, metric_name: str | None = None) -> list[dict[str, Any]]:
+        self.latency.wait("query_metrics")
+        return self.backend.query_metrics(service, env, metric_name=metric_name)
+
+    def query_logs(
+        self,
+        service: str,
+        env: str,
+        contains: str | None = None,
+        levels: Iterable[str] | None = None,
+        endpoint: str | None = None,
+        start_time: str | None = None,
+        end_time: str | None = None,
+    ) -> list[dict[str, Any]]:
+        self.latency.wait("query_logs")
+        return self.backend.query_logs(
+            service,
+            env,
+            contains=contains,
+            levels=levels,
+            endpoint=endpoint,
+            start_time=start_time,
+            end_time=end_time,
+        )
+
+    def iter_recent_deployments(self, service: str, env: str) -> Iterator[dict[str, Any]]:
+        self.latency.wait("get_recent_deployments")
+        return self.backend.iter_recent_deployments(service, env)
+
+    def iter_metrics(self, service: str, env: str, metric_name: str | None = None) -> Iterator[dict[str, Any]]:
+        self.latency.wait("query_metrics")
+        return self.backend.iter_metrics(service, env, metric_name=metric_name)
+
+    def iter_logs(
+        self,
+        service: str,
+        env: str,
+        contains: str | None = None,
+        levels: Iterable[str] | None = None,
+        endpoint: str | None = None,
+        start_time: str | None = None,
+        end_time: str | None = None,
+        newest_first: bool = False,
+    ) -> Iterator[dict[str, Any]]:
+        self.latency.wait("query_logs")
+        return self.backend.iter_logs(
+            service,
+            env,
+            contains=contains,
+            levels=levels,
+            endpoint=endpoint,
+            start_time=start_time,
+            end_time=end_time,
+            newest_first=newest_first,
+        )
+
+
+class SimulatedCIRunner(CIRunner):
+    def __init__(self, backend: CIRunner, latency: _Latency) -> None:
+        super().__init__()
+        self.backend = backend
+        self.latency = latency
+        self.test_suites = backend.test_suites
+        self.batch_suites = backend.batch_suites
+
+    def config_fingerprint(self) -> dict[str, Any] | None:
+        return self.backend.config_fingerprint()
+
+    def run_suite(self, patch: PatchProposal, suite: str) -> str:
+        self.latency.wait(f"run_suite.{suite}")
+        return self.backend.run_suite(patch, suite)
+
+    def run_tests(self, patch: PatchProposal) -> dict[str, str]:
+        self.latency.wait("run_tests")
+        return self.backend.run_tests(patch)
+
+    def cancel(self, patch: PatchProposal) -> None:
+        self.backend.cancel(patch)
+
+    def run_canary_replay(self, incident: IncidentEnvelope, patch: PatchProposal) -> dict[str, float | str]:
+        self.latency.wait("run_canary_replay")
+        return self.backend.run_canary_replay(incident, patch)
+
+
+class SimulatedGitHubClient(GitHubClient):
+    def __init__(self, backend: GitHubClient, latency: _Latency) -> None:
+        super().__init__(owner=backend.owner, repo=backend.repo, token=backend.token, mode=backend.mode)
+        self.backend = backend
+        self.latency = latency
+        self.created_prs = backend.created_prs
+
+    def find_pull_request(self, head_branch: str) -> PullRequestInfo | None:
+        self.latency.wait("find_pull_request")
+        return self.backend.find_pull_request(head_branch)
+
+    def create_draft_pr(
+        self,
+        title: str,
+        body: str,
+        head_branch: str,
+        base_branch: str = "main",
+    ) -> PullRequestInfo:
+        self.latency.wait("create_draft_pr")
+        return self.backend.create_draft_pr(title, body, head_branch, base_branch)
+
+
+def simulated_tools(
+    clock: VirtualClock,
+    azure_tool: AzureMonitorTool,
+    github_client: GitHubClient,
+    ci_runner: CIRunner,
+    latencies: dict[str, float] | None = None,
+) -> dict[str, Any]:
+    latency = _Latency(clock, latencies)
+    return {
+        "azure_tool": SimulatedAzureMonitorTool(azure_tool, latency),
+        "github_client": SimulatedGitHubClient(github_client, latency),
+        "ci_runner": SimulatedCIRunner(ci_runner, latency),
+    }
+
+
+@dataclass
+class SimulationResult:
+    wall_seconds: float
+    virtual_seconds: float
+    statuses: dict[str, str] = field(default_factory=dict)
+    processing_seconds: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def speedup(self) -> float:
+        return self.virtual_seconds / self.wall_seconds if self.wall_seconds > 0 else float("inf")
+
+    def status_counts(self) -> dict[str, int]:
+        return dict(Counter(self.statuses.values()))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "wall_seconds": round(self.wall_seconds, 4),
+            "virtual_seconds": round(self.virtual_seconds, 3),
+            "speedup": round(self.speedup, 1),
+            "incidents": len(self.statuses),
+            "status_counts": self.status_counts(),
+        }
+
+
+def run_simulation(
+    engine: Any,
+    clock: VirtualClock,
+    incidents: Iterable[IncidentEnvelope],
+) -> SimulationResult:
+    # Incidents are ingested in start_time order; the clock jumps forward to
+    # each arrival (never backwards when the pipeline is still busy), so
+    # dedupe windows and processing times are measured in simulated time.
+    started_wall = time.perf_counter()
+    started_virtual = clock.monotonic()
+    statuses: dict[str, str] = {}
+    processing_seconds: dict[str, float] = {}
+    for incident in sorted(incidents, key=lambda item: parse_iso(item.start_time)):
+        clock.advance_to(parse_iso(incident.start_time))
+        record = engine.ingest_incident(incident)
+        statuses[incident.incident_id] = record.status.value
+        processing_seconds[incident.incident_id] = record.processing_seconds
+    return SimulationResult(
+        wall_seconds=time.perf_counter() - started_wall,
+        virtual_seconds=clock.monotonic() - started_virtual,
+        statuses=statuses,
+        processing_seconds=processing_seconds,
+    )
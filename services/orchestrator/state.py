@@ -1,8 +1,11 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
+from contextlib import contextmanager
+from datetime import timedelta
 from threading import RLock
+from typing import Iterator
 
+from contracts.clock import SYSTEM_CLOCK, Clock
 from contracts.events import PipelineEvent
 from contracts.models import EventLog, IncidentRecord, IncidentStatus, parse_iso
 
@@ -17,7 +20,8 @@ ACTIVE_STATUSES = {
 
 
 class IncidentStateStore:
-    def __init__(self) -> None:
+    def __init__(self, clock: Clock | None = None) -> None:
+        self.clock = clock or SYSTEM_CLOCK
         self._records: dict[str, IncidentRecord] = {}
         self._lock = RLock()
 
@@ -27,6 +31,13 @@ class IncidentStateStore:
                 raise ValueError(f"Incident already exists: {record.incident.incident_id}")
             self._records[record.incident.incident_id] = record
 
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        # Record fields written from more than one thread (the pipeline and
+        # the PR publisher) are read and written while holding this lock.
+        with self._lock:
+            yield
+
     def get(self, incident_id: str) -> IncidentRecord | None:
         with self._lock:
             return self._records.get(incident_id)
@@ -43,9 +54,9 @@ class IncidentStateStore:
     ) -> EventLog:
         with self._lock:
             record = self._records[incident_id]
-            event_entry = EventLog(event=event, payload=payload or {})
+            event_entry = EventLog(event=event, timestamp=self.clock.iso(), payload=payload or {})
             record.events.append(event_entry)
-            record.mark_updated()
+            record.mark_updated(self.clock)
             return event_entry
 
     def find_recent_duplicates(
@@ -55,6 +66,7 @@ class IncidentStateStore:
         dedupe_window_minutes: int,
     ) -> list[IncidentRecord]:
         with self._lock:
+            now = self.clock.now()
             matches: list[IncidentRecord] = []
             for record in self._records.values():
                 if record.incident.incident_id == exclude_incident_id:
@@ -64,7 +76,6 @@ class IncidentStateStore:
                 if record.status not in ACTIVE_STATUSES:
                     continue
                 updated_at = parse_iso(record.updated_at)
-                now = datetime.now(timezone.utc)
                 if now - updated_at > timedelta(minutes=dedupe_window_minutes):
                     continue
                 matches.append(record)
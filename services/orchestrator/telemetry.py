@@ -1,29 +1,150 @@
 from __future__ import annotations
 
+import time
 from contextlib import contextmanager
-from typing import Any, Iterator
+from contextvars import ContextVar
+from random import getrandbits
+from threading import get_ident
+from typing import TYPE_CHECKING, Any, Callable, Iterator, TypeVar
 
-try:
-    from opentelemetry import trace
-except ImportError:  # pragma: no cover - optional dependency
-    trace = None
+if TYPE_CHECKING:
+    from services.orchestrator.trace_export import BatchedFileSpanExporter
+
+
+T = TypeVar("T")
+
+SpanTags = tuple[tuple[str, str], ...]
+
+# The innermost span's stage and incident, per context and mirrored per
+# thread so a sampling profiler can attribute other threads' stacks.
+_SPAN_TAGS: ContextVar[SpanTags] = ContextVar("sentinel_span_tags", default=())
+_THREAD_TAGS: dict[int, SpanTags] = {}
+
+# (trace_id, span_id) of the innermost span handed to the local exporter.
+_LOCAL_SPAN: ContextVar[tuple[int, int] | None] = ContextVar("sentinel_local_span", default=None)
+_EXPORTER: BatchedFileSpanExporter | None = None
+_TRACER: Any = None
+# opentelemetry.trace once the first span asks for it, False when the
+# optional dependency is missing; importing it costs tens of milliseconds.
+_TRACE_API: Any = None
 
 
 def _get_tracer():
-    if trace is None:
+    # Until an SDK provider is installed every span the API hands out is a
+    # no-op that still costs several microseconds, so skip it entirely; once
+    # a real provider shows up its tracer is looked up once and kept.
+    global _TRACER, _TRACE_API
+    if _TRACER is not None:
+        return _TRACER
+    if _TRACE_API is None:
+        try:
+            from opentelemetry import trace as api
+        except ImportError:  # pragma: no cover - optional dependency
+            api = False
+        _TRACE_API = api
+    trace = _TRACE_API
+    if not trace:
+        return None
+    if isinstance(trace.get_tracer_provider(), (trace.ProxyTracerProvider, trace.NoOpTracerProvider)):
         return None
-    return trace.get_tracer("sentinel.orchestrator")
+    _TRACER = trace.get_tracer("sentinel.orchestrator")
+    return _TRACER
+
+
+def set_span_exporter(exporter: BatchedFileSpanExporter | None) -> BatchedFileSpanExporter | None:
+    global _EXPORTER
+    previous, _EXPORTER = _EXPORTER, exporter
+    return previous
+
+
+def span_export_stats() -> dict[str, int]:
+    exporter = _EXPORTER
+    return exporter.stats.to_dict() if exporter is not None else {}
+
+
+def thread_span_tags() -> dict[int, SpanTags]:
+    return dict(_THREAD_TAGS)
 
 
 @contextmanager
-def traced_span(name: str, attributes: dict[str, Any] | None = None) -> Iterator[None]:
-    tracer = _get_tracer()
-    if tracer is None:
+def _bound_tags(tags: SpanTags) -> Iterator[None]:
+    token = _SPAN_TAGS.set(tags)
+    ident = get_ident()
+    previous = _THREAD_TAGS.get(ident)
+    _THREAD_TAGS[ident] = tags
+    try:
         yield
-        return
+    finally:
+        if previous is None:
+            _THREAD_TAGS.pop(ident, None)
+        else:
+            _THREAD_TAGS[ident] = previous
+        _SPAN_TAGS.reset(token)
 
-    with tracer.start_as_current_span(name) as span:
-        if attributes:
-            for key, value in attributes.items():
-                span.set_attribute(key, value)
-        yield
+
+def bind_span_tags(action: Callable[[], T]) -> Callable[[], T]:
+    # For work handed to another thread: the enclosing span's tags are
+    # captured here and published for whichever thread ends up running it.
+    tags = _SPAN_TAGS.get()
+
+    def run() -> T:
+        with _bound_tags(tags):
+            return action()
+
+    return run
+
+
+class _Span:
+    __slots__ = ("name", "attributes", "_tags_token", "_ident", "_previous", "_otel", "_exporter", "_local")
+
+    def __init__(self, name: str, attributes: dict[str, Any] | None) -> None:
+        self.name = name
+        self.attributes = attributes
+
+    def __enter__(self) -> None:
+        # Tags are only ever (incident, stage); build them directly rather
+        # than through a dict and a sort on every span.
+        incident = self.attributes.get("incident_id") if self.attributes else None
+        if incident is None:
+            incident = next((value for key, value in _SPAN_TAGS.get() if key == "incident"), None)
+        tags: SpanTags = (("incident", str(incident)), ("stage", self.name)) if incident else (("stage", self.name),)
+        self._tags_token = _SPAN_TAGS.set(tags)
+        self._ident = get_ident()
+        self._previous = _THREAD_TAGS.get(self._ident)
+        _THREAD_TAGS[self._ident] = tags
+
+        self._exporter = _EXPORTER
+        if self._exporter is not None:
+            parent = _LOCAL_SPAN.get()
+            trace_id, parent_id = parent if parent else (getrandbits(128), 0)
+            span_id = getrandbits(64)
+            self._local = (trace_id, span_id, parent_id, time.time_ns(), _LOCAL_SPAN.set((trace_id, span_id)))
+
+        tracer = _get_tracer()
+        self._otel = None
+        if tracer is not None:
+            self._otel = tracer.start_as_current_span(self.name, attributes=self.attributes)
+            self._otel.__enter__()
+
+    def __exit__(self, exc_type: Any, exc: Any, traceback: Any) -> None:
+        try:
+            if self._otel is not None:
+                self._otel.__exit__(exc_type, exc, traceback)
+        finally:
+            if self._exporter is not None:
+                trace_id, span_id, parent_id, started_ns, token = self._local
+                _LOCAL_SPAN.reset(token)
+                error = f"{exc_type.__name__}: {exc}" if exc_type is not None else None
+                self._exporter.export(
+                    (self.name, trace_id, span_id, parent_id, started_ns, time.time_ns(), self.attributes, error)
+                )
+            if self._previous is None:
+                _THREAD_TAGS.pop(self._ident, None)
+            else:
+                _THREAD_TAGS[self._ident] = self._previous
+            _SPAN_TAGS.reset(self._tags_token)
+
+
+def traced_span(name: str, attributes: dict[str, Any] | None = None) -> _Span:
+    # `attributes` is handed to the tracer and exporter as-is, not copied.
+    return _Span(name, attributes)
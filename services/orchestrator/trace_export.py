@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+# name, trace_id, span_id, parent_span_id, start_ns, end_ns, attributes, error
+SpanRecord = tuple[str, int, int, int, int, int, "dict[str, Any] | None", "str | None"]
+
+
+@dataclass
+class SpanExportStats:
+    queued: int = 0
+    exported: int = 0
+    dropped: int = 0
+    batches: int = 0
+    write_errors: int = 0
+    rotations: int = 0
+
+    def to_dict(self) -> dict[str, int]:
+        return {
+            "queued": self.queued,
+            "exported": self.exported,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "write_errors": self.write_errors,
+            "rotations": self.rotations,
+        }
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_span(record: SpanRecord) -> dict[str, Any]:
+    name, trace_id, span_id, parent_id, start_ns, end_ns, attributes, error = record
+    span: dict[str, Any] = {
+        "traceId": f"{trace_id:032x}",
+        "spanId": f"{span_id:016x}",
+        "name": name,
+        "kind": 1,
+        "startTimeUnixNano": str(start_ns),
+        "endTimeUnixNano": str(end_ns),
+        "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in (attributes or {}).items()],
+        "status": {"code": 2, "message": error} if error else {},
+    }
+    if parent_id:
+        span["parentSpanId"] = f"{parent_id:016x}"
+    return span
+
+
+class BatchedFileSpanExporter:
+    def __init__(
+        self,
+        directory: str,
+        service_name: str = "sentinel-orchestrator",
+        max_queue_size: int = 4096,
+        batch_size: int = 512,
+        flush_interval_seconds: float = 1.0,
+        max_file_bytes: int = 8 * 1024 * 1024,
+        max_files: int = 5,
+    ) -> None:
+        self.directory = Path(directory)
+        self.service_name = service_name
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_file_bytes = max_file_bytes
+        self.max_files = max_files
+        self.stats = SpanExportStats()
+        self._queue: deque[SpanRecord] = deque()
+        self._wake = threading.Event()
+        self._idle = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def path(self) -> Path:
+        return self.directory / "spans.jsonl"
+
+    def export(self, record: SpanRecord) -> None:
+        # Called on the hot path: never blocks and never formats. When the
+        # writer falls behind, new spans are dropped and counted instead of
+        # growing memory without bound.
+        if len(self._queue) >= self.max_queue_size:
+            self.stats.dropped += 1
+            return
+        self._queue.append(record)
+        self.stats.queued += 1
+        if len(self._queue) >= self.batch_size:
+            self._wake.set()
+
+    def _drain(self) -> list[SpanRecord]:
+        batch: list[SpanRecord] = []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.popleft())
+            except IndexError:
+                break
+        return batch
+
+    def _rotate(self) -> None:
+        for index in range(self.max_files - 1, 0, -1):
+            source = self.directory / (f"spans.{index - 1}.jsonl" if index > 1 else "spans.jsonl")
+            if source.exists():
+                os.replace(source, self.directory / f"spans.{index}.jsonl")
+        self.stats.rotations += 1
+
+    def _write(self, batch: list[SpanRecord]) -> None:
+        # One OTLP/JSON ExportTraceServiceRequest per line, the layout the
+        # OpenTelemetry Collector's file exporter and otlpjsonfile receiver use.
+        request = {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}]},
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "sentinel.orchestrator"},
+                            "spans": [_otlp_span(record) for record in batch],
+                        }
+                    ],
+                }
+            ]
+        }
+        line = json.dumps(request, separators=(",", ":")) + "\n"
+        try:
+            if self.path.exists() and self.path.stat().st_size + len(line) > self.max_file_bytes:
+                self._rotate()
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(line)
+        except OSError:
+            self.stats.write_errors += 1
+            self.stats.dropped += len(batch)
+            return
+        self.stats.batches += 1
+        self.stats.exported += len(batch)
+
+    def _flush_queue(self) -> None:
+        while True:
+            batch = self._drain()
+            if not batch:
+                return
+            self._write(batch)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval_seconds)
+            self._wake.clear()
+            self._flush_queue()
+            self._idle.set()
+        self._flush_queue()
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+
+    def flush(self, timeout: float = 5.0) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._flush_queue()
+            return
+        self._idle.clear()
+        self._wake.set()
+        self._idle.wait(timeout)
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self._flush_queue()
@@ -1,16 +1,98 @@
-from services.tools.azure_monitor import AzureMonitorTool, MockAzureMonitorTool
-from services.tools.ci_client import CIRunner
-from services.tools.copilot_agent import CopilotPatchGenerator
-from services.tools.github_client import GitHubClient, PullRequestInfo
-from services.tools.synthetic_data import default_telemetry_dataset, synthetic_5xx_incident
-
-__all__ = [
-    "AzureMonitorTool",
-    "CIRunner",
-    "CopilotPatchGenerator",
-    "GitHubClient",
-    "MockAzureMonitorTool",
-    "PullRequestInfo",
-    "default_telemetry_dataset",
-    "synthetic_5xx_incident",
-]
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from services.tools.azure_monitor import AzureMonitorTool, MockAzureMonitorTool
+    from services.tools.canary_replay import (
+        CanaryReplaySimulator,
+        RequestTrace,
+        ServiceModel,
+        parse_service_models,
+        telemetry_trace_source,
+    )
+    from services.tools.ci_client import CIRunner
+    from services.tools.copilot_agent import CopilotPatchGenerator
+    from services.tools.github_client import GitHubClient, PullRequestInfo
+    from services.tools.github_transport import GitHubRateLimited, GitHubTransport
+    from services.tools.hedging import (
+        HedgedAzureMonitorTool,
+        HedgingStats,
+        LatencyInjectingAzureMonitorTool,
+        LatencyTracker,
+    )
+    from services.tools.replay_store import ReplayAzureMonitorTool, write_replay_file
+    from services.tools.resilience import (
+        CircuitBreaker,
+        CircuitOpenError,
+        ResilientAzureMonitorTool,
+        ResilientCIRunner,
+        ResilientGitHubClient,
+        RetryPolicy,
+        ToolResilience,
+    )
+    from services.tools.subprocess_runner import ResourceLimits, SubprocessCIRunner, SuiteExecution, WorktreePool
+    from services.tools.synthetic_data import (
+        SyntheticWorkload,
+        WorkloadSpec,
+        default_telemetry_dataset,
+        synthetic_5xx_incident,
+    )
+    from services.tools.telemetry_cache import CachingAzureMonitorTool, TelemetryCacheStats
+
+# Public name -> defining module. Tool modules are imported on first access,
+# so importing one tool does not load the others (numpy, http.client, ...).
+_EXPORTS = {
+    "AzureMonitorTool": "services.tools.azure_monitor",
+    "CIRunner": "services.tools.ci_client",
+    "CachingAzureMonitorTool": "services.tools.telemetry_cache",
+    "CanaryReplaySimulator": "services.tools.canary_replay",
+    "CircuitBreaker": "services.tools.resilience",
+    "CircuitOpenError": "services.tools.resilience",
+    "CopilotPatchGenerator": "services.tools.copilot_agent",
+    "GitHubClient": "services.tools.github_client",
+    "GitHubRateLimited": "services.tools.github_transport",
+    "GitHubTransport": "services.tools.github_transport",
+    "HedgedAzureMonitorTool": "services.tools.hedging",
+    "HedgingStats": "services.tools.hedging",
+    "LatencyInjectingAzureMonitorTool": "services.tools.hedging",
+    "LatencyTracker": "services.tools.hedging",
+    "MockAzureMonitorTool": "services.tools.azure_monitor",
+    "PullRequestInfo": "services.tools.github_client",
+    "ReplayAzureMonitorTool": "services.tools.replay_store",
+    "RequestTrace": "services.tools.canary_replay",
+    "ResilientAzureMonitorTool": "services.tools.resilience",
+    "ResilientCIRunner": "services.tools.resilience",
+    "ResilientGitHubClient": "services.tools.resilience",
+    "ResourceLimits": "services.tools.subprocess_runner",
+    "RetryPolicy": "services.tools.resilience",
+    "ServiceModel": "services.tools.canary_replay",
+    "SubprocessCIRunner": "services.tools.subprocess_runner",
+    "SuiteExecution": "services.tools.subprocess_runner",
+    "SyntheticWorkload": "services.tools.synthetic_data",
+    "TelemetryCacheStats": "services.tools.telemetry_cache",
+    "ToolResilience": "services.tools.resilience",
+    "WorkloadSpec": "services.tools.synthetic_data",
+    "WorktreePool": "services.tools.subprocess_runner",
+    "default_telemetry_dataset": "services.tools.synthetic_data",
+    "parse_service_models": "services.tools.canary_replay",
+    "synthetic_5xx_incident": "services.tools.synthetic_data",
+    "telemetry_trace_source": "services.tools.canary_replay",
+    "write_replay_file": "services.tools.replay_store",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
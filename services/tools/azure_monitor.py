@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 from copy import deepcopy
-from typing import Any
+from typing import Any, Iterable, Iterator
 
+from services.tools.log_index import LogIndex
 from services.tools.synthetic_data import default_telemetry_dataset
 
 
@@ -23,17 +24,73 @@ class AzureMonitorTool:
         service: str,
         env: str,
         contains: str | None = None,
+        levels: Iterable[str] | None = None,
+        endpoint: str | None = None,
+        start_time: str | None = None,
+        end_time: str | None = None,
     ) -> list[dict[str, Any]]:
         raise NotImplementedError
 
+    # Streaming variants. Deployments are yielded newest first, metrics and
+    # logs oldest first unless newest_first is set; consumers may stop early.
+    def iter_recent_deployments(self, service: str, env: str) -> Iterator[dict[str, Any]]:
+        yield from self.get_recent_deployments(service, env)
+
+    def iter_metrics(
+        self,
+        service: str,
+        env: str,
+        metric_name: str | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        yield from self.query_metrics(service, env, metric_name=metric_name)
+
+    def iter_logs(
+        self,
+        service: str,
+        env: str,
+        contains: str | None = None,
+        levels: Iterable[str] | None = None,
+        endpoint: str | None = None,
+        start_time: str | None = None,
+        end_time: str | None = None,
+        newest_first: bool = False,
+    ) -> Iterator[dict[str, Any]]:
+        logs = self.query_logs(
+            service,
+            env,
+            contains=contains,
+            levels=levels,
+            endpoint=endpoint,
+            start_time=start_time,
+            end_time=end_time,
+        )
+        yield from (reversed(logs) if newest_first else logs)
+
 
 class MockAzureMonitorTool(AzureMonitorTool):
     def __init__(self, dataset: dict[tuple[str, str], dict[str, list[dict[str, Any]]]] | None = None) -> None:
         self.dataset = dataset or default_telemetry_dataset()
+        self._log_indexes: dict[tuple[str, str], LogIndex] = {
+            key: LogIndex(bucket.get("logs", [])) for key, bucket in self.dataset.items()
+        }
 
     def _bucket(self, service: str, env: str) -> dict[str, list[dict[str, Any]]]:
         return self.dataset.get((service, env), {"deployments": [], "metrics": [], "logs": []})
 
+    def _log_index(self, service: str, env: str) -> LogIndex:
+        index = self._log_indexes.get((service, env))
+        if index is None:
+            index = LogIndex(self._bucket(service, env).get("logs", []))
+            self._log_indexes[(service, env)] = index
+        return index
+
+    def append_logs(self, service: str, env: str, logs: Iterable[dict[str, Any]]) -> None:
+        bucket = self.dataset.setdefault((service, env), {"deployments": [], "metrics": [], "logs": []})
+        index = self._log_index(service, env)
+        for log in logs:
+            bucket.setdefault("logs", []).append(log)
+            index.add(log)
+
     def get_recent_deployments(self, service: str, env: str) -> list[dict[str, Any]]:
         deployments = deepcopy(self._bucket(service, env).get("deployments", []))
         deployments.sort(key=lambda item: item.get("timestamp", ""), reverse=True)
@@ -56,10 +113,47 @@ class MockAzureMonitorTool(AzureMonitorTool):
         service: str,
         env: str,
         contains: str | None = None,
+        levels: Iterable[str] | None = None,
+        endpoint: str | None = None,
+        start_time: str | None = None,
+        end_time: str | None = None,
     ) -> list[dict[str, Any]]:
-        logs = deepcopy(self._bucket(service, env).get("logs", []))
-        if contains:
-            token = contains.lower()
-            logs = [log for log in logs if token in str(log.get("message", "")).lower()]
-        logs.sort(key=lambda item: item.get("timestamp", ""))
-        return logs
+        return self._log_index(service, env).search(
+            contains=contains,
+            levels=levels,
+            endpoint=endpoint,
+            start_time=start_time,
+            end_time=end_time,
+        )
+
+    def iter_metrics(
+        self,
+        service: str,
+        env: str,
+        metric_name: str | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        metrics = self._bucket(service, env).get("metrics", [])
+        if metric_name:
+            metrics = [metric for metric in metrics if metric.get("name") == metric_name]
+        for metric in sorted(metrics, key=lambda item: item.get("timestamp", "")):
+            yield deepcopy(metric)
+
+    def iter_logs(
+        self,
+        service: str,
+        env: str,
+        contains: str | None = None,
+        levels: Iterable[str] | None = None,
+        endpoint: str | None = None,
+        start_time: str | None = None,
+        end_time: str | None = None,
+        newest_first: bool = False,
+    ) -> Iterator[dict[str, Any]]:
+        yield from self._log_index(service, env).iter_search(
+            contains=contains,
+            levels=levels,
+            endpoint=endpoint,
+            start_time=start_time,
+            end_time=end_time,
+            newest_first=newest_first,
+        )
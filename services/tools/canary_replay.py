@@ -0,0 +1,345 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, replace
+from statistics import NormalDist
+from typing import Any, Callable, Iterable, Iterator
+
+import numpy as np
+
+from contracts.diff import UnifiedDiff, parse_unified_diff
+from contracts.models import IncidentEnvelope, PatchProposal, parse_iso
+
+
+_NORMAL = NormalDist()
+_Z95 = _NORMAL.inv_cdf(0.95)
+_DIFF_SETTING = re.compile(r"^\s*([A-Za-z0-9_.\-]+)\s*[:=]\s*([0-9]+(?:\.[0-9]+)?)\s*$")
+
+
+@dataclass(frozen=True)
+class ServiceModel:
+    timeout_ms: float = 1000.0
+    max_retries: int = 1
+    pool_size: int = 100
+    backoff_ms: float = 25.0
+
+    @property
+    def attempts(self) -> int:
+        return self.max_retries + 1
+
+
+def _setting_field(key: str, value: float) -> tuple[str, float] | None:
+    key = key.lower()
+    if "backoff" in key:
+        return "backoff_ms", value * 1000.0 if key.endswith(("_s", "_seconds")) else value
+    if "timeout" in key:
+        return "timeout_ms", value * 1000.0 if key.endswith(("_s", "_seconds")) else value
+    if "max_attempts" in key:
+        return "max_retries", max(0.0, value - 1)
+    if "retries" in key or "retry" in key:
+        return "max_retries", value
+    if "pool" in key or "max_connections" in key:
+        return "pool_size", value
+    return None
+
+
+def _changed_lines(patch: str | UnifiedDiff) -> Iterator[tuple[str, str]]:
+    diff = patch if isinstance(patch, UnifiedDiff) else parse_unified_diff(patch)
+    if diff.files:
+        for _, sign, text in diff.iter_changes():
+            yield sign, text
+    elif isinstance(patch, str):
+        # Bare +/- lines without file headers, as in hand-written snippets.
+        for line in patch.splitlines():
+            if line[:1] in ("+", "-") and not line.startswith(("---", "+++")):
+                yield line[0], line[1:]
+
+
+def parse_service_models(
+    patch: str | UnifiedDiff,
+    defaults: ServiceModel | None = None,
+) -> tuple[ServiceModel, ServiceModel]:
+    # Removed lines describe the deployed configuration, added lines the
+    # patched one; settings the diff does not touch keep their defaults.
+    removed: dict[str, float] = {}
+    added: dict[str, float] = {}
+    for sign, text in _changed_lines(patch):
+        match = _DIFF_SETTING.match(text)
+        if not match:
+            continue
+        setting = _setting_field(match.group(1), float(match.group(2)))
+        if setting is not None:
+            (removed if sign == "-" else added)[setting[0]] = setting[1]
+
+    def build(base: ServiceModel, values: dict[str, float]) -> ServiceModel:
+        overrides: dict[str, Any] = dict(values)
+        for name in ("max_retries", "pool_size"):
+            if name in overrides:
+                overrides[name] = int(overrides[name])
+        return replace(base, **overrides)
+
+    before = build(defaults or ServiceModel(), removed)
+    return before, build(before, added)
+
+
+@dataclass(frozen=True)
+class RequestTrace:
+    error_rates: np.ndarray
+    latency_p95_ms: np.ndarray
+    requests_per_second: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.error_rates.shape[0])
+
+    @classmethod
+    def from_incident(cls, incident: IncidentEnvelope, requests_per_second: float = 50.0) -> "RequestTrace":
+        payload = incident.signal_payload
+        return cls(
+            error_rates=np.array([float(payload.get("error_rate", 0.0))]),
+            latency_p95_ms=np.array([float(payload.get("latency_p95_ms", 250.0))]),
+            requests_per_second=np.array([float(payload.get("requests_per_second", requests_per_second))]),
+        )
+
+    @classmethod
+    def from_metrics(
+        cls,
+        metrics: Iterable[dict[str, Any]],
+        endpoint: str | None = None,
+        default_latency_p95_ms: float = 250.0,
+        requests_per_second: float = 50.0,
+    ) -> "RequestTrace":
+        # Each error-rate sample becomes one trace segment, paired with the
+        # latest latency sample recorded at or before it on the same endpoint.
+        error_points: list[tuple[float, float]] = []
+        latency_points: list[tuple[float, float]] = []
+        for metric in metrics:
+            if endpoint is not None and metric.get("endpoint") not in (None, endpoint):
+                continue
+            point = (parse_iso(str(metric["timestamp"])).timestamp(), float(metric.get("value", 0.0)))
+            if metric.get("name") == "http_5xx_rate":
+                error_points.append(point)
+            elif metric.get("name") in ("p95_latency_ms", "latency_p95_ms"):
+                latency_points.append(point)
+        error_points.sort()
+        latency_points.sort()
+
+        error_times = np.array([point[0] for point in error_points])
+        latency_times = np.array([point[0] for point in latency_points])
+        latency_values = np.array([point[1] for point in latency_points])
+        latencies = np.full(len(error_points), default_latency_p95_ms)
+        if len(latency_points):
+            index = np.searchsorted(latency_times, error_times, side="right") - 1
+            latencies = np.where(index >= 0, latency_values[np.clip(index, 0, None)], latency_values[0])
+        return cls(
+            error_rates=np.array([point[1] for point in error_points], dtype=float),
+            latency_p95_ms=latencies.astype(float),
+            requests_per_second=np.full(len(error_points), requests_per_second),
+        )
+
+
+def _calibrate(trace: RequestTrace, model: ServiceModel, default_sigma: float = 0.5) -> tuple[np.ndarray, ...]:
+    # Fit a lognormal upstream latency and a transient failure probability per
+    # segment so that the deployed (pre-patch) model reproduces the observed
+    # error rate: when the observed p95 exceeds the timeout, timeouts explain
+    # the errors, otherwise the residual is attributed to transient failures.
+    medians = np.empty(len(trace))
+    sigmas = np.empty(len(trace))
+    transient = np.empty(len(trace))
+    timeout = model.timeout_ms
+    for index, (error_rate, p95) in enumerate(zip(trace.error_rates, trace.latency_p95_ms)):
+        per_attempt = float(np.clip(error_rate, 0.0, 0.999)) ** (1.0 / model.attempts)
+        p95 = max(float(p95), 1.0)
+        if p95 > timeout and 0.05 < per_attempt < 1.0:
+            z_timeout = _NORMAL.inv_cdf(1.0 - per_attempt)
+            sigma = float(np.clip(np.log(p95 / timeout) / (_Z95 - z_timeout), 0.05, 2.5))
+            medians[index] = timeout / np.exp(sigma * z_timeout)
+            sigmas[index] = sigma
+            transient[index] = 0.0
+            continue
+        sigmas[index] = default_sigma
+        medians[index] = p95 / np.exp(_Z95 * default_sigma)
+        timed_out = 1.0 - _NORMAL.cdf(np.log(timeout / medians[index]) / default_sigma)
+        transient[index] = float(np.clip((per_attempt - timed_out) / max(1e-9, 1.0 - timed_out), 0.0, 1.0))
+    return medians, sigmas, transient
+
+
+def _segment_means(segment: np.ndarray, values: np.ndarray, segments: int) -> np.ndarray:
+    counts = np.bincount(segment, minlength=segments)
+    return np.bincount(segment, weights=values, minlength=segments) / np.maximum(counts, 1)
+
+
+@dataclass(frozen=True)
+class ReplayOutcome:
+    error_rate: float
+    p50_ms: float
+    p95_ms: float
+    mean_attempts: float
+
+
+class CanaryReplaySimulator:
+    def __init__(
+        self,
+        requests: int = 1_000_000,
+        seed: int = 7,
+        latency_budget_ms: float = 200.0,
+        transient_failure_fraction: float = 0.2,
+        calibration_requests: int = 50_000,
+    ) -> None:
+        self.requests = requests
+        self.seed = seed
+        self.latency_budget_ms = latency_budget_ms
+        self.transient_failure_fraction = transient_failure_fraction
+        self.calibration_requests = calibration_requests
+
+    def _serve(
+        self,
+        model: ServiceModel,
+        segment: np.ndarray,
+        latency: np.ndarray,
+        failure_draws: np.ndarray,
+        transient: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        attempts = model.attempts
+        latency = latency[:attempts]
+        timed_out = latency > model.timeout_ms
+        transient_failure = failure_draws[:attempts] < transient[segment]
+        failed = timed_out | transient_failure
+
+        spent = np.where(timed_out, model.timeout_ms, latency)
+        spent = np.where(transient_failure & ~timed_out, spent * self.transient_failure_fraction, spent)
+        backoff = model.backoff_ms * (2.0 ** np.arange(attempts, dtype=np.float32) - 1.0)
+        elapsed = np.cumsum(spent, axis=0) + backoff[:, None]
+
+        succeeded = ~failed
+        served = succeeded.any(axis=0)
+        final_attempt = np.where(served, succeeded.argmax(axis=0), attempts - 1)
+        total = np.take_along_axis(elapsed, final_attempt[None, :], axis=0)[0]
+        return served, total, final_attempt
+
+    def _simulate(
+        self,
+        model: ServiceModel,
+        segment: np.ndarray,
+        latency: np.ndarray,
+        failure_draws: np.ndarray,
+        pool_draws: np.ndarray,
+        transient: np.ndarray,
+        load: np.ndarray,
+    ) -> ReplayOutcome:
+        served, total, final_attempt = self._serve(model, segment, latency, failure_draws, transient)
+
+        # Fluid approximation of the connection pool: each segment offers
+        # rps * mean holding time of concurrent work, and whatever exceeds
+        # the pool is rejected.
+        hold_ms = _segment_means(segment, total, len(load))
+        utilisation = load * hold_ms / 1000.0 / max(1, model.pool_size)
+        rejected = pool_draws < np.clip(1.0 - 1.0 / np.maximum(utilisation, 1e-9), 0.0, 1.0)[segment]
+
+        ok = served & ~rejected
+        latencies = total[ok]
+        p50, p95 = (np.percentile(latencies, (50, 95)) if latencies.size else (0.0, 0.0))
+        return ReplayOutcome(
+            error_rate=float(1.0 - ok.mean()),
+            p50_ms=float(p50),
+            p95_ms=float(p95),
+            mean_attempts=float((final_attempt + 1).mean()),
+        )
+
+    def _fit(
+        self,
+        trace: RequestTrace,
+        model: ServiceModel,
+        segment: np.ndarray,
+        normals: np.ndarray,
+        failure_draws: np.ndarray,
+        rounds: int = 4,
+    ) -> tuple[np.ndarray, ...]:
+        # The deployed model must reproduce the observed error rate including
+        # what its connection pool rejects. Pool loss is fitted first and the
+        # per-request failure rate only covers the remainder; when the assumed
+        # traffic would make the pool reject more than was observed, the load
+        # is lowered to the level the observation allows.
+        target = np.clip(trace.error_rates, 0.0, 0.999)
+        offered = np.maximum(trace.requests_per_second, 1e-9)
+        request_error = np.zeros_like(target)
+        for _ in range(rounds):
+            medians, sigmas, transient = _calibrate(replace(trace, error_rates=request_error), model)
+            latency = np.exp(normals[: model.attempts] * sigmas[segment]) * medians[segment]
+            served, total, _ = self._serve(model, segment, latency, failure_draws, transient)
+            failed = _segment_means(segment, (~served).astype(float), len(trace))
+            capacity = max(1, model.pool_size) * 1000.0 / np.maximum(_segment_means(segment, total, len(trace)), 1e-9)
+            allowed = np.clip(1.0 - (1.0 - target) / np.maximum(1.0 - failed, 1e-9), 0.0, 1.0)
+            rejected = np.minimum(np.clip(1.0 - capacity / offered, 0.0, 1.0), allowed)
+            load = np.minimum(offered, capacity / np.maximum(1.0 - rejected, 1e-9))
+            request_error = np.clip(1.0 - (1.0 - target) / np.maximum(1.0 - rejected, 1e-9), 0.0, 0.999)
+        return medians, sigmas, transient, load
+
+    def replay(
+        self,
+        trace: RequestTrace,
+        patch: PatchProposal | None = None,
+        before: ServiceModel | None = None,
+        after: ServiceModel | None = None,
+    ) -> dict[str, float | str]:
+        if patch is not None:
+            parsed_before, parsed_after = parse_service_models(patch.diff, before)
+            before, after = parsed_before, after or parsed_after
+        before = before or ServiceModel()
+        after = after or before
+        if not len(trace):
+            return {"status": "failed", "reason": "empty_trace", "requests": 0}
+
+        weights = trace.requests_per_second / trace.requests_per_second.sum()
+        rng = np.random.default_rng(self.seed)
+        segment = rng.choice(len(trace), size=self.requests, p=weights) if len(trace) > 1 else np.zeros(
+            self.requests, dtype=np.int64
+        )
+        # Both configurations replay the same sampled requests (common random
+        # numbers), so the before/after delta is not swamped by sampling noise.
+        attempts = max(before.attempts, after.attempts)
+        latency = rng.standard_normal((attempts, self.requests), dtype=np.float32)
+        failure_draws = rng.random((attempts, self.requests), dtype=np.float32)
+        pool_draws = rng.random(self.requests, dtype=np.float32)
+        # Calibration runs on a prefix of the same draws; it only needs
+        # per-segment means, not the full sample.
+        fit_size = min(self.requests, self.calibration_requests)
+        medians, sigmas, transient, load = self._fit(
+            trace, before, segment[:fit_size], latency[:, :fit_size].copy(), failure_draws[:, :fit_size]
+        )
+        latency *= sigmas[segment].astype(np.float32)
+        np.exp(latency, out=latency)
+        latency *= medians[segment].astype(np.float32)
+
+        baseline = self._simulate(before, segment, latency, failure_draws, pool_draws, transient, load)
+        patched = self._simulate(after, segment, latency, failure_draws, pool_draws, transient, load)
+        latency_delta = patched.p50_ms - baseline.p50_ms
+        passed = patched.error_rate < baseline.error_rate and latency_delta < self.latency_budget_ms
+        return {
+            "status": "passed" if passed else "failed",
+            "baseline_5xx_rate": round(baseline.error_rate, 6),
+            "post_patch_5xx_rate": round(patched.error_rate, 6),
+            "latency_delta_ms": round(latency_delta, 3),
+            "baseline_p50_ms": round(baseline.p50_ms, 3),
+            "post_patch_p50_ms": round(patched.p50_ms, 3),
+            "baseline_p95_ms": round(baseline.p95_ms, 3),
+            "post_patch_p95_ms": round(patched.p95_ms, 3),
+            "baseline_attempts": round(baseline.mean_attempts, 4),
+            "post_patch_attempts": round(patched.mean_attempts, 4),
+            "requests": self.requests,
+        }
+
+
+def telemetry_trace_source(
+    azure_tool: Any,
+    requests_per_second: float = 50.0,
+) -> Callable[[IncidentEnvelope], RequestTrace]:
+    def source(incident: IncidentEnvelope) -> RequestTrace:
+        trace = RequestTrace.from_metrics(
+            azure_tool.iter_metrics(incident.service, incident.env),
+            endpoint=incident.signal_payload.get("endpoint"),
+            default_latency_p95_ms=float(incident.signal_payload.get("latency_p95_ms", 250.0)),
+            requests_per_second=requests_per_second,
+        )
+        return trace if len(trace) else RequestTrace.from_incident(incident, requests_per_second)
+
+    return source
@@ -14,7 +14,6 @@ class CopilotPatchGenerator:
         attempt: int = 1,
     ) -> PatchProposal:
         summary = "Increase upstream timeout and retry budget for checkout dependency."
-        changed_files = ["config/retries.yaml", "config/timeouts.yaml"]
         patch_text = (
             "--- a/config/timeouts.yaml\n"
             "+++ b/config/timeouts.yaml\n"
@@ -30,7 +29,6 @@ class CopilotPatchGenerator:
         lowered_evidence = " ".join(investigation.log_evidence).lower()
         if "connection" in lowered_evidence and "pool" in lowered_evidence:
             summary = "Increase DB pool ceiling and backoff for transient failures."
-            changed_files = ["config/db_pool.yaml"]
             patch_text = (
                 "--- a/config/db_pool.yaml\n"
                 "+++ b/config/db_pool.yaml\n"
@@ -42,7 +40,7 @@ class CopilotPatchGenerator:
         return PatchProposal(
             repo=self.repo_slug,
             branch=f"sentinel/{incident.incident_id}-attempt-{attempt}",
-            changed_files=changed_files,
+            changed_files=[],
             diff_summary=summary,
             hypothesis=investigation.reason,
             risk_level="low",
@@ -1,12 +1,11 @@
 from __future__ import annotations
 
 import hashlib
-import json
-import urllib.error
-import urllib.request
 from dataclasses import dataclass
 from typing import Any
 
+from services.tools.github_transport import GITHUB_API_URL, GitHubTransport
+
 
 @dataclass
 class PullRequestInfo:
@@ -24,17 +23,34 @@ class GitHubClient:
         repo: str,
         token: str | None = None,
         mode: str = "mock",
+        api_url: str = GITHUB_API_URL,
+        timeout_seconds: float = 10.0,
+        transport: GitHubTransport | None = None,
     ) -> None:
         self.owner = owner
         self.repo = repo
         self.token = token
         self.mode = mode
+        self.api_url = api_url
+        self.timeout_seconds = timeout_seconds
         self.created_prs: list[PullRequestInfo] = []
+        self._transport = transport
 
     @property
     def repo_slug(self) -> str:
         return f"{self.owner}/{self.repo}"
 
+    @property
+    def transport(self) -> GitHubTransport:
+        if self._transport is None:
+            self._transport = GitHubTransport(self.token, base_url=self.api_url, timeout_seconds=self.timeout_seconds)
+        return self._transport
+
+    def _api(self, method: str, path: str, payload: Any = None) -> Any:
+        if not self.token:
+            raise RuntimeError("GitHub token is required for real mode.")
+        return self.transport.request(method, f"/repos/{self.repo_slug}{path}", payload).data
+
     def create_draft_pr(
         self,
         title: str,
@@ -46,6 +62,23 @@ class GitHubClient:
             return self._create_real_pr(title, body, head_branch, base_branch)
         return self._create_mock_pr(title, head_branch, base_branch)
 
+    def find_pull_request(self, head_branch: str) -> PullRequestInfo | None:
+        if self.mode != "real":
+            return next((pr for pr in self.created_prs if pr.head_branch == head_branch), None)
+        pulls = self._api("GET", f"/pulls?state=all&head={self.owner}:{head_branch}")
+        if not pulls:
+            return None
+        data = pulls[0]
+        pr_info = PullRequestInfo(
+            pr_url=str(data["html_url"]),
+            number=int(data["number"]),
+            title=str(data["title"]),
+            head_branch=head_branch,
+            base_branch=str(data["base"]["ref"]),
+        )
+        self.created_prs.append(pr_info)
+        return pr_info
+
     def _create_mock_pr(self, title: str, head_branch: str, base_branch: str) -> PullRequestInfo:
         pr_number = int(hashlib.sha256(head_branch.encode("utf-8")).hexdigest()[:6], 16) % 100000
         pr_url = f"https://github.com/{self.repo_slug}/pull/{pr_number}"
@@ -66,34 +99,17 @@ class GitHubClient:
         head_branch: str,
         base_branch: str,
     ) -> PullRequestInfo:
-        if not self.token:
-            raise RuntimeError("GitHub token is required for real mode.")
-        payload = {
-            "title": title,
-            "head": head_branch,
-            "base": base_branch,
-            "body": body,
-            "draft": True,
-        }
-        request = urllib.request.Request(
-            url=f"https://api.github.com/repos/{self.repo_slug}/pulls",
-            data=json.dumps(payload).encode("utf-8"),
-            headers={
-                "Accept": "application/vnd.github+json",
-                "Authorization": f"Bearer {self.token}",
-                "X-GitHub-Api-Version": "2022-11-28",
-                "User-Agent": "sentinel-mvp",
-                "Content-Type": "application/json",
+        data = self._api(
+            "POST",
+            "/pulls",
+            {
+                "title": title,
+                "head": head_branch,
+                "base": base_branch,
+                "body": body,
+                "draft": True,
             },
-            method="POST",
         )
-        try:
-            with urllib.request.urlopen(request, timeout=10) as response:
-                data = json.loads(response.read().decode("utf-8"))
-        except urllib.error.HTTPError as exc:
-            body_text = exc.read().decode("utf-8", errors="ignore")
-            raise RuntimeError(f"GitHub API error ({exc.code}): {body_text}") from exc
-
         pr_info = PullRequestInfo(
             pr_url=str(data["html_url"]),
             number=int(data["number"]),
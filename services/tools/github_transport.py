@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import http.client
+import json
+import select
+import time
+from collections import OrderedDict
+from copy import deepcopy
+from dataclasses import dataclass, field
+from threading import BoundedSemaphore, Lock
+from typing import Any, Callable
+from urllib.parse import urlsplit
+
+from contracts.deadline import remaining_time
+
+
+GITHUB_API_URL = "https://api.github.com"
+
+# A reused keep-alive connection may have been closed by the server between
+# requests. These errors on a reused connection mean "reconnect", but the
+# request may already have reached the server, so it is only resent when that
+# is harmless: idempotent methods, or a request that was never sent.
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD"})
+
+
+def _closed_by_peer(connection: http.client.HTTPConnection) -> bool:
+    # An idle keep-alive socket that is readable has either been closed by
+    # the server or carries data nobody asked for; neither is safe to reuse.
+    if connection.sock is None:
+        return False
+    try:
+        readable, _, _ = select.select([connection.sock], [], [], 0)
+    except (OSError, ValueError):
+        return True
+    return bool(readable)
+
+
+class GitHubRateLimited(RuntimeError):
+    def __init__(self, reset_in_seconds: float) -> None:
+        super().__init__(f"GitHub API rate limit exhausted; resets in {reset_in_seconds:.0f}s.")
+        self.reset_in_seconds = reset_in_seconds
+
+
+@dataclass
+class GitHubRateLimit:
+    limit: int | None = None
+    remaining: int | None = None
+    reset_at: float | None = None
+
+    def update(self, headers: dict[str, str]) -> None:
+        if "x-ratelimit-limit" in headers:
+            self.limit = int(headers["x-ratelimit-limit"])
+        if "x-ratelimit-remaining" in headers:
+            self.remaining = int(headers["x-ratelimit-remaining"])
+        if "x-ratelimit-reset" in headers:
+            self.reset_at = float(headers["x-ratelimit-reset"])
+
+    def wait_seconds(self, now: float, reserve: int) -> float:
+        if self.remaining is None or self.reset_at is None or self.remaining > reserve:
+            return 0.0
+        return max(0.0, self.reset_at - now)
+
+
+@dataclass
+class GitHubTransportStats:
+    requests: int = 0
+    connections_opened: int = 0
+    reconnects: int = 0
+    not_modified: int = 0
+    rate_limit_waits: int = 0
+    rate_limit_wait_seconds: float = 0.0
+
+    def to_dict(self) -> dict[str, float]:
+        return {
+            "requests": self.requests,
+            "connections_opened": self.connections_opened,
+            "reconnects": self.reconnects,
+            "not_modified": self.not_modified,
+            "rate_limit_waits": self.rate_limit_waits,
+            "rate_limit_wait_seconds": round(self.rate_limit_wait_seconds, 3),
+        }
+
+
+@dataclass(frozen=True)
+class GitHubResponse:
+    status: int
+    data: Any
+    headers: dict[str, str] = field(default_factory=dict)
+    not_modified: bool = False
+
+
+class GitHubTransport:
+    def __init__(
+        self,
+        token: str | None,
+        base_url: str = GITHUB_API_URL,
+        timeout_seconds: float = 10.0,
+        pool_size: int = 4,
+        rate_limit_reserve: int = 10,
+        max_rate_limit_wait_seconds: float = 60.0,
+        etag_cache_size: int = 128,
+        user_agent: str = "sentinel-mvp",
+        sleep: Callable[[float], None] = time.sleep,
+        wall_clock: Callable[[], float] = time.time,
+    ) -> None:
+        parsed = urlsplit(base_url)
+        self.token = token
+        self.base_url = base_url
+        self.timeout_seconds = timeout_seconds
+        self.rate_limit_reserve = rate_limit_reserve
+        self.max_rate_limit_wait_seconds = max_rate_limit_wait_seconds
+        self.etag_cache_size = etag_cache_size
+        self.user_agent = user_agent
+        self.sleep = sleep
+        self.wall_clock = wall_clock
+        self.rate_limit = GitHubRateLimit()
+        self.stats = GitHubTransportStats()
+        self._https = parsed.scheme == "https"
+        self._host = parsed.hostname or "api.github.com"
+        self._port = parsed.port
+        self._prefix = parsed.path.rstrip("/")
+        self._idle: list[http.client.HTTPConnection] = []
+        self._slots = BoundedSemaphore(pool_size)
+        self._etags: OrderedDict[str, tuple[str, Any]] = OrderedDict()
+        self._lock = Lock()
+        self._pace_lock = Lock()
+
+    def _connect(self) -> http.client.HTTPConnection:
+        with self._lock:
+            self.stats.connections_opened += 1
+        timeout = remaining_time(self.timeout_seconds)
+        if self._https:
+            return http.client.HTTPSConnection(self._host, self._port, timeout=timeout)
+        return http.client.HTTPConnection(self._host, self._port, timeout=timeout)
+
+    def _checkout(self) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+        return self._connect(), False
+
+    def _checkin(self, connection: http.client.HTTPConnection) -> None:
+        with self._lock:
+            self._idle.append(connection)
+
+    def _pace(self) -> None:
+        # Callers queue on this lock while the remaining quota is at the
+        # reserve, and are released once the window resets.
+        with self._pace_lock:
+            with self._lock:
+                wait = self.rate_limit.wait_seconds(self.wall_clock(), self.rate_limit_reserve)
+            if wait <= 0:
+                return
+            if wait > remaining_time(self.max_rate_limit_wait_seconds):
+                raise GitHubRateLimited(wait)
+            with self._lock:
+                self.stats.rate_limit_waits += 1
+                self.stats.rate_limit_wait_seconds += wait
+            self.sleep(wait)
+            with self._lock:
+                if self.rate_limit.reset_at is not None and self.rate_limit.reset_at <= self.wall_clock():
+                    self.rate_limit.remaining = self.rate_limit.limit
+
+    def _exchange(
+        self,
+        connection: http.client.HTTPConnection,
+        method: str,
+        path: str,
+        body: bytes | None,
+        headers: dict[str, str],
+    ) -> tuple[int, dict[str, str], bytes, bool]:
+        connection.timeout = remaining_time(self.timeout_seconds)
+        if connection.sock is not None:
+            connection.sock.settimeout(connection.timeout)
+        connection.request(method, path, body=body, headers=headers)
+        response = connection.getresponse()
+        raw = response.read()
+        response_headers = {key.lower(): value for key, value in response.getheaders()}
+        return response.status, response_headers, raw, response.will_close
+
+    def _send(
+        self,
+        method: str,
+        path: str,
+        body: bytes | None,
+        headers: dict[str, str],
+    ) -> tuple[int, dict[str, str], bytes]:
+        with self._slots:
+            connection, reused = self._checkout()
+            if reused and _closed_by_peer(connection):
+                connection.close()
+                with self._lock:
+                    self.stats.reconnects += 1
+                connection, reused = self._connect(), False
+            while True:
+                try:
+                    exchange = self._exchange(connection, method, path, body, headers)
+                except _STALE_CONNECTION_ERRORS as exc:
+                    connection.close()
+                    unsent = isinstance(exc, http.client.CannotSendRequest)
+                    if not reused or not (method in _IDEMPOTENT_METHODS or unsent):
+                        raise
+                    with self._lock:
+                        self.stats.reconnects += 1
+                    connection, reused = self._connect(), False
+                    continue
+                except BaseException:
+                    connection.close()
+                    raise
+                break
+            status, response_headers, raw, will_close = exchange
+            if will_close:
+                connection.close()
+            else:
+                self._checkin(connection)
+            return status, response_headers, raw
+
+    def request(self, method: str, path: str, payload: Any = None) -> GitHubResponse:
+        self._pace()
+        url_path = f"{self._prefix}{path}"
+        headers = {
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": "2022-11-28",
+            "User-Agent": self.user_agent,
+            "Connection": "keep-alive",
+        }
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        body = None
+        if payload is not None:
+            body = json.dumps(payload).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        cached = None
+        if method == "GET":
+            with self._lock:
+                cached = self._etags.get(url_path)
+            if cached is not None:
+                # GitHub does not charge 304 responses against the rate limit.
+                headers["If-None-Match"] = cached[0]
+
+        status, response_headers, raw = self._send(method, url_path, body, headers)
+        with self._lock:
+            self.stats.requests += 1
+            self.rate_limit.update(response_headers)
+
+        if status == 304 and cached is not None:
+            with self._lock:
+                self.stats.not_modified += 1
+                self._etags.move_to_end(url_path)
+            return GitHubResponse(status, deepcopy(cached[1]), response_headers, not_modified=True)
+        if status in (403, 429) and (self.rate_limit.remaining == 0 or "retry-after" in response_headers):
+            reset_in = float(response_headers.get("retry-after", 0.0)) or self.rate_limit.wait_seconds(
+                self.wall_clock(), 0
+            )
+            raise GitHubRateLimited(reset_in)
+        if status >= 400:
+            body_text = raw.decode("utf-8", errors="ignore")
+            raise RuntimeError(f"GitHub API error ({status}): {body_text}")
+
+        data = json.loads(raw.decode("utf-8")) if raw else None
+        etag = response_headers.get("etag")
+        if method == "GET" and etag:
+            with self._lock:
+                self._etags[url_path] = (etag, deepcopy(data))
+                self._etags.move_to_end(url_path)
+                while len(self._etags) > self.etag_cache_size:
+                    self._etags.popitem(last=False)
+        return GitHubResponse(status, data, response_headers)
+
+    def close(self) -> None:
+        with self._lock:
+            connections, self._idle = self._idle, []
+        for connection in connections:
+            connection.close()
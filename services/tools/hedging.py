@@ -0,0 +1,333 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeout
+from contextvars import copy_context
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+
+from contracts.deadline import DeadlineExceeded, current_deadline, remaining_time
+from services.tools.azure_monitor import AzureMonitorTool
+
+
+T = TypeVar("T")
+
+_END = object()
+
+
+def _first(factory: Callable[[], Iterable[T]]) -> tuple[Iterator[T], Any]:
+    iterator = iter(factory())
+    return iterator, next(iterator, _END)
+
+
+@dataclass
+class HedgingStats:
+    requests: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    budget_exhausted: int = 0
+
+    @property
+    def hedge_rate(self) -> float:
+        return self.hedges / self.requests if self.requests else 0.0
+
+    def to_dict(self) -> dict[str, float]:
+        return {
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "budget_exhausted": self.budget_exhausted,
+            "hedge_rate": self.hedge_rate,
+        }
+
+
+class LatencyTracker:
+    def __init__(self, window: int = 512) -> None:
+        self.window = window
+        self._samples: dict[str, deque[float]] = {}
+        self._lock = Lock()
+
+    def record(self, operation: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.get(operation)
+            if samples is None:
+                samples = self._samples[operation] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def percentile(self, operation: str, percentile: float, min_samples: int = 1) -> float | None:
+        with self._lock:
+            samples = sorted(self._samples.get(operation, ()))
+        if len(samples) < max(1, min_samples):
+            return None
+        index = min(len(samples) - 1, int(round(percentile / 100.0 * (len(samples) - 1))))
+        return samples[index]
+
+
+class HedgeBudget:
+    def __init__(self, ratio: float = 0.1, burst: float = 10.0) -> None:
+        # Every primary request earns `ratio` of a hedge, so hedges never
+        # exceed ratio * requests plus a small burst allowance.
+        self.ratio = ratio
+        self.burst = burst
+        self._tokens = burst
+        self._lock = Lock()
+
+    def earn(self) -> None:
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            return True
+
+
+class HedgedAzureMonitorTool(AzureMonitorTool):
+    def __init__(
+        self,
+        backend: AzureMonitorTool,
+        percentile: float = 95.0,
+        budget_ratio: float = 0.1,
+        budget_burst: float = 10.0,
+        min_samples: int = 20,
+        initial_delay_seconds: float = 1.0,
+        min_delay_seconds: float = 0.005,
+        window: int = 512,
+        max_workers: int = 16,
+    ) -> None:
+        self.backend = backend
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.initial_delay_seconds = initial_delay_seconds
+        self.min_delay_seconds = min_delay_seconds
+        self.latencies = LatencyTracker(window)
+        self.budget = HedgeBudget(budget_ratio, budget_burst)
+        self.stats = HedgingStats()
+        self._stats_lock = Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="telemetry-hedge")
+
+    def _delay(self, operation: str) -> float:
+        observed = self.latencies.percentile(operation, self.percentile, self.min_samples)
+        if observed is None:
+            return self.initial_delay_seconds
+        return max(self.min_delay_seconds, observed)
+
+    def _timed(self, operation: str, action: Callable[[], T]) -> T:
+        started = time.perf_counter()
+        result = action()
+        self.latencies.record(operation, time.perf_counter() - started)
+        return result
+
+    def _submit(self, operation: str, action: Callable[[], T]) -> Future:
+        return self._executor.submit(copy_context().run, self._timed, operation, action)
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            setattr(self.stats, name, getattr(self.stats, name) + 1)
+
+    @staticmethod
+    def _expire(operation: str, futures: Iterable[Future]) -> DeadlineExceeded:
+        for future in futures:
+            future.cancel()
+        deadline = current_deadline()
+        return DeadlineExceeded(f"telemetry {operation}", deadline.budget_seconds if deadline else 0.0)
+
+    @staticmethod
+    def _remaining() -> float | None:
+        deadline = current_deadline()
+        return deadline.remaining() if deadline is not None and deadline.bounded else None
+
+    def _result(self, operation: str, future: Future) -> Any:
+        try:
+            return future.result(timeout=self._remaining())
+        except FutureTimeout:
+            raise self._expire(operation, (future,)) from None
+
+    def _call(self, operation: str, action: Callable[[], T]) -> T:
+        # The primary request gets the observed percentile latency to answer;
+        # after that a duplicate is sent if the budget allows and whichever
+        # succeeds first wins. The loser is abandoned, not interrupted. No
+        # wait outlives the incident deadline.
+        self._count("requests")
+        self.budget.earn()
+        primary = self._submit(operation, action)
+        done, _ = wait([primary], timeout=remaining_time(self._delay(operation)))
+        if done:
+            return primary.result()
+        if not self.budget.try_spend():
+            self._count("budget_exhausted")
+            return self._result(operation, primary)
+        self._count("hedges")
+        hedge = self._submit(operation, action)
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, timeout=self._remaining(), return_when=FIRST_COMPLETED)
+            if not done:
+                raise self._expire(operation, pending)
+            for future in (primary, hedge):
+                if future in done and future.exception() is None:
+                    for other in pending:
+                        other.cancel()
+                    if future is hedge:
+                        self._count("hedge_wins")
+                    return future.result()
+        return primary.result()
+
+    def _stream(self, operation: str, factory: Callable[[], Iterable[T]]) -> Iterator[T]:
+        # Streams are hedged on their time to first item, tracked apart from
+        # the list queries; the rest is read from whichever request won.
+        iterator, first = self._call(f"{operation}_stream", lambda: _first(factory))
+        if first is _END:
+            return
+        yield first
+        yield from iterator
+
+    def get_recent_deployments(self, service: str, env: str) -> list[dict[str, Any]]:
+        return self._call("deployments", lambda: self.backend.get_recent_deployments(service, env))
+
+    def query_metrics(self, service: str, env: str, metric_name: str | None = None) -> list[dict[str, Any]]:
+        return self._call("metrics", lambda: self.backend.query_metrics(service, env, metric_name=metric_name))
+
+    def query_logs(
+        self,
+        service: str,
+        env: str,
+        contains: str | None = None,
+        levels: Iterable[str] | None = None,
+        endpoint: str | None = None,
+        start_time: str | None = None,
+        end_time: str | None = None,
+    ) -> list[dict[str, Any]]:
+        return self._call(
+            "logs",
+            lambda: self.backend.query_logs(
+                service,
+                env,
+                contains=contains,
+                levels=levels,
+                endpoint=endpoint,
+                start_time=start_time,
+                end_time=end_time,
+            ),
+        )
+
+    def iter_recent_deployments(self, service: str, env: str) -> Iterator[dict[str, Any]]:
+        return self._stream("deployments", lambda: self.backend.iter_recent_deployments(service, env))
+
+    def iter_metrics(self, service: str, env: str, metric_name: str | None = None) -> Iterator[dict[str, Any]]:
+        return self._stream("metrics", lambda: self.backend.iter_metrics(service, env, metric_name=metric_name))
+
+    def iter_logs(
+        self,
+        service: str,
+        env: str,
+        contains: str | None = None,
+        levels: Iterable[str] | None = None,
+        endpoint: str | None = None,
+        start_time: str | None = None,
+        end_time: str | None = None,
+        newest_first: bool = False,
+    ) -> Iterator[dict[str, Any]]:
+        return self._stream(
+            "logs",
+            lambda: self.backend.iter_logs(
+                service,
+                env,
+                contains=contains,
+                levels=levels,
+                endpoint=endpoint,
+                start_time=start_time,
+                end_time=end_time,
+                newest_first=newest_first,
+            ),
+        )
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class LatencyInjectingAzureMonitorTool(AzureMonitorTool):
+    # Local stand-in for a remote telemetry backend: every call sleeps for a
+    # latency drawn from `latency(operation)` before answering.
+    def __init__(
+        self,
+        backend: AzureMonitorTool,
+        latency: Callable[[str], float],
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.backend = backend
+        self.latency = latency
+        self.sleep = sleep
+        self.calls = 0
+        self._lock = Lock()
+
+    def _wait(self, operation: str) -> None:
+        with self._lock:
+            self.calls += 1
+            seconds = self.latency(operation)
+        self.sleep(seconds)
+
+    def get_recent_deployments(self, service: str, env: str) -> list[dict[str, Any]]:
+        self._wait("deployments")
+        return self.backend.get_recent_deployments(service, env)
+
+    def query_metrics(self, service: str, env: str, metric_name: str | None = None) -> list[dict[str, Any]]:
+        self._wait("metrics")
+        return self.backend.query_metrics(service, env, metric_name=metric_name)
+
+    def query_logs(
+        self,
+        service: str,
+        env: str,
+        contains: str | None = None,
+        levels: Iterable[str] | None = None,
+        endpoint: str | None = None,
+        start_time: str | None = None,
+        end_time: str | None = None,
+    ) -> list[dict[str, Any]]:
+        self._wait("logs")
+        return self.backend.query_logs(
+            service,
+            env,
+            contains=contains,
+            levels=levels,
+            endpoint=endpoint,
+            start_time=start_time,
+            end_time=end_time,
+        )
+
+    def iter_recent_deployments(self, service: str, env: str) -> Iterator[dict[str, Any]]:
+        self._wait("deployments")
+        yield from self.backend.iter_recent_deployments(service, env)
+
+    def iter_metrics(self, service: str, env: str, metric_name: str | None = None) -> Iterator[dict[str, Any]]:
+        self._wait("metrics")
+        yield from self.backend.iter_metrics(service, env, metric_name=metric_name)
+
+    def iter_logs(
+        self,
+        service: str,
+        env: str,
+        contains: str | None = None,
+        levels: Iterable[str] | None = None,
+        endpoint: str | None = None,
+        start_time: str | None = None,
+        end_time: str | None = None,
+        newest_first: bool = False,
+    ) -> Iterator[dict[str, Any]]:
+        self._wait("logs")
+        yield from self.backend.iter_logs(
+            service,
+            env,
+            contains=contains,
+            levels=levels,
+            endpoint=endpoint,
+            start_time=start_time,
+            end_time=end_time,
+            newest_first=newest_first,
+        )
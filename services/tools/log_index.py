@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import heapq
+import re
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from copy import deepcopy
+from threading import RLock
+from typing import Any, Iterable, Iterator
+
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9_]+")
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def _grams(token: str) -> set[str]:
+    return {token[start : start + size] for size in (1, 2, 3) for start in range(len(token) - size + 1)}
+
+
+def _intersect(postings: list[list[int]]) -> list[int]:
+    if not postings:
+        return []
+    postings = sorted(postings, key=len)
+    candidates = set(postings[0])
+    for posting in postings[1:]:
+        if not candidates:
+            break
+        candidates.intersection_update(posting)
+    return sorted(candidates)
+
+
+def _contains(posting: list[int], doc_id: int) -> bool:
+    position = bisect_left(posting, doc_id)
+    return position < len(posting) and posting[position] == doc_id
+
+
+def _walk(posting: list[int], low: int, high: int, newest_first: bool) -> Iterator[int]:
+    start, stop = bisect_left(posting, low), bisect_left(posting, high)
+    positions = range(stop - 1, start - 1, -1) if newest_first else range(start, stop)
+    return (posting[position] for position in positions)
+
+
+class LogIndex:
+    def __init__(self, logs: Iterable[dict[str, Any]] | None = None) -> None:
+        self._lock = RLock()
+        self._logs: list[dict[str, Any]] = []
+        self._timestamps: list[str] = []
+        self._time_order: list[tuple[str, int]] = []
+        self._time_order_dirty = False
+        # True while logs have arrived in timestamp order, so doc ids (and
+        # therefore every posting list) are also sorted by time.
+        self._in_time_order = True
+        self._tokens: dict[str, list[int]] = defaultdict(list)
+        self._levels: dict[str, list[int]] = defaultdict(list)
+        self._endpoints: dict[str, list[int]] = defaultdict(list)
+        # Every 1-3 character substring of a token -> the tokens containing
+        # it, so substring terms resolve without scanning the vocabulary.
+        self._grams: dict[str, set[str]] = defaultdict(set)
+        if logs:
+            self.extend(logs)
+
+    def __len__(self) -> int:
+        return len(self._logs)
+
+    def add(self, log: dict[str, Any]) -> int:
+        with self._lock:
+            doc_id = len(self._logs)
+            timestamp = str(log.get("timestamp", ""))
+            self._logs.append(log)
+            self._timestamps.append(timestamp)
+
+            if doc_id and self._timestamps[doc_id - 1] > timestamp:
+                self._in_time_order = False
+            if self._time_order and self._time_order[-1][0] > timestamp:
+                self._time_order_dirty = True
+            self._time_order.append((timestamp, doc_id))
+
+            for token in set(tokenize(str(log.get("message", "")))):
+                if token not in self._tokens:
+                    for gram in _grams(token):
+                        self._grams[gram].add(token)
+                self._tokens[token].append(doc_id)
+            self._levels[str(log.get("level", "")).upper()].append(doc_id)
+            if log.get("endpoint"):
+                self._endpoints[str(log["endpoint"])].append(doc_id)
+            return doc_id
+
+    def extend(self, logs: Iterable[dict[str, Any]]) -> None:
+        with self._lock:
+            for log in logs:
+                self.add(log)
+
+    def _vocabulary_matches(self, term: str) -> list[str]:
+        if len(term) <= 3:
+            return list(self._grams.get(term, ()))
+        grams = {term[start : start + 3] for start in range(len(term) - 2)}
+        candidates = sorted((self._grams.get(gram, set()) for gram in grams), key=len)
+        if not candidates[0]:
+            return []
+        return [token for token in candidates[0].intersection(*candidates[1:]) if term in token]
+
+    def _message_contains(self, doc_id: int, phrase: str) -> bool:
+        return phrase in str(self._logs[doc_id].get("message", "")).lower()
+
+    def _posting_groups(
+        self,
+        levels: Iterable[str] | None,
+        endpoint: str | None,
+        phrase: str | None,
+    ) -> list[list[list[int]]]:
+        # A document matches when it is in at least one posting list of every group.
+        groups: list[list[list[int]]] = []
+        if levels is not None:
+            groups.append([self._levels.get(level, []) for level in {str(item).upper() for item in levels}])
+        if endpoint is not None:
+            groups.append([self._endpoints.get(endpoint, [])])
+        if phrase:
+            for term in set(_TOKEN_PATTERN.findall(phrase)):
+                groups.append([self._tokens[token] for token in self._vocabulary_matches(term)])
+        return groups
+
+    def _time_window(self, start_time: str | None, end_time: str | None) -> list[tuple[str, int]]:
+        if self._time_order_dirty:
+            self._time_order.sort()
+            self._time_order_dirty = False
+        low = 0 if start_time is None else bisect_left(self._time_order, (start_time, -1))
+        high = len(self._time_order)
+        if end_time is not None:
+            high = bisect_right(self._time_order, (end_time, len(self._logs)))
+        return self._time_order[low:high]
+
+    def search_ids(
+        self,
+        contains: str | None = None,
+        levels: Iterable[str] | None = None,
+        endpoint: str | None = None,
+        start_time: str | None = None,
+        end_time: str | None = None,
+    ) -> list[int]:
+        with self._lock:
+            phrase = contains.lower() if contains else None
+            postings: list[list[int]] = []
+            for group in self._posting_groups(levels, endpoint, phrase):
+                postings.append(group[0] if len(group) == 1 else sorted(set().union(*group)))
+
+            if not postings:
+                window = [doc_id for _, doc_id in self._time_window(start_time, end_time)]
+                if phrase:
+                    window = [doc_id for doc_id in window if self._message_contains(doc_id, phrase)]
+                return window
+
+            candidates = _intersect(postings)
+            if phrase:
+                candidates = [doc_id for doc_id in candidates if self._message_contains(doc_id, phrase)]
+            timestamps = self._timestamps
+            if start_time is not None:
+                candidates = [doc_id for doc_id in candidates if timestamps[doc_id] >= start_time]
+            if end_time is not None:
+                candidates = [doc_id for doc_id in candidates if timestamps[doc_id] <= end_time]
+            candidates.sort(key=lambda doc_id: (timestamps[doc_id], doc_id))
+            return candidates
+
+    def search(
+        self,
+        contains: str | None = None,
+        levels: Iterable[str] | None = None,
+        endpoint: str | None = None,
+        start_time: str | None = None,
+        end_time: str | None = None,
+    ) -> list[dict[str, Any]]:
+        doc_ids = self.search_ids(
+            contains=contains,
+            levels=levels,
+            endpoint=endpoint,
+            start_time=start_time,
+            end_time=end_time,
+        )
+        return [deepcopy(self._logs[doc_id]) for doc_id in doc_ids]
+
+    def iter_search(
+        self,
+        contains: str | None = None,
+        levels: Iterable[str] | None = None,
+        endpoint: str | None = None,
+        start_time: str | None = None,
+        end_time: str | None = None,
+        newest_first: bool = False,
+    ) -> Iterator[dict[str, Any]]:
+        # Matches are produced lazily in time order, so a consumer that stops
+        # early never pays for collecting and sorting every match.
+        with self._lock:
+            phrase = contains.lower() if contains else None
+            groups = self._posting_groups(levels, endpoint, phrase)
+            if self._in_time_order:
+                limit = len(self._logs)
+                low = 0 if start_time is None else bisect_left(self._timestamps, start_time, 0, limit)
+                high = limit if end_time is None else bisect_right(self._timestamps, end_time, 0, limit)
+                if groups:
+                    driver = min(groups, key=lambda group: sum(len(posting) for posting in group))
+                    groups = [group for group in groups if group is not driver]
+                    doc_ids = heapq.merge(
+                        *(_walk(posting, low, high, newest_first) for posting in driver),
+                        reverse=newest_first,
+                    )
+                else:
+                    doc_ids = iter(range(high - 1, low - 1, -1) if newest_first else range(low, high))
+            else:
+                window = self._time_window(start_time, end_time)
+                doc_ids = (doc_id for _, doc_id in (reversed(window) if newest_first else window))
+
+        previous = -1
+        for doc_id in doc_ids:
+            if doc_id == previous:
+                continue
+            previous = doc_id
+            if not all(any(_contains(posting, doc_id) for posting in group) for group in groups):
+                continue
+            if phrase and not self._message_contains(doc_id, phrase):
+                continue
+            yield deepcopy(self._logs[doc_id])
@@ -0,0 +1,344 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+from copy import deepcopy
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+import numpy as np
+
+from contracts.models import parse_iso
+from services.tools.azure_monitor import AzureMonitorTool
+
+
+# File layout: MAGIC, little-endian u64 header length, JSON header, then an
+# 8-byte aligned data section of raw little-endian column arrays. The header
+# only holds column offsets, string tables and the (small) deployment lists,
+# so opening a capture never touches the column data. Timestamps are stored
+# as epoch milliseconds (format version 2; version 1 stored whole seconds).
+MAGIC = b"SNTLRPL1"
+FORMAT_VERSION = 2
+_PREAMBLE = struct.Struct("<8sQ")
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MILLISECOND = timedelta(milliseconds=1)
+
+
+def _align(value: int) -> int:
+    return value + (-value % 8)
+
+
+def _to_epoch_ms(value: str) -> int:
+    parsed = parse_iso(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return (parsed - _EPOCH) // _MILLISECOND
+
+
+def _to_iso(epoch_ms: int) -> str:
+    moment = _EPOCH + int(epoch_ms) * _MILLISECOND
+    return moment.isoformat(timespec="milliseconds" if moment.microsecond else "seconds")
+
+
+class _ColumnWriter:
+    def __init__(self, handle: Any) -> None:
+        self.handle = handle
+        self.offset = 0
+
+    def write(self, array: np.ndarray) -> dict[str, Any]:
+        array = np.ascontiguousarray(array)
+        if array.dtype.byteorder == ">":
+            array = array.astype(array.dtype.newbyteorder("<"))
+        payload = array.tobytes()
+        padding = -len(payload) % 8
+        self.handle.write(payload + b"\0" * padding)
+        descriptor = {"offset": self.offset, "dtype": array.dtype.str, "count": int(array.shape[0])}
+        self.offset += len(payload) + padding
+        return descriptor
+
+
+def _intern(table: dict[str, int], value: Any) -> int:
+    return table.setdefault("" if value is None else str(value), len(table))
+
+
+def _write_metrics(columns: _ColumnWriter, metrics: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    names: dict[str, int] = {}
+    endpoints: dict[str, int] = {}
+    timestamps: list[int] = []
+    values: list[float] = []
+    name_ids: list[int] = []
+    endpoint_ids: list[int] = []
+    for metric in metrics:
+        timestamps.append(_to_epoch_ms(str(metric.get("timestamp", ""))))
+        values.append(float(metric.get("value", 0.0)))
+        name_ids.append(_intern(names, metric.get("name")))
+        endpoint_ids.append(_intern(endpoints, metric.get("endpoint")))
+    order = np.argsort(np.asarray(timestamps, dtype=np.int64), kind="stable")
+    return {
+        "names": list(names),
+        "endpoints": list(endpoints),
+        "timestamp": columns.write(np.asarray(timestamps, dtype="<i8")[order]),
+        "value": columns.write(np.asarray(values, dtype="<f8")[order]),
+        "name_id": columns.write(np.asarray(name_ids, dtype="<i4")[order]),
+        "endpoint_id": columns.write(np.asarray(endpoint_ids, dtype="<i4")[order]),
+    }
+
+
+def _write_logs(columns: _ColumnWriter, logs: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    levels: dict[str, int] = {}
+    endpoints: dict[str, int] = {}
+    timestamps: list[int] = []
+    level_ids: list[int] = []
+    endpoint_ids: list[int] = []
+    messages: list[bytes] = []
+    for log in logs:
+        timestamps.append(_to_epoch_ms(str(log.get("timestamp", ""))))
+        level_ids.append(_intern(levels, str(log.get("level", "")).upper()))
+        endpoint_ids.append(_intern(endpoints, log.get("endpoint")))
+        messages.append(str(log.get("message", "")).encode("utf-8"))
+    order = np.argsort(np.asarray(timestamps, dtype=np.int64), kind="stable")
+    ordered_messages = [messages[index] for index in order]
+    lengths = np.fromiter((len(message) for message in ordered_messages), dtype="<i8", count=len(ordered_messages))
+    offsets = np.concatenate(([0], np.cumsum(lengths))).astype("<i8")
+    return {
+        "levels": list(levels),
+        "endpoints": list(endpoints),
+        "timestamp": columns.write(np.asarray(timestamps, dtype="<i8")[order]),
+        "level_id": columns.write(np.asarray(level_ids, dtype="<i4")[order]),
+        "endpoint_id": columns.write(np.asarray(endpoint_ids, dtype="<i4")[order]),
+        "message_offset": columns.write(offsets),
+        "message_bytes": columns.write(np.frombuffer(b"".join(ordered_messages), dtype=np.uint8)),
+    }
+
+
+def write_replay_file(
+    path: str | Path,
+    dataset: dict[tuple[str, str], dict[str, Iterable[dict[str, Any]]]],
+) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    buckets: list[dict[str, Any]] = []
+    with tempfile.TemporaryFile() as data_handle:
+        columns = _ColumnWriter(data_handle)
+        for (service, env), bucket in dataset.items():
+            buckets.append(
+                {
+                    "service": service,
+                    "env": env,
+                    "deployments": list(bucket.get("deployments", [])),
+                    "metrics": _write_metrics(columns, bucket.get("metrics", [])),
+                    "logs": _write_logs(columns, bucket.get("logs", [])),
+                }
+            )
+        header = json.dumps({"version": FORMAT_VERSION, "buckets": buckets}).encode("utf-8")
+        data_handle.seek(0)
+        temp_path = path.with_name(path.name + ".tmp")
+        try:
+            with open(temp_path, "wb") as handle:
+                handle.write(_PREAMBLE.pack(MAGIC, len(header)))
+                handle.write(header)
+                handle.write(b"\0" * (_align(_PREAMBLE.size + len(header)) - _PREAMBLE.size - len(header)))
+                shutil.copyfileobj(data_handle, handle)
+            os.replace(temp_path, path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+
+
+@dataclass(frozen=True)
+class _LogColumns:
+    timestamps: np.ndarray
+    level_ids: np.ndarray
+    endpoint_ids: np.ndarray
+    message_offsets: np.ndarray
+    message_bytes: np.ndarray
+    levels: list[str]
+    endpoints: list[str]
+
+
+class ReplayAzureMonitorTool(AzureMonitorTool):
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._handle = open(self.path, "rb")
+        self._mmap = mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, header_length = _PREAMBLE.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"Not a Sentinel telemetry replay file: {self.path}")
+        header = json.loads(self._mmap[_PREAMBLE.size : _PREAMBLE.size + header_length])
+        if header.get("version") != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported replay format version {header.get('version')}: {self.path}")
+        self._data_offset = _align(_PREAMBLE.size + header_length)
+        self._buckets = {(bucket["service"], bucket["env"]): bucket for bucket in header["buckets"]}
+
+    def close(self) -> None:
+        if not self._mmap.closed:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # Column views handed out to callers still reference the map;
+                # it is released once they are garbage collected.
+                pass
+        self._handle.close()
+
+    def __enter__(self) -> "ReplayAzureMonitorTool":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def buckets(self) -> list[tuple[str, str]]:
+        return list(self._buckets)
+
+    def _column(self, descriptor: dict[str, Any]) -> np.ndarray:
+        return np.frombuffer(
+            self._mmap,
+            dtype=np.dtype(descriptor["dtype"]),
+            count=descriptor["count"],
+            offset=self._data_offset + descriptor["offset"],
+        )
+
+    def _window(self, timestamps: np.ndarray, start_time: str | None, end_time: str | None) -> slice:
+        low = 0 if start_time is None else int(np.searchsorted(timestamps, _to_epoch_ms(start_time), side="left"))
+        high = len(timestamps)
+        if end_time is not None:
+            high = int(np.searchsorted(timestamps, _to_epoch_ms(end_time), side="right"))
+        return slice(low, high)
+
+    def get_recent_deployments(self, service: str, env: str) -> list[dict[str, Any]]:
+        bucket = self._buckets.get((service, env))
+        deployments = deepcopy(bucket["deployments"]) if bucket else []
+        deployments.sort(key=lambda item: item.get("timestamp", ""), reverse=True)
+        return deployments
+
+    def iter_metrics(
+        self,
+        service: str,
+        env: str,
+        metric_name: str | None = None,
+        start_time: str | None = None,
+        end_time: str | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        bucket = self._buckets.get((service, env))
+        if not bucket or not bucket["metrics"]["timestamp"]["count"]:
+            return
+        descriptor = bucket["metrics"]
+        timestamps = self._column(descriptor["timestamp"])
+        name_ids = self._column(descriptor["name_id"])
+        window = self._window(timestamps, start_time, end_time)
+        rows = np.arange(window.start, window.stop)
+        if metric_name is not None:
+            if metric_name not in descriptor["names"]:
+                return
+            rows = rows[name_ids[window] == descriptor["names"].index(metric_name)]
+        values = self._column(descriptor["value"])
+        endpoint_ids = self._column(descriptor["endpoint_id"])
+        for row in rows.tolist():
+            metric = {
+                "timestamp": _to_iso(timestamps[row]),
+                "name": descriptor["names"][name_ids[row]],
+                "value": float(values[row]),
+            }
+            endpoint = descriptor["endpoints"][endpoint_ids[row]]
+            if endpoint:
+                metric["endpoint"] = endpoint
+            yield metric
+
+    def query_metrics(
+        self,
+        service: str,
+        env: str,
+        metric_name: str | None = None,
+    ) -> list[dict[str, Any]]:
+        return list(self.iter_metrics(service, env, metric_name=metric_name))
+
+    def _log_columns(self, service: str, env: str) -> _LogColumns | None:
+        bucket = self._buckets.get((service, env))
+        if not bucket or not bucket["logs"]["timestamp"]["count"]:
+            return None
+        descriptor = bucket["logs"]
+        return _LogColumns(
+            timestamps=self._column(descriptor["timestamp"]),
+            level_ids=self._column(descriptor["level_id"]),
+            endpoint_ids=self._column(descriptor["endpoint_id"]),
+            message_offsets=self._column(descriptor["message_offset"]),
+            message_bytes=self._column(descriptor["message_bytes"]),
+            levels=descriptor["levels"],
+            endpoints=descriptor["endpoints"],
+        )
+
+    def iter_logs(
+        self,
+        service: str,
+        env: str,
+        contains: str | None = None,
+        levels: Iterable[str] | None = None,
+        endpoint: str | None = None,
+        start_time: str | None = None,
+        end_time: str | None = None,
+        newest_first: bool = False,
+    ) -> Iterator[dict[str, Any]]:
+        columns = self._log_columns(service, env)
+        if columns is None:
+            return
+        window = self._window(columns.timestamps, start_time, end_time)
+        mask = np.ones(window.stop - window.start, dtype=bool)
+        if levels is not None:
+            wanted = [
+                columns.levels.index(level)
+                for level in {str(item).upper() for item in levels}
+                if level in columns.levels
+            ]
+            mask &= np.isin(columns.level_ids[window], wanted)
+        if endpoint is not None:
+            if endpoint not in columns.endpoints:
+                return
+            mask &= columns.endpoint_ids[window] == columns.endpoints.index(endpoint)
+        rows = np.flatnonzero(mask) + window.start
+        if newest_first:
+            rows = rows[::-1]
+
+        token = contains.lower() if contains else None
+        for row in rows.tolist():
+            start, stop = columns.message_offsets[row], columns.message_offsets[row + 1]
+            message = bytes(columns.message_bytes[start:stop]).decode("utf-8")
+            if token and token not in message.lower():
+                continue
+            log = {
+                "timestamp": _to_iso(columns.timestamps[row]),
+                "level": columns.levels[columns.level_ids[row]],
+                "message": message,
+            }
+            log_endpoint = columns.endpoints[columns.endpoint_ids[row]]
+            if log_endpoint:
+                log["endpoint"] = log_endpoint
+            yield log
+
+    def query_logs(
+        self,
+        service: str,
+        env: str,
+        contains: str | None = None,
+        levels: Iterable[str] | None = None,
+        endpoint: str | None = None,
+        start_time: str | None = None,
+        end_time: str | None = None,
+    ) -> list[dict[str, Any]]:
+        return list(
+            self.iter_logs(
+                service,
+                env,
+                contains=contains,
+                levels=levels,
+                endpoint=endpoint,
+                start_time=start_time,
+                end_time=end_time,
+            )
+        )
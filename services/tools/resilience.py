@@ -0,0 +1,376 @@
+from __future__ import annotations
+
+import random
+from collections import Counter
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+
+from contracts.clock import SYSTEM_CLOCK, Clock
+from contracts.deadline import DeadlineExceeded, remaining_time
+from contracts.models import IncidentEnvelope, PatchProposal
+from services.tools.azure_monitor import AzureMonitorTool
+from services.tools.ci_client import CIRunner
+from services.tools.github_client import GitHubClient, PullRequestInfo
+
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_END = object()
+
+
+class CircuitOpenError(RuntimeError):
+    def __init__(self, backend: str, retry_after_seconds: float) -> None:
+        super().__init__(f"Circuit for '{backend}' is open; next probe in {retry_after_seconds:.1f}s.")
+        self.backend = backend
+        self.retry_after_seconds = retry_after_seconds
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    attempts: int = 2
+    base_delay_seconds: float = 0.25
+    max_delay_seconds: float = 8.0
+
+    def delay(self, retry: int, rng: random.Random) -> float:
+        # Full jitter: retries from many incidents spread over the whole
+        # window instead of arriving at the recovering backend in lockstep.
+        ceiling = min(self.max_delay_seconds, self.base_delay_seconds * 2 ** (retry - 1))
+        return rng.uniform(0.0, ceiling)
+
+
+@dataclass
+class BreakerStats:
+    calls: int = 0
+    successes: int = 0
+    failures: int = 0
+    short_circuits: int = 0
+    opened: int = 0
+
+    def to_dict(self) -> dict[str, int]:
+        return {
+            "calls": self.calls,
+            "successes": self.successes,
+            "failures": self.failures,
+            "short_circuits": self.short_circuits,
+            "opened": self.opened,
+        }
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout_seconds: float = 30.0,
+        clock: Clock | None = None,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.clock = clock or SYSTEM_CLOCK
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.stats = BreakerStats()
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = Lock()
+
+    def allow(self) -> None:
+        # While open every call fails fast; after the reset timeout a single
+        # probe is let through and its outcome closes or re-opens the circuit.
+        with self._lock:
+            if self.state == OPEN:
+                wait = self._opened_at + self.reset_timeout_seconds - self.clock.monotonic()
+                if wait > 0:
+                    self.stats.short_circuits += 1
+                    raise CircuitOpenError(self.name, wait)
+                self.state = HALF_OPEN
+                self._probing = False
+            if self.state == HALF_OPEN:
+                if self._probing:
+                    self.stats.short_circuits += 1
+                    raise CircuitOpenError(self.name, self.reset_timeout_seconds)
+                self._probing = True
+            self.stats.calls += 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.stats.successes += 1
+            self.consecutive_failures = 0
+            self.state = CLOSED
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.stats.failures += 1
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.stats.opened += 1
+                self.state = OPEN
+                self._opened_at = self.clock.monotonic()
+                self._probing = False
+
+    def release(self) -> None:
+        # The call ended without a verdict on the backend (e.g. the incident
+        # ran out of time); free the probe slot without changing state.
+        with self._lock:
+            self._probing = False
+
+    def to_dict(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                **self.stats.to_dict(),
+            }
+
+
+def _first(factory: Callable[[], Iterable[T]]) -> tuple[Iterator[T], Any]:
+    iterator = iter(factory())
+    return iterator, next(iterator, _END)
+
+
+class ToolResilience:
+    def __init__(
+        self,
+        policy: RetryPolicy | None = None,
+        failure_threshold: int = 5,
+        reset_timeout_seconds: float = 30.0,
+        clock: Clock | None = None,
+        seed: int | None = None,
+        on_call: Callable[[str, str, str, float], None] | None = None,
+    ) -> None:
+        self.policy = policy or RetryPolicy()
+        self.on_call = on_call
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.clock = clock or SYSTEM_CLOCK
+        self.retries: Counter[str] = Counter()
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._rng = random.Random(seed)
+        self._lock = Lock()
+
+    def breaker(self, backend: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(backend)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    backend,
+                    failure_threshold=self.failure_threshold,
+                    reset_timeout_seconds=self.reset_timeout_seconds,
+                    clock=self.clock,
+                )
+                self._breakers[backend] = breaker
+            return breaker
+
+    def backoff(self, name: str, retry: int) -> None:
+        with self._lock:
+            self.retries[name] += 1
+            delay = self.policy.delay(retry, self._rng)
+        self.clock.sleep(remaining_time(delay))
+
+    def _observe(self, backend: str, operation: str, outcome: str, started: float) -> None:
+        if self.on_call is not None:
+            self.on_call(backend, operation, outcome, self.clock.monotonic() - started)
+
+    def call(
+        self,
+        backend: str,
+        action: Callable[[], T],
+        operation: str = "call",
+        attempts: int | None = None,
+    ) -> T:
+        breaker = self.breaker(backend)
+        attempts = self.policy.attempts if attempts is None else attempts
+        for attempt in range(1, attempts + 1):
+            breaker.allow()
+            started = self.clock.monotonic()
+            try:
+                result = action()
+            except DeadlineExceeded:
+                self._observe(backend, operation, "deadline", started)
+                breaker.release()
+                raise
+            except Exception:
+                self._observe(backend, operation, "error", started)
+                breaker.record_failure()
+                if attempt >= attempts:
+                    raise
+                self.backoff(backend, attempt)
+            else:
+                self._observe(backend, operation, "ok", started)
+                breaker.record_success()
+                return result
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    def stream(self, backend: str, factory: Callable[[], Iterable[T]], operation: str = "stream") -> Iterator[T]:
+        # Opening the stream and fetching its first item are retried; once
+        # items have reached the caller a failure is recorded and propagated.
+        iterator, first = self.call(backend, lambda: _first(factory), operation)
+        if first is _END:
+            return
+        yield first
+        try:
+            yield from iterator
+        except Exception:
+            self.breaker(backend).record_failure()
+            raise
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            breakers = dict(self._breakers)
+            retries = dict(self.retries)
+        return {
+            "breakers": {name: breaker.to_dict() for name, breaker in sorted(breakers.items())},
+            "retries": retries,
+        }
+
+
+class ResilientAzureMonitorTool(AzureMonitorTool):
+    def __init__(self, backend: AzureMonitorTool, resilience: ToolResilience, name: str = "azure_monitor") -> None:
+        self.backend = backend
+        self.resilience = resilience
+        self.name = name
+
+    def get_recent_deployments(self, service: str, env: str) -> list[dict[str, Any]]:
+        return self.resilience.call(
+            self.name,
+            lambda: self.backend.get_recent_deployments(service, env),
+            "get_recent_deployments",
+        )
+
+    def query_metrics(self, service: str, env: str, metric_name: str | None = None) -> list[dict[str, Any]]:
+        return self.resilience.call(
+            self.name,
+            lambda: self.backend.query_metrics(service, env, metric_name=metric_name),
+            "query_metrics",
+        )
+
+    def query_logs(
+        self,
+        service: str,
+        env: str,
+        contains: str | None = None,
+        levels: Iterable[str] | None = None,
+        endpoint: str | None = None,
+        start_time: str | None = None,
+        end_time: str | None = None,
+    ) -> list[dict[str, Any]]:
+        return self.resilience.call(
+            self.name,
+            lambda: self.backend.query_logs(
+                service,
+                env,
+                contains=contains,
+                levels=levels,
+                endpoint=endpoint,
+                start_time=start_time,
+                end_time=end_time,
+            ),
+            "query_logs",
+        )
+
+    def iter_recent_deployments(self, service: str, env: str) -> Iterator[dict[str, Any]]:
+        return self.resilience.stream(
+            self.name,
+            lambda: self.backend.iter_recent_deployments(service, env),
+            "iter_recent_deployments",
+        )
+
+    def iter_metrics(self, service: str, env: str, metric_name: str | None = None) -> Iterator[dict[str, Any]]:
+        return self.resilience.stream(
+            self.name,
+            lambda: self.backend.iter_metrics(service, env, metric_name=metric_name),
+            "iter_metrics",
+        )
+
+    def iter_logs(
+        self,
+        service: str,
+        env: str,
+        contains: str | None = None,
+        levels: Iterable[str] | None = None,
+        endpoint: str | None = None,
+        start_time: str | None = None,
+        end_time: str | None = None,
+        newest_first: bool = False,
+    ) -> Iterator[dict[str, Any]]:
+        return self.resilience.stream(
+            self.name,
+            lambda: self.backend.iter_logs(
+                service,
+                env,
+                contains=contains,
+                levels=levels,
+                endpoint=endpoint,
+                start_time=start_time,
+                end_time=end_time,
+                newest_first=newest_first,
+            ),
+            "iter_logs",
+        )
+
+
+class ResilientCIRunner(CIRunner):
+    def __init__(self, backend: CIRunner, resilience: ToolResilience, name: str = "ci") -> None:
+        super().__init__()
+        self.backend = backend
+        self.resilience = resilience
+        self.name = name
+        self.test_suites = backend.test_suites
+        self.batch_suites = backend.batch_suites
+
+    def config_fingerprint(self) -> dict[str, Any] | None:
+        return self.backend.config_fingerprint()
+
+    # Only exceptions count against the circuit; a failing suite is a valid
+    # verdict on the patch, not a sign that CI is unhealthy.
+    def run_suite(self, patch: PatchProposal, suite: str) -> str:
+        return self.resilience.call(self.name, lambda: self.backend.run_suite(patch, suite), "run_suite")
+
+    def run_tests(self, patch: PatchProposal) -> dict[str, str]:
+        return self.resilience.call(self.name, lambda: self.backend.run_tests(patch), "run_tests")
+
+    def cancel(self, patch: PatchProposal) -> None:
+        self.backend.cancel(patch)
+
+    def run_canary_replay(self, incident: IncidentEnvelope, patch: PatchProposal) -> dict[str, float | str]:
+        return self.resilience.call(
+            self.name,
+            lambda: self.backend.run_canary_replay(incident, patch),
+            "run_canary_replay",
+        )
+
+
+class ResilientGitHubClient(GitHubClient):
+    def __init__(self, backend: GitHubClient, resilience: ToolResilience, name: str = "github") -> None:
+        super().__init__(owner=backend.owner, repo=backend.repo, token=backend.token, mode=backend.mode)
+        self.backend = backend
+        self.resilience = resilience
+        self.name = name
+        self.created_prs = backend.created_prs
+
+    def find_pull_request(self, head_branch: str) -> PullRequestInfo | None:
+        return self.resilience.call(self.name, lambda: self.backend.find_pull_request(head_branch), "find_pull_request")
+
+    def create_draft_pr(
+        self,
+        title: str,
+        body: str,
+        head_branch: str,
+        base_branch: str = "main",
+    ) -> PullRequestInfo:
+        # Creating a PR is not idempotent, so it is attempted once; the PR
+        # outbox owns retries and looks the PR up before trying again.
+        return self.resilience.call(
+            self.name,
+            lambda: self.backend.create_draft_pr(title, body, head_branch, base_branch),
+            "create_draft_pr",
+            attempts=1,
+        )
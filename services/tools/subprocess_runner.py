@@ -0,0 +1,394 @@
+from __future__ import annotations
+
+import json
+import os
+import shlex
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from queue import Empty, Queue
+from threading import BoundedSemaphore, Lock, Thread
+from typing import IO, Any, Sequence
+
+from contracts.deadline import remaining_time
+from contracts.models import PatchProposal
+from services.tools.ci_client import CIRunner
+
+
+# Tiny launcher that applies the resource limits inside the child and then
+# execs the real command, so no Python code runs between fork and exec in
+# the (multi-threaded) parent.
+_LIMIT_SHIM = """
+import json, os, resource, sys
+for name, value in json.loads(sys.argv[1]).items():
+    limit = getattr(resource, name, None)
+    if limit is not None:
+        try:
+            resource.setrlimit(limit, (value, value))
+        except (ValueError, OSError):
+            pass
+os.execvp(sys.argv[2], sys.argv[2:])
+"""
+
+
+@dataclass(frozen=True)
+class ResourceLimits:
+    cpu_seconds: int | None = None
+    memory_bytes: int | None = None
+    open_files: int | None = 1024
+    processes: int | None = None
+
+    def to_rlimits(self) -> dict[str, int]:
+        values = {
+            "RLIMIT_CPU": self.cpu_seconds,
+            "RLIMIT_AS": self.memory_bytes,
+            "RLIMIT_NOFILE": self.open_files,
+            "RLIMIT_NPROC": self.processes,
+        }
+        return {name: int(value) for name, value in values.items() if value is not None}
+
+
+@dataclass(frozen=True)
+class SuiteExecution:
+    suite: str
+    branch: str
+    command: tuple[str, ...]
+    status: str
+    returncode: int | None
+    duration_seconds: float
+    output: str
+    output_truncated: bool
+    worktree: str
+
+
+@dataclass
+class _Child:
+    suite: str
+    process: subprocess.Popen[bytes]
+    output: "_CappedOutput"
+    started: float = field(default_factory=time.perf_counter)
+    cancelled: bool = False
+
+    def kill(self) -> None:
+        # Kill the whole session so test runners cannot leave children behind.
+        try:
+            os.killpg(self.process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+
+class _CappedOutput:
+    def __init__(self, stream: IO[bytes], limit: int) -> None:
+        self.limit = limit
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.dropped = 0
+        self._thread = Thread(target=self._drain, args=(stream,), daemon=True)
+        self._thread.start()
+
+    def _drain(self, stream: IO[bytes]) -> None:
+        # Keep the first and last half of the allowed budget; test failures
+        # are usually reported at the end, setup errors at the start.
+        half = self.limit // 2
+        for chunk in iter(lambda: stream.read(65536), b""):
+            room = half - len(self.head)
+            if room > 0:
+                self.head.extend(chunk[:room])
+                chunk = chunk[room:]
+            self.tail.extend(chunk)
+            overflow = len(self.tail) - (self.limit - half)
+            if overflow > 0:
+                del self.tail[:overflow]
+                self.dropped += overflow
+        stream.close()
+
+    def result(self, timeout: float = 5.0) -> tuple[str, bool]:
+        self._thread.join(timeout)
+        text = bytes(self.head).decode("utf-8", "replace")
+        if self.dropped:
+            text += f"\n... [{self.dropped} bytes truncated] ...\n"
+        return text + bytes(self.tail).decode("utf-8", "replace"), bool(self.dropped)
+
+
+class WorktreePool:
+    def __init__(self, repo_path: str | Path, base_ref: str = "HEAD", root: str | Path | None = None) -> None:
+        self.repo_path = Path(repo_path).resolve()
+        self.base_ref = base_ref
+        self._owns_root = root is None
+        self.root = Path(root) if root else Path(tempfile.mkdtemp(prefix="sentinel-worktrees-"))
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._idle: list[Path] = []
+        self._all: list[Path] = []
+        self._created = 0
+        self._lock = Lock()
+        self.base_commit = self._git(self.repo_path, "rev-parse", "--verify", f"{base_ref}^{{commit}}").strip()
+
+    @staticmethod
+    def _git(cwd: Path, *args: str, stdin: str | None = None) -> str:
+        completed = subprocess.run(
+            ["git", *args],
+            cwd=cwd,
+            input=stdin,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if completed.returncode != 0:
+            raise RuntimeError(f"git {' '.join(args)} failed: {completed.stderr.strip()}")
+        return completed.stdout
+
+    def acquire(self) -> Path:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+            path = self.root / f"wt-{self._created:03d}"
+            self._created += 1
+        self._git(self.repo_path, "worktree", "add", "--detach", str(path), self.base_commit)
+        with self._lock:
+            self._all.append(path)
+        return path
+
+    def reset(self, path: Path) -> None:
+        # Ignored files (virtualenvs, build and test caches) survive the reset,
+        # which is what keeps reused worktrees warm.
+        self._git(path, "reset", "--hard", "--quiet", self.base_commit)
+        self._git(path, "clean", "-fdq")
+
+    def release(self, path: Path) -> None:
+        try:
+            self.reset(path)
+        except RuntimeError:
+            self.discard(path)
+            return
+        with self._lock:
+            self._idle.append(path)
+
+    def discard(self, path: Path) -> None:
+        with self._lock:
+            if path in self._all:
+                self._all.remove(path)
+        subprocess.run(
+            ["git", "worktree", "remove", "--force", str(path)],
+            cwd=self.repo_path,
+            capture_output=True,
+            check=False,
+        )
+
+    def apply(self, path: Path, patch_text: str) -> None:
+        if patch_text.strip():
+            self._git(path, "apply", "--whitespace=nowarn", "-", stdin=patch_text)
+
+    def close(self) -> None:
+        with self._lock:
+            paths, self._all, self._idle = list(self._all), [], []
+        for path in paths:
+            subprocess.run(
+                ["git", "worktree", "remove", "--force", str(path)],
+                cwd=self.repo_path,
+                capture_output=True,
+                check=False,
+            )
+        subprocess.run(["git", "worktree", "prune"], cwd=self.repo_path, capture_output=True, check=False)
+        if self._owns_root:
+            shutil.rmtree(self.root, ignore_errors=True)
+
+
+class SubprocessCIRunner(CIRunner):
+    def __init__(
+        self,
+        repo_path: str | Path,
+        suite_commands: dict[str, str | Sequence[str]],
+        base_ref: str = "HEAD",
+        max_workers: int = 4,
+        timeout_seconds: float = 600.0,
+        limits: ResourceLimits | None = None,
+        max_output_bytes: int = 64 * 1024,
+        worktree_root: str | Path | None = None,
+        env: dict[str, str] | None = None,
+        history_size: int = 256,
+        fail_fast: bool = True,
+        **ci_options: Any,
+    ) -> None:
+        super().__init__(**ci_options)
+        self.suite_commands = {
+            suite: tuple(shlex.split(command) if isinstance(command, str) else command)
+            for suite, command in suite_commands.items()
+        }
+        self.test_suites = tuple(self.suite_commands)
+        self.batch_suites = True
+        self.timeout_seconds = timeout_seconds
+        self.limits = limits or ResourceLimits()
+        self.max_output_bytes = max_output_bytes
+        self.env = dict(env or {})
+        self.worktrees = WorktreePool(repo_path, base_ref=base_ref, root=worktree_root)
+        self.executions: OrderedDict[tuple[str, str], SuiteExecution] = OrderedDict()
+        self.history_size = history_size
+        self.fail_fast = fail_fast
+        self._slots = BoundedSemaphore(max_workers)
+        self._history_lock = Lock()
+        self._live: dict[str, list[_Child]] = {}
+        self._live_lock = Lock()
+
+    def config_fingerprint(self) -> dict[str, Any]:
+        return {
+            "runner": f"{type(self).__module__}.{type(self).__qualname__}",
+            "suites": {suite: list(command) for suite, command in self.suite_commands.items()},
+            "base_commit": self.worktrees.base_commit,
+            "limits": self.limits.to_rlimits(),
+            "env": sorted(self.env.items()),
+        }
+
+    def _command(self, suite: str) -> list[str]:
+        command = list(self.suite_commands[suite])
+        rlimits = self.limits.to_rlimits()
+        if not rlimits or os.name != "posix":
+            return command
+        return [sys.executable, "-c", _LIMIT_SHIM, json.dumps(rlimits), *command]
+
+    def _spawn(self, suite: str, worktree: Path, finished: Queue[_Child]) -> _Child:
+        process = subprocess.Popen(
+            self._command(suite),
+            cwd=worktree,
+            env={**os.environ, **self.env},
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+        child = _Child(suite, process, _CappedOutput(process.stdout, self.max_output_bytes))
+        Thread(target=self._reap, args=(child, finished), daemon=True).start()
+        return child
+
+    @staticmethod
+    def _reap(child: _Child, finished: Queue[_Child]) -> None:
+        child.process.wait()
+        finished.put(child)
+
+    def _run_in_worktree(self, patch: PatchProposal, suites: Sequence[str]) -> dict[str, str]:
+        # The patch is applied once and the suites then run side by side in
+        # that worktree under one shared budget. With fail_fast the first
+        # failing suite stops the rest; cancel() stops all of them.
+        results: dict[str, str] = {}
+        with self._slots:
+            started = time.perf_counter()
+            worktree = self.worktrees.acquire()
+            try:
+                try:
+                    self.worktrees.apply(worktree, patch.patch_text)
+                except RuntimeError as exc:
+                    for suite in suites:
+                        self._record(patch, suite, "failed", None, str(exc), False, started, worktree)
+                        results[suite] = "failed"
+                    return results
+                deadline = time.perf_counter() + remaining_time(self.timeout_seconds)
+                finished: Queue[_Child] = Queue()
+                children = [self._spawn(suite, worktree, finished) for suite in suites]
+                with self._live_lock:
+                    self._live.setdefault(patch.branch, []).extend(children)
+                try:
+                    results = self._collect(patch, children, finished, deadline, worktree)
+                finally:
+                    with self._live_lock:
+                        live = [child for child in self._live.get(patch.branch, []) if child not in children]
+                        if live:
+                            self._live[patch.branch] = live
+                        else:
+                            self._live.pop(patch.branch, None)
+            finally:
+                self.worktrees.release(worktree)
+        return {suite: results[suite] for suite in suites}
+
+    def _collect(
+        self,
+        patch: PatchProposal,
+        children: list[_Child],
+        finished: Queue[_Child],
+        deadline: float,
+        worktree: Path,
+    ) -> dict[str, str]:
+        results: dict[str, str] = {}
+        pending = list(children)
+        stop_reason: str | None = None
+        while pending and stop_reason is None:
+            try:
+                child = finished.get(timeout=max(0.0, deadline - time.perf_counter()))
+            except Empty:
+                stop_reason = "timed_out"
+                break
+            pending.remove(child)
+            returncode = child.process.returncode
+            if child.cancelled:
+                status = "cancelled"
+            else:
+                status = "passed" if returncode == 0 else "failed"
+            text, truncated = child.output.result()
+            self._record(patch, child.suite, status, returncode, text, truncated, child.started, worktree)
+            results[child.suite] = status
+            if status != "passed" and self.fail_fast:
+                stop_reason = "cancelled"
+        for child in pending:
+            child.kill()
+        for child in pending:
+            child.process.wait()
+            status = "cancelled" if child.cancelled else stop_reason or "cancelled"
+            text, truncated = child.output.result()
+            self._record(patch, child.suite, status, None, text, truncated, child.started, worktree)
+            results[child.suite] = status
+        return results
+
+    def _record(
+        self,
+        patch: PatchProposal,
+        suite: str,
+        status: str,
+        returncode: int | None,
+        text: str,
+        truncated: bool,
+        started: float,
+        worktree: Path,
+    ) -> None:
+        execution = SuiteExecution(
+            suite=suite,
+            branch=patch.branch,
+            command=self.suite_commands[suite],
+            status=status,
+            returncode=returncode,
+            duration_seconds=time.perf_counter() - started,
+            output=text,
+            output_truncated=truncated,
+            worktree=str(worktree),
+        )
+        with self._history_lock:
+            self.executions[(patch.branch, suite)] = execution
+            self.executions.move_to_end((patch.branch, suite))
+            while len(self.executions) > self.history_size:
+                self.executions.popitem(last=False)
+
+    def run_suite(self, patch: PatchProposal, suite: str) -> str:
+        if suite not in self.suite_commands:
+            return "failed"
+        return self._run_in_worktree(patch, (suite,))[suite]
+
+    def run_tests(self, patch: PatchProposal) -> dict[str, str]:
+        return self._run_in_worktree(patch, self.test_suites)
+
+    def cancel(self, patch: PatchProposal) -> None:
+        with self._live_lock:
+            children = list(self._live.get(patch.branch, ()))
+        for child in children:
+            child.cancelled = True
+            child.kill()
+
+    def close(self) -> None:
+        with self._live_lock:
+            children = [child for branch in self._live.values() for child in branch]
+        for child in children:
+            child.cancelled = True
+            child.kill()
+        self.worktrees.close()
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
-from collections import defaultdict
+import heapq
+import random
+from collections import defaultdict, deque
 from copy import deepcopy
-from typing import Any
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Generator, Iterator
 
-from contracts.models import IncidentEnvelope, utcnow_iso
+from contracts.models import IncidentEnvelope, parse_iso, utcnow_iso
 
 
 def default_telemetry_dataset() -> dict[tuple[str, str], dict[str, list[dict[str, Any]]]]:
@@ -83,6 +87,243 @@ def synthetic_5xx_incident(
     )
 
 
+INFO_LOG_TEMPLATES = (
+    "Request served in {latency}ms",
+    "Cache hit for session lookup",
+    "Payment authorization accepted",
+)
+ERROR_LOG_TEMPLATES = (
+    "Upstream timeout when contacting payments dependency",
+    "Retry budget exhausted for payment provider",
+    "Connection pool exhausted waiting for database handle",
+)
+
+
+def _iso(epoch: int) -> str:
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat()
+
+
+@dataclass(frozen=True)
+class WorkloadSpec:
+    seed: int = 7
+    services: int = 1
+    endpoints_per_service: int = 3
+    envs: tuple[str, ...] = ("prod",)
+    start_time: str = "2026-02-14T00:00:00+00:00"
+    duration_minutes: int = 60
+    metric_resolution_seconds: int = 60
+    logs_per_minute: int = 10
+    deployment_interval_minutes: int = 30
+    regression_probability: float = 0.5
+    regression_duration_minutes: int = 20
+    baseline_error_rate: float = 0.01
+    regression_error_rate: float = 0.2
+    baseline_latency_ms: float = 250.0
+    regression_latency_ms: float = 1400.0
+    alert_storm_size: int = 5
+    alert_storm_spread_seconds: int = 120
+
+
+@dataclass(frozen=True)
+class InjectedRegression:
+    service: str
+    env: str
+    endpoint: str
+    deployment_id: str
+    start_epoch: int
+    end_epoch: int
+
+
+class SyntheticWorkload:
+    def __init__(self, spec: WorkloadSpec | None = None) -> None:
+        self.spec = spec or WorkloadSpec()
+        start = parse_iso(self.spec.start_time)
+        if start.tzinfo is None:
+            start = start.replace(tzinfo=timezone.utc)
+        self.start_epoch = int(start.timestamp())
+        self.end_epoch = self.start_epoch + self.spec.duration_minutes * 60
+        self._regressions: dict[tuple[str, str], list[InjectedRegression]] = {}
+
+    def _rng(self, *scope: str) -> random.Random:
+        return random.Random(":".join((str(self.spec.seed),) + scope))
+
+    def service_names(self) -> list[str]:
+        return [f"svc-{index:03d}" for index in range(self.spec.services)]
+
+    def endpoints(self, service: str) -> list[str]:
+        return [f"/{service}/op-{index:02d}" for index in range(self.spec.endpoints_per_service)]
+
+    def buckets(self) -> list[tuple[str, str]]:
+        return [(service, env) for service in self.service_names() for env in self.spec.envs]
+
+    def _deployment_epochs(self, service: str, env: str) -> list[int]:
+        interval = self.spec.deployment_interval_minutes * 60
+        if interval <= 0:
+            return []
+        offset = self._rng(service, env, "deploy-offset").randrange(interval)
+        return list(range(self.start_epoch + offset, self.end_epoch, interval))
+
+    def iter_deployments(self, service: str, env: str) -> Iterator[dict[str, Any]]:
+        rng = self._rng(service, env, "deployments")
+        for index, epoch in enumerate(self._deployment_epochs(service, env)):
+            stamp = datetime.fromtimestamp(epoch, timezone.utc)
+            yield {
+                "deployment_id": f"dep-{service}-{env}-{index:04d}",
+                "version": f"{stamp:%Y.%m.%d}.{index}",
+                "timestamp": _iso(epoch),
+                "commit": f"{rng.getrandbits(28):07x}",
+            }
+
+    def regressions(self, service: str, env: str) -> list[InjectedRegression]:
+        cached = self._regressions.get((service, env))
+        if cached is not None:
+            return cached
+        rng = self._rng(service, env, "regressions")
+        endpoints = self.endpoints(service)
+        deployment_epochs = self._deployment_epochs(service, env)
+        regressions: list[InjectedRegression] = []
+        for index, epoch in enumerate(deployment_epochs):
+            if rng.random() >= self.spec.regression_probability or not endpoints:
+                continue
+            end_epoch = epoch + self.spec.regression_duration_minutes * 60
+            if index + 1 < len(deployment_epochs):
+                end_epoch = min(end_epoch, deployment_epochs[index + 1])
+            regressions.append(
+                InjectedRegression(
+                    service=service,
+                    env=env,
+                    endpoint=rng.choice(endpoints),
+                    deployment_id=f"dep-{service}-{env}-{index:04d}",
+                    start_epoch=epoch,
+                    end_epoch=end_epoch,
+                )
+            )
+        self._regressions[(service, env)] = regressions
+        return regressions
+
+    def _degraded_endpoints(self, service: str, env: str) -> Generator[set[str], int, None]:
+        # Coroutine over a monotonically increasing clock: send an epoch, get
+        # the endpoints degraded at that instant without rescanning the plan.
+        pending = deque(self.regressions(service, env))
+        active: list[InjectedRegression] = []
+        degraded: set[str] = set()
+        while True:
+            epoch = yield degraded
+            while pending and pending[0].start_epoch <= epoch:
+                active.append(pending.popleft())
+            active = [regression for regression in active if regression.end_epoch > epoch]
+            degraded = {regression.endpoint for regression in active}
+
+    def iter_metrics(self, service: str, env: str) -> Iterator[dict[str, Any]]:
+        rng = self._rng(service, env, "metrics")
+        spec = self.spec
+        endpoints = self.endpoints(service)
+        step = max(1, spec.metric_resolution_seconds)
+        schedule = self._degraded_endpoints(service, env)
+        next(schedule)
+        for epoch in range(self.start_epoch, self.end_epoch, step):
+            timestamp = _iso(epoch)
+            degraded_endpoints = schedule.send(epoch)
+            for endpoint in endpoints:
+                degraded = endpoint in degraded_endpoints
+                error_rate = spec.regression_error_rate if degraded else spec.baseline_error_rate
+                latency = spec.regression_latency_ms if degraded else spec.baseline_latency_ms
+                yield {
+                    "timestamp": timestamp,
+                    "name": "http_5xx_rate",
+                    "value": round(max(0.0, error_rate * rng.uniform(0.8, 1.2)), 4),
+                    "endpoint": endpoint,
+                }
+                yield {
+                    "timestamp": timestamp,
+                    "name": "p95_latency_ms",
+                    "value": round(latency * rng.uniform(0.9, 1.1), 1),
+                    "endpoint": endpoint,
+                }
+
+    def iter_logs(self, service: str, env: str) -> Iterator[dict[str, Any]]:
+        rng = self._rng(service, env, "logs")
+        spec = self.spec
+        endpoints = self.endpoints(service)
+        if spec.logs_per_minute <= 0 or not endpoints:
+            return
+        spacing = 60.0 / spec.logs_per_minute
+        schedule = self._degraded_endpoints(service, env)
+        next(schedule)
+        for minute_epoch in range(self.start_epoch, self.end_epoch, 60):
+            for slot in range(spec.logs_per_minute):
+                epoch = minute_epoch + int(slot * spacing)
+                endpoint = rng.choice(endpoints)
+                if endpoint in schedule.send(epoch) and rng.random() < 0.5:
+                    level = "ERROR"
+                    message = rng.choice(ERROR_LOG_TEMPLATES)
+                else:
+                    level = "INFO"
+                    message = rng.choice(INFO_LOG_TEMPLATES).format(latency=rng.randint(20, 400))
+                yield {
+                    "timestamp": _iso(epoch),
+                    "level": level,
+                    "message": message,
+                    "endpoint": endpoint,
+                }
+
+    def _iter_bucket_incidents(self, service: str, env: str) -> Iterator[dict[str, Any]]:
+        spec = self.spec
+        rng = self._rng(service, env, "incidents")
+        storm: list[tuple[str, str, dict[str, Any]]] = []
+        for number, regression in enumerate(self.regressions(service, env)):
+            detection_epoch = regression.start_epoch + spec.metric_resolution_seconds
+            # Later regressions are detected no earlier than this one, so
+            # anything already queued before this instant is final.
+            cutoff = _iso(detection_epoch)
+            while storm and storm[0][0] < cutoff:
+                yield heapq.heappop(storm)[2]
+            for burst_index in range(max(1, spec.alert_storm_size)):
+                offset = 0 if burst_index == 0 else rng.randrange(max(1, spec.alert_storm_spread_seconds))
+                incident = {
+                    "incident_id": f"inc-{service}-{env}-{number:04d}-{burst_index:02d}",
+                    "service": service,
+                    "env": env,
+                    "start_time": _iso(detection_epoch + offset),
+                    "signal_type": "http_5xx_rate",
+                    "signal_payload": {
+                        "error_rate": round(spec.regression_error_rate * rng.uniform(0.9, 1.1), 4),
+                        "baseline_error_rate": spec.baseline_error_rate,
+                        "endpoint": regression.endpoint,
+                        "latency_p95_ms": spec.regression_latency_ms,
+                    },
+                    "runbook_hint": "rollback_recent_release_or_adjust_timeout",
+                }
+                heapq.heappush(storm, (incident["start_time"], incident["incident_id"], incident))
+        while storm:
+            yield heapq.heappop(storm)[2]
+
+    def iter_incidents(self) -> Iterator[dict[str, Any]]:
+        # Each bucket yields in (start_time, incident_id) order holding at most
+        # one alert storm, so the merge never materialises the workload.
+        yield from heapq.merge(
+            *(self._iter_bucket_incidents(service, env) for service, env in self.buckets()),
+            key=lambda item: (item["start_time"], item["incident_id"]),
+        )
+
+    def iter_incident_envelopes(self) -> Iterator[IncidentEnvelope]:
+        for payload in self.iter_incidents():
+            yield IncidentEnvelope.from_dict(payload)
+
+    def dataset(self, streaming: bool = False) -> dict[tuple[str, str], dict[str, Any]]:
+        dataset: dict[tuple[str, str], dict[str, Any]] = {}
+        for service, env in self.buckets():
+            bucket = {
+                "deployments": self.iter_deployments(service, env),
+                "metrics": self.iter_metrics(service, env),
+                "logs": self.iter_logs(service, env),
+            }
+            if not streaming:
+                bucket = {key: list(values) for key, values in bucket.items()}
+            dataset[(service, env)] = bucket
+        return dataset
+
+
 class InMemoryPatternCache:
     def __init__(self) -> None:
         self.records: dict[str, list[dict[str, Any]]] = defaultdict(list)
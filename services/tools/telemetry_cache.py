@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Event, Lock
+from typing import Any, Callable, Hashable, Iterable, Iterator
+
+from services.tools.azure_monitor import AzureMonitorTool
+
+
+@dataclass
+class TelemetryCacheStats:
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.misses + self.coalesced
+
+    @property
+    def hit_rate(self) -> float:
+        if not self.lookups:
+            return 0.0
+        return (self.hits + self.coalesced) / self.lookups
+
+    def to_dict(self) -> dict[str, float]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.hit_rate,
+        }
+
+
+class _InFlight:
+    def __init__(self) -> None:
+        self.done = Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class CachingAzureMonitorTool(AzureMonitorTool):
+    def __init__(
+        self,
+        backend: AzureMonitorTool,
+        ttl_seconds: float = 60.0,
+        max_entries: int = 256,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.clock = clock
+        self.stats = TelemetryCacheStats()
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._in_flight: dict[Hashable, _InFlight] = {}
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def invalidate(self, service: str | None = None, env: str | None = None) -> None:
+        with self._lock:
+            for key in list(self._entries):
+                if service is not None and key[1] != service:
+                    continue
+                if env is not None and key[2] != env:
+                    continue
+                del self._entries[key]
+
+    # Entries are tuples of the backend's records. Records are shared by every
+    # caller that reads the entry and are treated as read-only; list queries
+    # hand out a fresh list so callers can still reorder or trim it.
+    def _cached(self, key: Hashable) -> tuple[Any, ...] | None:
+        # Must be called with the lock held; counts a hit when one is found.
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= self.clock():
+            del self._entries[key]
+            self.stats.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def _store(self, key: Hashable, value: tuple[Any, ...]) -> None:
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def _lookup(self, key: Hashable, loader: Callable[[], Iterable[Any]]) -> list[Any]:
+        with self._lock:
+            value = self._cached(key)
+            if value is not None:
+                return list(value)
+            flight = self._in_flight.get(key)
+            owner = flight is None
+            if owner:
+                flight = _InFlight()
+                self._in_flight[key] = flight
+                self.stats.misses += 1
+            else:
+                self.stats.coalesced += 1
+
+        if not owner:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return list(flight.result)
+
+        try:
+            value = tuple(loader())
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        else:
+            flight.result = value
+            self._store(key, value)
+            return list(value)
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            flight.done.set()
+
+    def _stream(
+        self,
+        key: Hashable,
+        open_stream: Callable[[], Iterable[Any]],
+        newest_first: bool = False,
+    ) -> Iterator[Any]:
+        # A cached result (from a list query or a drained stream) is served
+        # without touching the backend. On a miss the backend stream is passed
+        # through, so a consumer that stops early only transfers what it read;
+        # only a stream consumed to the end is cached.
+        with self._lock:
+            value = self._cached(key)
+            if value is None:
+                self.stats.misses += 1
+        if value is not None:
+            yield from (reversed(value) if newest_first else value)
+            return
+        consumed: list[Any] = []
+        for item in open_stream():
+            consumed.append(item)
+            yield item
+        if newest_first:
+            consumed.reverse()
+        self._store(key, tuple(consumed))
+
+    @staticmethod
+    def _logs_key(
+        service: str,
+        env: str,
+        contains: str | None,
+        levels: Iterable[str] | None,
+        endpoint: str | None,
+        start_time: str | None,
+        end_time: str | None,
+    ) -> tuple[Hashable, ...]:
+        level_key = tuple(sorted({str(level).upper() for level in levels})) if levels is not None else None
+        return ("logs", service, env, contains, level_key, endpoint, start_time, end_time)
+
+    def get_recent_deployments(self, service: str, env: str) -> list[dict[str, Any]]:
+        return self._lookup(
+            ("deployments", service, env),
+            lambda: self.backend.get_recent_deployments(service, env),
+        )
+
+    def query_metrics(
+        self,
+        service: str,
+        env: str,
+        metric_name: str | None = None,
+    ) -> list[dict[str, Any]]:
+        return self._lookup(
+            ("metrics", service, env, metric_name),
+            lambda: self.backend.query_metrics(service, env, metric_name=metric_name),
+        )
+
+    def query_logs(
+        self,
+        service: str,
+        env: str,
+        contains: str | None = None,
+        levels: Iterable[str] | None = None,
+        endpoint: str | None = None,
+        start_time: str | None = None,
+        end_time: str | None = None,
+    ) -> list[dict[str, Any]]:
+        key = self._logs_key(service, env, contains, levels, endpoint, start_time, end_time)
+        return self._lookup(
+            key,
+            lambda: self.backend.query_logs(
+                service,
+                env,
+                contains=contains,
+                levels=key[4],
+                endpoint=endpoint,
+                start_time=start_time,
+                end_time=end_time,
+            ),
+        )
+
+    def iter_recent_deployments(self, service: str, env: str) -> Iterator[dict[str, Any]]:
+        return self._stream(
+            ("deployments", service, env),
+            lambda: self.backend.iter_recent_deployments(service, env),
+        )
+
+    def iter_metrics(
+        self,
+        service: str,
+        env: str,
+        metric_name: str | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        return self._stream(
+            ("metrics", service, env, metric_name),
+            lambda: self.backend.iter_metrics(service, env, metric_name=metric_name),
+        )
+
+    def iter_logs(
+        self,
+        service: str,
+        env: str,
+        contains: str | None = None,
+        levels: Iterable[str] | None = None,
+        endpoint: str | None = None,
+        start_time: str | None = None,
+        end_time: str | None = None,
+        newest_first: bool = False,
+    ) -> Iterator[dict[str, Any]]:
+        key = self._logs_key(service, env, contains, levels, endpoint, start_time, end_time)
+        return self._stream(
+            key,
+            lambda: self.backend.iter_logs(
+                service,
+                env,
+                contains=contains,
+                levels=key[4],
+                endpoint=endpoint,
+                start_time=start_time,
+                end_time=end_time,
+                newest_first=newest_first,
+            ),
+            newest_first=newest_first,
+        )
@@ -1,22 +1,187 @@
 from __future__ import annotations
 
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextvars import copy_context
+from typing import Any, Callable
+
+from contracts.clock import SYSTEM_CLOCK, Clock
+from contracts.deadline import remaining_time
 from contracts.models import IncidentEnvelope, PatchProposal, VerificationReport
 from services.tools.ci_client import CIRunner
+from storage.verification_cache import VerificationCache, verification_cache_key
+
+
+CANARY_JOB = "canary_replay"
+TESTS_JOB = "tests"
+TIMED_OUT = "timed_out"
+CANCELLED = "cancelled"
+
+
+def _timed(action: Callable[[], Any]) -> tuple[Any, float]:
+    started = time.perf_counter()
+    result = action()
+    return result, (time.perf_counter() - started) * 1000.0
+
+
+def _status(name: str, outcome: Any) -> str:
+    if name == CANARY_JOB:
+        return str(outcome.get("status", "failed"))
+    if name == TESTS_JOB:
+        return "passed" if all(status == "passed" for status in outcome.values()) else "failed"
+    return str(outcome)
 
 
 class VerificationRunner:
-    def __init__(self, ci_runner: CIRunner) -> None:
+    def __init__(
+        self,
+        ci_runner: CIRunner,
+        timeout_seconds: float = 900.0,
+        suite_timeouts: dict[str, float] | None = None,
+        fail_fast: bool = True,
+        cache: VerificationCache | None = None,
+        base_ref: str = "main",
+        clock: Clock = SYSTEM_CLOCK,
+    ) -> None:
         self.ci_runner = ci_runner
+        self.timeout_seconds = timeout_seconds
+        self.suite_timeouts = dict(suite_timeouts or {})
+        self.fail_fast = fail_fast
+        self.cache = cache
+        self.base_ref = base_ref
+        self.clock = clock
+
+    def _timeout(self, name: str) -> float:
+        if name == TESTS_JOB:
+            return remaining_time(
+                max(self.suite_timeouts.get(suite, self.timeout_seconds) for suite in self.ci_runner.test_suites)
+            )
+        return remaining_time(self.suite_timeouts.get(name, self.timeout_seconds))
+
+    def _run_jobs(
+        self,
+        jobs: dict[str, Callable[[], Any]],
+        on_abandon: Callable[[], None] | None = None,
+    ) -> tuple[dict[str, Any], dict[str, float]]:
+        # Every suite and the canary replay get their own worker, so a slow
+        # integration run never delays the canary. Timed out or cancelled jobs
+        # are abandoned rather than joined; their results are discarded and
+        # on_abandon is told so it can stop any work they started.
+        outcomes: dict[str, Any] = {}
+        durations: dict[str, float] = {}
+        if not jobs:
+            return outcomes, durations
+        executor = ThreadPoolExecutor(max_workers=len(jobs), thread_name_prefix="verification")
+        started = time.perf_counter()
+        # Each job runs in a copy of the caller's context so tools see the
+        # incident deadline, and on its own branch of a virtual clock.
+        branches = self.clock.branches()
+        futures: dict[Future, str] = {
+            executor.submit(copy_context().run, _timed, branches.wrap(job)): name for name, job in jobs.items()
+        }
+        deadlines = {name: started + self._timeout(name) for name in jobs}
+        pending = set(futures)
+        try:
+            while pending:
+                next_deadline = min(deadlines[futures[future]] for future in pending)
+                done, pending = wait(
+                    pending,
+                    timeout=max(0.0, next_deadline - time.perf_counter()),
+                    return_when=FIRST_COMPLETED,
+                )
+                failed = False
+                for future in done:
+                    name = futures[future]
+                    outcomes[name], durations[name] = future.result()
+                    failed = failed or _status(name, outcomes[name]) != "passed"
+
+                now = time.perf_counter()
+                for future in list(pending):
+                    name = futures[future]
+                    if now >= deadlines[name]:
+                        pending.discard(future)
+                        future.cancel()
+                        outcomes[name] = TIMED_OUT
+                        durations[name] = (now - started) * 1000.0
+                        failed = True
+
+                if failed and self.fail_fast:
+                    for future in pending:
+                        future.cancel()
+                        outcomes[futures[future]] = CANCELLED
+                        durations[futures[future]] = (now - started) * 1000.0
+                    pending = set()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            branches.join()
+        if on_abandon is not None and any(outcomes.get(name) in (TIMED_OUT, CANCELLED) for name in jobs):
+            on_abandon()
+        return outcomes, durations
+
+    def cache_key(self, patch: PatchProposal) -> str | None:
+        fingerprint = self.ci_runner.config_fingerprint()
+        if fingerprint is None:
+            return None
+        test_config = {
+            "ci": fingerprint,
+            "timeout_seconds": self.timeout_seconds,
+            "suite_timeouts": sorted(self.suite_timeouts.items()),
+        }
+        return verification_cache_key(patch, self.base_ref, test_config)
+
+    def verify(self, incident: IncidentEnvelope, patch: PatchProposal, force: bool = False) -> VerificationReport:
+        suites = tuple(self.ci_runner.test_suites)
+        cache_key = self.cache_key(patch) if self.cache is not None else None
+        cached = None
+        if cache_key is not None and not force:
+            cached = self.cache.get(cache_key)
+
+        # Suite results only depend on the patch content and test setup, so they
+        # are shared across incidents; the canary replay is incident specific
+        # and always runs, unless a cached suite failure already decides it.
+        jobs: dict[str, Callable[[], Any]] = {}
+        if cached is None and self.ci_runner.batch_suites:
+            jobs[TESTS_JOB] = lambda: self.ci_runner.run_tests(patch)
+        elif cached is None:
+            jobs = {suite: (lambda suite=suite: self.ci_runner.run_suite(patch, suite)) for suite in suites}
+        cached_failure = cached is not None and any(status != "passed" for status in cached.values())
+        if not (cached_failure and self.fail_fast):
+            jobs[CANARY_JOB] = lambda: self.ci_runner.run_canary_replay(incident, patch)
+        outcomes, durations = self._run_jobs(jobs, on_abandon=lambda: self.ci_runner.cancel(patch))
+        if TESTS_JOB in outcomes:
+            # A batched run reports whichever suites it ran, which may be more
+            # than the default three; every one of them counts.
+            batch, elapsed = outcomes.pop(TESTS_JOB), durations.pop(TESTS_JOB)
+            results = {str(suite): str(status) for suite, status in batch.items()} if isinstance(batch, dict) else None
+            suites = tuple(results) if results is not None else suites
+            for suite in suites:
+                outcomes[suite] = results[suite] if results is not None else batch
+                durations[suite] = elapsed
+        if cached is not None:
+            suites = tuple(cached)
+            for suite in suites:
+                outcomes[suite] = cached[suite]
+                durations[suite] = 0.0
+        elif cache_key is not None and all(outcomes[suite] not in (TIMED_OUT, CANCELLED) for suite in suites):
+            self.cache.put(cache_key, {suite: outcomes[suite] for suite in suites})
+        if CANARY_JOB not in outcomes:
+            outcomes[CANARY_JOB] = CANCELLED
+            durations[CANARY_JOB] = 0.0
 
-    def verify(self, incident: IncidentEnvelope, patch: PatchProposal) -> VerificationReport:
-        test_results = self.ci_runner.run_tests(patch)
-        canary = self.ci_runner.run_canary_replay(incident, patch)
+        test_results = {suite: outcomes[suite] for suite in suites}
+        canary = outcomes[CANARY_JOB]
+        if not isinstance(canary, dict):
+            canary = {"status": canary}
 
         regression_flags: list[str] = []
         for suite_name, status in test_results.items():
-            if status != "passed":
+            if status == TIMED_OUT:
+                regression_flags.append(f"{suite_name}_timed_out")
+            elif status not in ("passed", CANCELLED):
                 regression_flags.append(f"{suite_name}_failed")
-        if canary.get("status") != "passed":
+        if canary.get("status") == TIMED_OUT:
+            regression_flags.append("canary_replay_timed_out")
+        elif canary.get("status") not in ("passed", CANCELLED):
             regression_flags.append("canary_replay_failed")
         if float(canary.get("latency_delta_ms", 0.0)) > 200.0:
             regression_flags.append("latency_regression")
@@ -27,4 +192,6 @@ class VerificationRunner:
             canary_replay_result=canary,
             regression_flags=regression_flags,
             pass_fail=pass_fail,
+            durations_ms={name: round(durations[name], 3) for name in (*suites, CANARY_JOB)},
+            cache_hit=cached is not None,
         )
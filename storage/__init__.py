@@ -1,3 +1,12 @@
 from storage.pattern_store import PatternStore
+from storage.pr_outbox import PullRequestJob, PullRequestOutbox
+from storage.verification_cache import VerificationCache, VerificationCacheStats, verification_cache_key
 
-__all__ = ["PatternStore"]
+__all__ = [
+    "PatternStore",
+    "PullRequestJob",
+    "PullRequestOutbox",
+    "VerificationCache",
+    "VerificationCacheStats",
+    "verification_cache_key",
+]
@@ -1,12 +1,48 @@
 from __future__ import annotations
 
+import json
 import sqlite3
 from pathlib import Path
 from threading import Lock
+from typing import Iterable
 
+from contracts.diff import patch_content_hash
 from contracts.models import PatternRecord
 
 
+_COLUMNS = (
+    "fingerprint, root_cause, fix_signature, outcome, created_at, "
+    "incident_id, patch_text, changed_files, evidence_terms, risk_level"
+)
+# Columns added after the first schema; older databases are migrated in place.
+_ADDED_COLUMNS = {
+    "incident_id": "TEXT NOT NULL DEFAULT ''",
+    "patch_text": "TEXT NOT NULL DEFAULT ''",
+    "changed_files": "TEXT NOT NULL DEFAULT '[]'",
+    "evidence_terms": "TEXT NOT NULL DEFAULT '[]'",
+    "risk_level": "TEXT NOT NULL DEFAULT ''",
+    "content_hash": "TEXT NOT NULL DEFAULT ''",
+}
+# A fix only counts as proven once a reviewer has accepted it; a verified
+# patch that is still awaiting approval does not.
+PROVEN_OUTCOMES = ("approved",)
+
+
+def _record(row: tuple) -> PatternRecord:
+    return PatternRecord(
+        fingerprint=row[0],
+        root_cause=row[1],
+        fix_signature=row[2],
+        outcome=row[3],
+        created_at=row[4],
+        incident_id=row[5],
+        patch_text=row[6],
+        changed_files=json.loads(row[7]),
+        evidence_terms=json.loads(row[8]),
+        risk_level=row[9],
+    )
+
+
 class PatternStore:
     def __init__(self, db_path: str) -> None:
         self.db_path = db_path
@@ -29,14 +65,32 @@ class PatternStore:
                 )
                 """
             )
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(pattern_records)")}
+            for column, definition in _ADDED_COLUMNS.items():
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE pattern_records ADD COLUMN {column} {definition}")
+            unhashed = conn.execute(
+                "SELECT id, patch_text FROM pattern_records WHERE content_hash = '' AND patch_text != ''"
+            ).fetchall()
+            conn.executemany(
+                "UPDATE pattern_records SET content_hash = ? WHERE id = ?",
+                [(patch_content_hash(patch_text), row_id) for row_id, patch_text in unhashed],
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS pattern_records_fingerprint ON pattern_records (fingerprint, id)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS pattern_records_content "
+                "ON pattern_records (fingerprint, content_hash, outcome, id)"
+            )
             conn.commit()
 
     def save(self, record: PatternRecord) -> None:
         with self._lock, sqlite3.connect(self.db_path) as conn:
             conn.execute(
-                """
-                INSERT INTO pattern_records (fingerprint, root_cause, fix_signature, outcome, created_at)
-                VALUES (?, ?, ?, ?, ?)
+                f"""
+                INSERT INTO pattern_records ({_COLUMNS}, content_hash)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 (
                     record.fingerprint,
@@ -44,15 +98,29 @@ class PatternStore:
                     record.fix_signature,
                     record.outcome,
                     record.created_at,
+                    record.incident_id,
+                    record.patch_text,
+                    json.dumps(record.changed_files),
+                    json.dumps(record.evidence_terms),
+                    record.risk_level,
+                    patch_content_hash(record.patch_text) if record.patch_text else "",
                 ),
             )
             conn.commit()
 
+    def update_outcome(self, incident_id: str, outcome: str) -> None:
+        with self._lock, sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                "UPDATE pattern_records SET outcome = ? WHERE incident_id = ?",
+                (outcome, incident_id),
+            )
+            conn.commit()
+
     def find_latest(self, fingerprint: str) -> PatternRecord | None:
         with sqlite3.connect(self.db_path) as conn:
             row = conn.execute(
-                """
-                SELECT fingerprint, root_cause, fix_signature, outcome, created_at
+                f"""
+                SELECT {_COLUMNS}
                 FROM pattern_records
                 WHERE fingerprint = ?
                 ORDER BY id DESC
@@ -62,32 +130,55 @@ class PatternStore:
             ).fetchone()
         if not row:
             return None
-        return PatternRecord(
-            fingerprint=row[0],
-            root_cause=row[1],
-            fix_signature=row[2],
-            outcome=row[3],
-            created_at=row[4],
-        )
+        return _record(row)
+
+    def find_reusable_fix(
+        self,
+        fingerprint: str,
+        outcomes: Iterable[str] = PROVEN_OUTCOMES,
+    ) -> PatternRecord | None:
+        # The newest proven fix wins, unless a reviewer has since rejected
+        # the same patch content for this fingerprint.
+        outcomes = tuple(outcomes)
+        if not outcomes:
+            return None
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(
+                f"""
+                SELECT {_COLUMNS}
+                FROM pattern_records AS candidate
+                WHERE fingerprint = ? AND patch_text != ''
+                  AND outcome IN ({", ".join("?" for _ in outcomes)})
+                  AND NOT EXISTS (
+                      SELECT 1
+                      FROM pattern_records AS later
+                      WHERE later.fingerprint = candidate.fingerprint
+                        AND later.content_hash = candidate.content_hash
+                        AND later.outcome = 'rejected'
+                        AND later.id > candidate.id
+                  )
+                ORDER BY id DESC
+                LIMIT 1
+                """,
+                (fingerprint, *outcomes),
+            ).fetchone()
+        if not row:
+            return None
+        return _record(row)
 
     def list_recent(self, limit: int = 20) -> list[PatternRecord]:
         with sqlite3.connect(self.db_path) as conn:
             rows = conn.execute(
-                """
-                SELECT fingerprint, root_cause, fix_signature, outcome, created_at
+                f"""
+                SELECT {_COLUMNS}
                 FROM pattern_records
                 ORDER BY id DESC
                 LIMIT ?
                 """,
                 (limit,),
             ).fetchall()
-        return [
-            PatternRecord(
-                fingerprint=row[0],
-                root_cause=row[1],
-                fix_signature=row[2],
-                outcome=row[3],
-                created_at=row[4],
-            )
-            for row in rows
-        ]
+        return [_record(row) for row in rows]
+
+    def __len__(self) -> int:
+        with sqlite3.connect(self.db_path) as conn:
+            return int(conn.execute("SELECT COUNT(*) FROM pattern_records").fetchone()[0])
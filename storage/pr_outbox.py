@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+
+from contracts.clock import SYSTEM_CLOCK, Clock
+
+
+PENDING = "pending"
+IN_FLIGHT = "in_flight"
+PUBLISHED = "published"
+FAILED = "failed"
+
+
+@dataclass
+class PullRequestJob:
+    head_branch: str
+    incident_id: str
+    title: str
+    body: str
+    base_branch: str
+    status: str = PENDING
+    attempts: int = 0
+    pr_url: str | None = None
+    pr_number: int | None = None
+    last_error: str | None = None
+    created_at: float = 0.0
+    next_attempt_at: float = 0.0
+    lease_until: float = 0.0
+
+
+_COLUMNS = (
+    "head_branch, incident_id, title, body, base_branch, status, attempts, "
+    "pr_url, pr_number, last_error, created_at, next_attempt_at, lease_until"
+)
+
+
+class PullRequestOutbox:
+    def __init__(self, db_path: str, clock: Clock | None = None) -> None:
+        self.db_path = db_path
+        self.clock = clock or SYSTEM_CLOCK
+        self._lock = Lock()
+        self._ensure_db()
+
+    def _ensure_db(self) -> None:
+        path = Path(self.db_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS pr_outbox (
+                    head_branch TEXT PRIMARY KEY,
+                    incident_id TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    body TEXT NOT NULL,
+                    base_branch TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    pr_url TEXT,
+                    pr_number INTEGER,
+                    last_error TEXT,
+                    created_at REAL NOT NULL,
+                    next_attempt_at REAL NOT NULL,
+                    lease_until REAL NOT NULL DEFAULT 0
+                )
+                """
+            )
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(pr_outbox)")}
+            if "lease_until" not in existing:
+                conn.execute("ALTER TABLE pr_outbox ADD COLUMN lease_until REAL NOT NULL DEFAULT 0")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_pr_outbox_due ON pr_outbox (status, next_attempt_at)")
+            conn.commit()
+
+    def _now(self) -> float:
+        return self.clock.now().timestamp()
+
+    def enqueue(self, job: PullRequestJob) -> PullRequestJob:
+        # The head branch is the idempotency key: enqueueing it again (a
+        # retried incident, a replayed pipeline) returns the existing job,
+        # unless that job gave up, in which case it starts over as pending.
+        now = self._now()
+        with self._lock, sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                f"""
+                INSERT INTO pr_outbox ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, 0, NULL, NULL, NULL, ?, ?, 0)
+                ON CONFLICT(head_branch) DO UPDATE SET
+                    incident_id = excluded.incident_id,
+                    title = excluded.title,
+                    body = excluded.body,
+                    base_branch = excluded.base_branch,
+                    status = excluded.status,
+                    attempts = 0,
+                    last_error = NULL,
+                    next_attempt_at = excluded.next_attempt_at,
+                    lease_until = 0
+                WHERE pr_outbox.status = ?
+                """,
+                (job.head_branch, job.incident_id, job.title, job.body, job.base_branch, PENDING, now, now, FAILED),
+            )
+            conn.commit()
+            row = conn.execute(f"SELECT {_COLUMNS} FROM pr_outbox WHERE head_branch = ?", (job.head_branch,)).fetchone()
+        return PullRequestJob(*row)
+
+    def get(self, head_branch: str) -> PullRequestJob | None:
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(f"SELECT {_COLUMNS} FROM pr_outbox WHERE head_branch = ?", (head_branch,)).fetchone()
+        return PullRequestJob(*row) if row else None
+
+    def claim(self, limit: int, lease_seconds: float) -> list[PullRequestJob]:
+        # Due jobs are moved to in_flight in the same statement that selects
+        # them, so publishers in other processes sharing the database never
+        # claim the same job. A publisher that dies mid-job leaves its lease
+        # behind; once it expires the job is claimed again.
+        now = self._now()
+        with self._lock, sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                f"""
+                UPDATE pr_outbox SET status = ?, lease_until = ?
+                WHERE head_branch IN (
+                    SELECT head_branch FROM pr_outbox
+                    WHERE (status = ? AND next_attempt_at <= ?) OR (status = ? AND lease_until <= ?)
+                    ORDER BY created_at ASC
+                    LIMIT ?
+                )
+                RETURNING {_COLUMNS}
+                """,
+                (IN_FLIGHT, now + lease_seconds, PENDING, now, IN_FLIGHT, now, limit),
+            ).fetchall()
+            conn.commit()
+        return sorted((PullRequestJob(*row) for row in rows), key=lambda job: job.created_at)
+
+    def mark_published(self, head_branch: str, pr_url: str, pr_number: int | None) -> None:
+        with self._lock, sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                """
+                UPDATE pr_outbox SET status = ?, attempts = attempts + 1, pr_url = ?, pr_number = ?, last_error = NULL
+                WHERE head_branch = ? AND status = ?
+                """,
+                (PUBLISHED, pr_url, pr_number, head_branch, IN_FLIGHT),
+            )
+            conn.commit()
+
+    def mark_failed(self, head_branch: str, error: str, retry_in_seconds: float | None) -> None:
+        # retry_in_seconds=None gives up on the job until it is enqueued again.
+        status = FAILED if retry_in_seconds is None else PENDING
+        next_attempt_at = self._now() + (retry_in_seconds or 0.0)
+        with self._lock, sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                """
+                UPDATE pr_outbox SET status = ?, attempts = attempts + 1, last_error = ?, next_attempt_at = ?
+                WHERE head_branch = ? AND status = ?
+                """,
+                (status, error, next_attempt_at, head_branch, IN_FLIGHT),
+            )
+            conn.commit()
+
+    def counts(self) -> dict[str, int]:
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute("SELECT status, COUNT(*) FROM pr_outbox GROUP BY status").fetchall()
+        return {PENDING: 0, IN_FLIGHT: 0, PUBLISHED: 0, FAILED: 0, **{status: int(count) for status, count in rows}}
+
+    def __len__(self) -> int:
+        with sqlite3.connect(self.db_path) as conn:
+            return int(conn.execute("SELECT COUNT(*) FROM pr_outbox").fetchone()[0])
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+from contracts.clock import SYSTEM_CLOCK, Clock
+from contracts.models import PatchProposal
+
+
+def verification_cache_key(patch: PatchProposal, base_ref: str, test_config: dict[str, Any]) -> str:
+    content: dict[str, Any] = {
+        "repo": patch.repo,
+        "base_ref": base_ref,
+        "content_hash": patch.content_hash,
+        "changed_files": sorted(patch.changed_files),
+        "test_config": test_config,
+    }
+    if not patch.patch_text:
+        content["diff_summary"] = patch.diff_summary
+    encoded = json.dumps(content, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class VerificationCacheStats:
+    hits: int = 0
+    misses: int = 0
+    expirations: int = 0
+    evictions: int = 0
+
+    def to_dict(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+        }
+
+
+class VerificationCache:
+    def __init__(
+        self,
+        db_path: str,
+        ttl_seconds: float = 86400.0,
+        max_entries: int = 512,
+        clock: Clock | None = None,
+    ) -> None:
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.clock = clock or SYSTEM_CLOCK
+        self.stats = VerificationCacheStats()
+        self._lock = Lock()
+        self._ensure_db()
+
+    def _ensure_db(self) -> None:
+        path = Path(self.db_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS verification_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used_at REAL NOT NULL
+                )
+                """
+            )
+            conn.commit()
+
+    def _now(self) -> float:
+        return self.clock.now().timestamp()
+
+    def __len__(self) -> int:
+        with sqlite3.connect(self.db_path) as conn:
+            return int(conn.execute("SELECT COUNT(*) FROM verification_cache").fetchone()[0])
+
+    def get(self, cache_key: str) -> dict[str, Any] | None:
+        now = self._now()
+        with self._lock, sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT payload, created_at FROM verification_cache WHERE cache_key = ?",
+                (cache_key,),
+            ).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return None
+            if row[1] + self.ttl_seconds <= now:
+                conn.execute("DELETE FROM verification_cache WHERE cache_key = ?", (cache_key,))
+                conn.commit()
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return None
+            conn.execute(
+                "UPDATE verification_cache SET last_used_at = ? WHERE cache_key = ?",
+                (now, cache_key),
+            )
+            conn.commit()
+        self.stats.hits += 1
+        return json.loads(row[0])
+
+    def put(self, cache_key: str, payload: dict[str, Any]) -> None:
+        now = self._now()
+        with self._lock, sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO verification_cache (cache_key, payload, created_at, last_used_at)
+                VALUES (?, ?, ?, ?)
+                """,
+                (cache_key, json.dumps(payload, separators=(",", ":")), now, now),
+            )
+            conn.execute("DELETE FROM verification_cache WHERE created_at + ? <= ?", (self.ttl_seconds, now))
+            evicted = conn.execute(
+                """
+                DELETE FROM verification_cache
+                WHERE cache_key IN (
+                    SELECT cache_key FROM verification_cache
+                    ORDER BY last_used_at DESC
+                    LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            ).rowcount
+            conn.commit()
+        self.stats.evictions += max(0, evicted)
+
+    def invalidate(self, cache_key: str | None = None) -> None:
+        with self._lock, sqlite3.connect(self.db_path) as conn:
+            if cache_key is None:
+                conn.execute("DELETE FROM verification_cache")
+            else:
+                conn.execute("DELETE FROM verification_cache WHERE cache_key = ?", (cache_key,))
+            conn.commit()
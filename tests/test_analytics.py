@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import numpy as np
+
+from services.orchestrator.analytics import MetricFrame, analyze_metrics, compute_series_stats, to_epoch_seconds
+
+
+def test_series_stats_cover_percentiles_baseline_and_deploy_delta() -> None:
+    metrics = [
+        {
+            "timestamp": f"2026-02-14T11:{minute:02d}:00+00:00",
+            "name": "http_5xx_rate",
+            "value": 0.01 if minute < 40 else 0.2,
+            "endpoint": "/checkout",
+        }
+        for minute in range(30, 50)
+    ]
+    metrics.append(
+        {"timestamp": "2026-02-14T11:45:00Z", "name": "p95_latency_ms", "value": 900, "endpoint": "/checkout"}
+    )
+
+    stats = {item.metric: item for item in analyze_metrics(metrics, deployment_time="2026-02-14T11:40:00+00:00")}
+    errors = stats["http_5xx_rate"]
+
+    assert errors.points == 20
+    assert errors.latest == 0.2
+    assert errors.max == 0.2
+    assert np.isclose(errors.p50, np.percentile([m["value"] for m in metrics[:20]], 50))
+    assert np.isclose(errors.pre_deploy_mean, 0.01)
+    assert np.isclose(errors.post_deploy_mean, 0.2)
+    assert np.isclose(errors.deploy_delta, 0.19)
+    assert errors.rate_of_change_per_min == 0.0
+    assert stats["p95_latency_ms"].trailing_baseline is None
+
+
+def test_compute_series_stats_matches_per_series_reference() -> None:
+    rng = np.random.default_rng(7)
+    series_count, points = 40, 500
+    group_ids = np.repeat(np.arange(series_count), points)
+    timestamps = np.tile(np.arange(points) * 60, series_count)
+    values = rng.random(series_count * points)
+    shuffle = rng.permutation(values.shape[0])
+    frame = MetricFrame.from_arrays(
+        keys=[("http_5xx_rate", f"/ep{index}") for index in range(series_count)],
+        group_ids=group_ids[shuffle],
+        timestamps=timestamps[shuffle],
+        values=values[shuffle],
+    )
+
+    stats = compute_series_stats(frame, deployment_epoch=250 * 60, baseline_window=10)
+
+    assert len(stats) == series_count
+    for index, item in enumerate(stats):
+        reference = values[index * points : (index + 1) * points]
+        assert item.endpoint == f"/ep{index}"
+        assert np.isclose(item.p95, np.percentile(reference, 95))
+        assert np.isclose(item.p99, np.percentile(reference, 99))
+        assert np.isclose(item.trailing_baseline, reference[-11:-1].mean())
+        assert np.isclose(item.pre_deploy_mean, reference[:250].mean())
+        assert np.isclose(item.post_deploy_mean, reference[250:].mean())
+
+
+def test_metric_frame_drops_points_without_timestamps() -> None:
+    epochs = to_epoch_seconds(["2026-02-14T11:00:00Z", "2026-02-14T13:00:00+02:00", "2026-02-14T11:00:00.250"])
+    assert epochs.tolist() == [1771066800] * 3
+
+    frame = MetricFrame.from_records(
+        [
+            {"timestamp": "2026-02-14T11:00:00+00:00", "name": "http_5xx_rate", "value": 0.1},
+            {"timestamp": "", "name": "http_5xx_rate", "value": 9.0},
+            {"name": "http_5xx_rate", "value": 9.0},
+            {"timestamp": "not-a-time", "name": "http_5xx_rate", "value": 9.0},
+            {"timestamp": "2026-02-14T11:01:00Z", "name": "http_5xx_rate", "value": 0.3},
+        ]
+    )
+
+    assert len(frame) == 2
+    assert frame.timestamps.tolist() == [1771066800, 1771066860]
+    (stats,) = compute_series_stats(frame)
+    assert np.isclose(stats.max, 0.3)
+    assert analyze_metrics([], deployment_time="") == []
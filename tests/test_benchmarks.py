@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from benchmarks.pipeline_bench import BENCHMARK_SIZES, StageResult, find_regressions, run_size
+
+
+def test_run_size_reports_every_stage() -> None:
+    spec, _ = BENCHMARK_SIZES["small"]
+    results = run_size("small", spec, iterations=2)
+
+    assert [result.stage for result in results] == [
+        "triage",
+        "investigation",
+        "patch",
+        "verification",
+        "approval_package",
+        "pattern_save",
+        "end_to_end",
+    ]
+    assert all(result.iterations == 2 and result.p50_ms <= result.p99_ms for result in results)
+
+
+def test_find_regressions_applies_threshold_and_min_delta() -> None:
+    baseline = {
+        "sizes": {
+            "small": {
+                "investigation": {"p95_ms": 4.0},
+                "triage": {"p95_ms": 0.01},
+                "patch": {"p95_ms": 0.005},
+                "pattern_save": {"p95_ms": 1.0},
+                "approval_package": {"p95_ms": 1.0},
+            }
+        }
+    }
+    results = [
+        StageResult("small", "investigation", 10, 0.1, 5.0, 7.0, 8.0),
+        StageResult("small", "triage", 10, 0.1, 0.02, 0.05, 0.06),
+        StageResult("small", "patch", 10, 0.1, 0.1, 0.32, 0.4),
+        StageResult("small", "pattern_save", 10, 0.1, 1.0, 1.4, 1.5),
+        StageResult("small", "approval_package", 10, 0.1, 2.0, 3.5, 4.0),
+        StageResult("medium", "investigation", 10, 0.1, 50.0, 90.0, 99.0),
+    ]
+
+    regressions = find_regressions(results, baseline, threshold=0.5)
+
+    # Growth below the absolute floor (triage, patch) is run-to-run noise even
+    # when it is large in relative terms.
+    assert [regression.split(":")[0] for regression in regressions] == [
+        "small/investigation",
+        "small/approval_package",
+    ]
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import time
+
+import numpy as np
+
+from contracts import PatchProposal
+from services.tools import (
+    CanaryReplaySimulator,
+    MockAzureMonitorTool,
+    RequestTrace,
+    ServiceModel,
+    parse_service_models,
+    synthetic_5xx_incident,
+    telemetry_trace_source,
+)
+
+
+TIMEOUT_PATCH = (
+    "--- a/config/timeouts.yaml\n"
+    "+++ b/config/timeouts.yaml\n"
+    "@@ -2,5 +2,5 @@\n"
+    "-payments_timeout_ms: 400\n"
+    "+payments_timeout_ms: 900\n"
+    "--- a/config/retries.yaml\n"
+    "+++ b/config/retries.yaml\n"
+    "-payments_max_retries: 1\n"
+    "+payments_max_retries: 3\n"
+)
+
+
+def test_patch_settings_parse_into_before_and_after_models() -> None:
+    before, after = parse_service_models(TIMEOUT_PATCH)
+    assert before == ServiceModel(timeout_ms=400.0, max_retries=1)
+    assert after == ServiceModel(timeout_ms=900.0, max_retries=3)
+
+    before, after = parse_service_models("-max_connections: 25\n+max_connections: 45\n+retry_backoff_s: 0.1\n")
+    assert (before.pool_size, after.pool_size) == (25, 45)
+    assert after.backoff_ms == 100.0 and before.backoff_ms == ServiceModel().backoff_ms
+
+
+def test_replay_of_a_million_requests_is_calibrated_and_fast() -> None:
+    incident = synthetic_5xx_incident()
+    simulator = CanaryReplaySimulator(requests=1_000_000)
+    trace = telemetry_trace_source(MockAzureMonitorTool())(incident)
+    assert len(trace) == 2
+
+    patch = PatchProposal(
+        repo="demo-org/demo-service",
+        branch="sentinel/inc-5xx-0001-attempt-1",
+        changed_files=["config/retries.yaml", "config/timeouts.yaml"],
+        diff_summary="Increase upstream timeout and retry budget for checkout dependency.",
+        hypothesis="Upstream timeouts",
+        risk_level="low",
+        patch_text=TIMEOUT_PATCH,
+    )
+    started = time.perf_counter()
+    result = simulator.replay(trace, patch)
+    assert time.perf_counter() - started < 5.0
+
+    assert result["status"] == "passed"
+    assert abs(result["baseline_5xx_rate"] - trace.error_rates.mean()) < 0.01
+    assert result["post_patch_5xx_rate"] < 0.01
+    assert result["post_patch_p95_ms"] > result["baseline_p95_ms"]
+    assert result["requests"] == 1_000_000
+    assert simulator.replay(trace, patch) == result
+
+    unchanged = simulator.replay(RequestTrace.from_incident(incident), before=ServiceModel(timeout_ms=400.0))
+    assert unchanged["status"] == "failed"
+    assert unchanged["post_patch_5xx_rate"] == unchanged["baseline_5xx_rate"]
+
+
+def test_pool_limited_trace_is_calibrated_including_pool_rejection() -> None:
+    trace = RequestTrace(
+        error_rates=np.array([0.2, 0.05]),
+        latency_p95_ms=np.array([250.0, 250.0]),
+        requests_per_second=np.array([400.0, 100.0]),
+    )
+    patch = PatchProposal(
+        repo="demo-org/demo-service",
+        branch="sentinel/inc-5xx-0001-attempt-1",
+        changed_files=["config/db_pool.yaml"],
+        diff_summary="Increase DB connection pool size.",
+        hypothesis="Connection pool exhaustion",
+        risk_level="low",
+        patch_text=(
+            "--- a/config/db_pool.yaml\n"
+            "+++ b/config/db_pool.yaml\n"
+            "@@ -1,5 +1,5 @@\n"
+            "-max_connections: 25\n"
+            "+max_connections: 45\n"
+        ),
+    )
+    result = CanaryReplaySimulator(requests=200_000).replay(trace, patch)
+
+    observed = float(np.average(trace.error_rates, weights=trace.requests_per_second))
+    assert abs(result["baseline_5xx_rate"] - observed) < 0.01
+    assert result["status"] == "passed"
+    assert result["post_patch_5xx_rate"] < 0.02
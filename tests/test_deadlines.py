@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from threading import Event
+
+from contracts import IncidentStatus, PipelineEvent, VirtualClock
+from contracts.models import parse_iso
+from services.orchestrator.config import Settings
+from services.orchestrator.engine import SentinelEngine
+from services.orchestrator.simulation import simulated_tools
+from services.tools import CIRunner, GitHubClient, MockAzureMonitorTool
+from storage import PatternStore
+from tests.test_pipeline import build_incident
+
+
+class HangingAzureMonitorTool(MockAzureMonitorTool):
+    def __init__(self) -> None:
+        super().__init__()
+        self.release = Event()
+
+    def iter_metrics(self, service, env, metric_name=None):
+        self.release.wait(10)
+        return super().iter_metrics(service, env, metric_name=metric_name)
+
+
+def test_hung_telemetry_call_escalates_when_stage_budget_is_spent(tmp_path: Path) -> None:
+    azure_tool = HangingAzureMonitorTool()
+    db_path = str(tmp_path / "patterns.db")
+    settings = Settings(pattern_db_path=db_path, telemetry_cache_ttl_seconds=0, stage_budgets=(("investigation", 0.2),))
+    engine = SentinelEngine(settings=settings, azure_tool=azure_tool, pattern_store=PatternStore(db_path))
+
+    started = time.perf_counter()
+    record = engine.ingest_incident(build_incident("inc-deadline-001"))
+    azure_tool.release.set()
+
+    assert time.perf_counter() - started < 2.0
+    assert record.status == IncidentStatus.ESCALATED
+    assert "investigation" in (record.last_error or "")
+    assert record.deadline_seconds == 600.0
+    assert 150.0 <= record.stage_durations_ms["investigation"] < 2000.0
+    escalation = record.events[-1]
+    assert escalation.event == PipelineEvent.INCIDENT_ESCALATED
+    assert escalation.payload["stage"] == "investigation" and escalation.payload["budget_seconds"] == 0.2
+
+
+def test_severity_deadline_bounds_verification_in_virtual_time(tmp_path: Path) -> None:
+    incident = build_incident("inc-deadline-002")
+    clock = VirtualClock(parse_iso(incident.start_time))
+    db_path = str(tmp_path / "patterns.db")
+    tools = simulated_tools(
+        clock,
+        azure_tool=MockAzureMonitorTool(),
+        github_client=GitHubClient(owner="demo-org", repo="demo-service", mode="mock"),
+        ci_runner=CIRunner(),
+    )
+
+    relaxed = Settings(pattern_db_path=db_path, incident_deadline_seconds=0)
+    engine = SentinelEngine(settings=relaxed, pattern_store=PatternStore(db_path), clock=clock, **tools)
+    record = engine.ingest_incident(incident)
+    assert record.status == IncidentStatus.PR_READY and record.deadline_seconds is None
+    assert set(record.stage_durations_ms) == {"triage", "investigation", "patching", "verification", "approval"}
+
+    strict = Settings(
+        pattern_db_path=db_path,
+        severity_deadlines=(("critical", 300.0),),
+        verification_cache_ttl_seconds=0,
+    )
+    engine = SentinelEngine(settings=strict, pattern_store=PatternStore(db_path), clock=clock, **tools)
+    record = engine.ingest_incident(build_incident("inc-deadline-003"))
+    assert record.deadline_seconds == 300.0
+    assert record.status == IncidentStatus.ESCALATED
+    assert record.events[-1].payload["stage"] == "verification"
+    assert record.patch_attempts == 1
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from dataclasses import replace
+
+from contracts import PatchProposal, PipelineEvent, RetryRequest, to_primitive
+from contracts.diff import parse_unified_diff
+from tests.test_pipeline import build_engine, build_incident
+from tests.test_verification import CountingCIRunner
+
+
+PATCH = (
+    "diff --git a/config/timeouts.yaml b/config/timeouts.yaml\n"
+    "--- a/config/timeouts.yaml\n"
+    "+++ b/config/timeouts.yaml\n"
+    "@@ -2,3 +2,3 @@ payments:\n"
+    " region: eu\n"
+    "-payments_timeout_ms: 400\n"
+    "+payments_timeout_ms: 900\n"
+    "--- /dev/null\n"
+    "+++ b/config/retries.yaml\n"
+    "@@ -0,0 +1,2 @@\n"
+    "+payments_max_retries: 3\n"
+    "+--- not a header\n"
+)
+
+
+def test_parse_files_hunks_and_canonical_hash() -> None:
+    diff = parse_unified_diff(PATCH)
+    timeouts, retries = diff.files
+    assert timeouts.path == "config/timeouts.yaml" and not timeouts.is_new
+    hunk = timeouts.hunks[0]
+    assert (hunk.old_range, hunk.new_range, hunk.section) == ((2, 4), (2, 4), "payments:")
+    assert hunk.removed == ("payments_timeout_ms: 400",) and hunk.added == ("payments_timeout_ms: 900",)
+    assert retries.is_new and retries.hunks[0].added[-1] == "--- not a header"
+    assert diff.changed_files == ("config/retries.yaml", "config/timeouts.yaml")
+    assert (diff.added_lines, diff.removed_lines) == (3, 1)
+
+    # File order, git preamble, stale hunk counts and trailing blank lines do
+    # not change the content hash; a changed line does.
+    files = PATCH.split("--- /dev/null\n")
+    reordered = "--- /dev/null\n" + files[1] + files[0].replace("@@ -2,3 +2,3 @@ payments:", "@@ -2,9 +2,9 @@")
+    assert parse_unified_diff(reordered + "\n\n") == diff
+    assert parse_unified_diff(PATCH.replace("900", "950")).content_hash != diff.content_hash
+
+    # Thousands of files parse in one linear pass.
+    large = "".join(
+        f"--- a/svc/{index}.yaml\n+++ b/svc/{index}.yaml\n@@ -1 +1 @@\n-a: {index}\n+a: {index + 1}\n"
+        for index in range(5000)
+    )
+    assert len(parse_unified_diff(large).changed_files) == 5000
+
+
+def test_proposal_caches_diff_and_dedupes_identical_candidates(tmp_path) -> None:
+    patch = PatchProposal(
+        repo="org/repo",
+        branch="sentinel/inc-diff-001-attempt-1",
+        changed_files=[],
+        diff_summary="timeouts",
+        hypothesis="upstream timeout",
+        risk_level="low",
+        patch_text=PATCH,
+    )
+    assert patch.changed_files == ["config/retries.yaml", "config/timeouts.yaml"]
+    assert patch.diff is patch.diff
+    assert "_diff" not in to_primitive(patch)
+    assert replace(patch, branch="sentinel/inc-diff-001-attempt-2").content_hash == patch.content_hash
+    patch.patch_text = PATCH.replace("900", "950")
+    assert patch.diff.files[0].hunks[0].added == ("payments_timeout_ms: 950",)
+
+    ci_runner = CountingCIRunner()
+    ci_runner.force_test_failure = True
+    engine = build_engine(tmp_path, ci_runner=ci_runner)
+    record = engine.ingest_incident(build_incident("inc-diff-002"))
+    events = [event for event in record.events if event.event == PipelineEvent.VERIFICATION_COMPLETED]
+    assert record.patch_attempts == 2
+    assert [event.payload["duplicate_of"] for event in events] == [None, 1]
+    assert ci_runner.suite_runs == len(ci_runner.test_suites)
+
+    engine.retry_incident("inc-diff-002", RetryRequest(stage="patching", force_verification=True))
+    events = [event for event in record.events if event.event == PipelineEvent.VERIFICATION_COMPLETED][2:]
+    assert [event.payload["duplicate_of"] for event in events] == [None, None]
+    assert ci_runner.suite_runs == 3 * len(ci_runner.test_suites)
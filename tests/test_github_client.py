@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import http.client
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from services.tools import GitHubClient, GitHubRateLimited, GitHubTransport
+
+
+class StubGitHub(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, remaining: int = 5000, reset_at: float = 0.0) -> None:
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.remaining = remaining
+        self.reset_at = reset_at
+        self.requests: list[tuple[str, str, int]] = []
+        self.pulls = 0
+        self.drop_next = False
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: StubGitHub
+
+    def log_message(self, format, *args) -> None:  # noqa: A002 - stdlib signature
+        return
+
+    def _reply(self, status: int, payload: object | None = None, headers: dict[str, str] | None = None) -> None:
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-RateLimit-Limit", "5000")
+        self.send_header("X-RateLimit-Remaining", str(self.server.remaining))
+        self.send_header("X-RateLimit-Reset", str(int(self.server.reset_at)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self, method: str) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = json.loads(self.rfile.read(length)) if length else None
+        self.server.requests.append((method, self.path, self.client_address[1]))
+        if self.server.drop_next:
+            # The request reached the server, but the connection dies before
+            # any response is written.
+            self.server.drop_next = False
+            self.close_connection = True
+            return
+        prefix = "/repos/demo-org/demo-service"
+        if method == "GET" and self.path.startswith(f"{prefix}/pulls?"):
+            etag = f'"pulls-{self.server.pulls}"'
+            if self.headers.get("If-None-Match") == etag:
+                self._reply(304)
+                return
+            self.server.remaining -= 1
+            self._reply(200, [], {"ETag": etag})
+            return
+        if self.server.remaining <= 0:
+            self._reply(403, {"message": "API rate limit exceeded"})
+            return
+        self.server.remaining -= 1
+        if method == "POST" and self.path == f"{prefix}/pulls":
+            self.server.pulls += 1
+            number = self.server.pulls
+            self._reply(201, {"html_url": f"https://github.test/pull/{number}", "number": number, **payload})
+        else:
+            self._reply(404, {"message": "Not Found"})
+
+    def do_GET(self) -> None:
+        self._handle("GET")
+
+    def do_POST(self) -> None:
+        self._handle("POST")
+
+
+@pytest.fixture
+def stub():
+    servers = []
+
+    def start(**kwargs) -> StubGitHub:
+        server = StubGitHub(**kwargs)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_requests_reuse_one_connection_and_revalidate_with_etags(stub) -> None:
+    server = stub()
+    transport = GitHubTransport("token", base_url=server.url)
+    client = GitHubClient("demo-org", "demo-service", token="token", mode="real", transport=transport)
+
+    assert client.find_pull_request("sentinel/inc-1") is None
+    assert client.find_pull_request("sentinel/inc-1") is None
+    published = client.create_draft_pr("Fix timeout", "body", "sentinel/inc-1")
+    transport.close()
+
+    assert published.number == 1
+    assert [method for method, _, _ in server.requests] == ["GET", "GET", "POST"]
+    assert len({port for _, _, port in server.requests}) == 1
+    assert transport.stats.connections_opened == 1
+    assert transport.stats.not_modified == 1
+    assert transport.rate_limit.remaining == server.remaining
+
+
+def test_calls_queue_at_the_rate_limit_reserve_instead_of_hitting_403(stub) -> None:
+    now = 1_000_000.0
+    server = stub(remaining=3, reset_at=now + 30)
+    waits: list[float] = []
+
+    def sleep(seconds: float) -> None:
+        waits.append(seconds)
+        server.remaining = 5000
+
+    transport = GitHubTransport(
+        "token",
+        base_url=server.url,
+        rate_limit_reserve=2,
+        sleep=sleep,
+        wall_clock=lambda: now,
+    )
+    client = GitHubClient("demo-org", "demo-service", token="token", mode="real", transport=transport)
+    for index in range(4):
+        client.create_draft_pr(f"Fix {index}", "body", f"sentinel/inc-{index}")
+
+    assert server.pulls == 4
+    assert waits == [30.0]
+    assert transport.stats.rate_limit_waits == 1
+
+    impatient = GitHubTransport("token", base_url=server.url, max_rate_limit_wait_seconds=5, wall_clock=lambda: now)
+    server.remaining = 0
+    with pytest.raises(GitHubRateLimited):
+        impatient.request("POST", "/repos/demo-org/demo-service/pulls", {"title": "x"})
+    with pytest.raises(GitHubRateLimited):
+        impatient.request("POST", "/repos/demo-org/demo-service/pulls", {"title": "x"})
+    assert server.pulls == 4
+
+
+def test_dropped_connections_resend_only_idempotent_requests(stub) -> None:
+    server = stub()
+    transport = GitHubTransport("token", base_url=server.url)
+    client = GitHubClient("demo-org", "demo-service", token="token", mode="real", transport=transport)
+    client.find_pull_request("sentinel/inc-1")
+
+    server.drop_next = True
+    assert client.find_pull_request("sentinel/inc-1") is None
+    assert transport.stats.reconnects == 1
+
+    server.drop_next = True
+    with pytest.raises(http.client.RemoteDisconnected):
+        client.create_draft_pr("Fix timeout", "body", "sentinel/inc-1")
+    transport.close()
+
+    assert [method for method, _, _ in server.requests] == ["GET", "GET", "GET", "POST"]
+    assert server.pulls == 0 and transport.stats.reconnects == 1
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import services.orchestrator.app as orchestrator_app_module
+from benchmarks.load_test import LoadProfile, build_schedule, run_in_process
+from services.tools import SyntheticWorkload, WorkloadSpec
+
+
+def test_schedule_is_seeded_and_includes_storms() -> None:
+    profile = LoadProfile(duration_seconds=4.0, storm_interval_seconds=2.0, storm_size=10, seed=5)
+    schedule = build_schedule(profile)
+
+    assert schedule == build_schedule(profile)
+    assert sum(1 for _, _, storm in schedule if storm) == 10
+    assert all(offset < 4.5 for offset, _, _ in schedule)
+    assert [offset for offset, _, _ in schedule] == sorted(offset for offset, _, _ in schedule)
+
+
+def test_in_process_load_run_reports_operations(tmp_path: Path) -> None:
+    profile = LoadProfile(
+        duration_seconds=1.0,
+        create_rate=10.0,
+        get_rate=10.0,
+        storm_interval_seconds=0.5,
+        storm_size=5,
+        seed=3,
+    )
+    workload = SyntheticWorkload(WorkloadSpec(seed=3, services=2, duration_minutes=30))
+    previous = orchestrator_app_module.engine
+    report = asyncio.run(run_in_process(profile, workload, str(tmp_path / "load.db")))
+    data = report.to_dict()
+
+    assert orchestrator_app_module.engine is previous
+
+    assert data["operations"]["create"]["count"] >= 5
+    assert all(stats["server_errors"] == 0 for stats in data["operations"].values())
+    assert sum(data["operations"]["create"]["histogram"].values()) == data["operations"]["create"]["count"]
+    assert data["rss_end_bytes"] is not None
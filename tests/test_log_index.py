@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import random
+
+from services.tools import MockAzureMonitorTool
+from services.tools.log_index import LogIndex
+
+
+def build_logs() -> list[dict]:
+    messages = [
+        ("INFO", "/checkout", "Request served in 120ms"),
+        ("ERROR", "/checkout", "Upstream timeout when contacting payments dependency"),
+        ("WARNING", "/cart", "Slow response from inventory: timeouts rising"),
+        ("ERROR", "/cart", "Retry budget exhausted for payment provider"),
+        ("CRITICAL", "/checkout", "Connection pool exhausted"),
+    ]
+    return [
+        {
+            "timestamp": f"2026-02-14T11:{50 - index:02d}:00+00:00",
+            "level": level,
+            "endpoint": endpoint,
+            "message": message,
+        }
+        for index, (level, endpoint, message) in enumerate(messages)
+    ]
+
+
+def test_log_index_matches_substring_scan_semantics() -> None:
+    logs = build_logs()
+    index = LogIndex(logs)
+
+    for query in ("timeout", "TIME", "payment", "pool exh", "ms", "no-such-term", "!!"):
+        expected = sorted(
+            (log for log in logs if query.lower() in log["message"].lower()),
+            key=lambda item: item["timestamp"],
+        )
+        assert index.search(contains=query) == expected
+
+    errors = index.search(levels=("error", "critical"), endpoint="/checkout")
+    assert [log["level"] for log in errors] == ["CRITICAL", "ERROR"]
+    window = index.search(start_time="2026-02-14T11:47:00+00:00", end_time="2026-02-14T11:49:00+00:00")
+    assert [log["timestamp"][11:16] for log in window] == ["11:47", "11:48", "11:49"]
+
+
+def test_mock_tool_indexes_appended_logs() -> None:
+    tool = MockAzureMonitorTool()
+    before = tool.query_logs("checkout-api", "prod", contains="timeout", levels=("ERROR",))
+    tool.append_logs(
+        "checkout-api",
+        "prod",
+        [
+            {
+                "timestamp": "2026-02-14T11:40:00+00:00",
+                "level": "ERROR",
+                "message": "Gateway timeout from fraud service",
+                "endpoint": "/checkout",
+            }
+        ],
+    )
+    after = tool.query_logs("checkout-api", "prod", contains="timeout", levels=("ERROR",))
+
+    assert len(after) == len(before) + 1
+    assert after[0]["message"] == "Gateway timeout from fraud service"
+    assert tool.query_logs("unknown-api", "prod", contains="timeout") == []
+
+
+def test_streaming_logs_are_ordered_and_lazy() -> None:
+    tool = MockAzureMonitorTool()
+    tool.append_logs("checkout-api", "prod", build_logs())
+
+    newest = tool.iter_logs("checkout-api", "prod", levels=("ERROR",), newest_first=True)
+    first = next(newest)
+    assert first["timestamp"] == "2026-02-14T11:49:00+00:00"
+    newest.close()
+
+    oldest = [log["timestamp"] for log in tool.iter_logs("checkout-api", "prod", levels=("ERROR",))]
+    assert oldest == sorted(oldest)
+    assert next(tool.iter_recent_deployments("checkout-api", "prod"))["version"] == "2026.02.14.2"
+
+
+def test_log_index_resolves_long_and_short_terms_through_grams() -> None:
+    logs = build_logs()
+    index = LogIndex(logs)
+
+    assert sorted(index._vocabulary_matches("xhauste")) == ["exhausted"]
+    assert sorted(index._vocabulary_matches("pay")) == ["payment", "payments"]
+    assert index._vocabulary_matches("timeoutz") == []
+    assert index.search(contains="CONTACTING PAY") == [logs[1]]
+
+
+def test_streaming_search_matches_batch_search_in_both_orders() -> None:
+    rng = random.Random(11)
+    words = ["timeout", "retry", "payment", "pool", "cache", "exhausted"]
+    logs = [
+        {
+            "timestamp": f"2026-02-14T{10 + minute // 60:02d}:{minute % 60:02d}:00+00:00",
+            "level": rng.choice(["INFO", "WARNING", "ERROR", "CRITICAL"]),
+            "endpoint": rng.choice(["/checkout", "/cart"]),
+            "message": " ".join(rng.sample(words, 3)),
+        }
+        for minute in range(120)
+    ]
+    shuffled = logs[:]
+    rng.shuffle(shuffled)
+    queries = [
+        {},
+        {"levels": ("error", "critical")},
+        {"levels": ("ERROR",), "endpoint": "/cart", "contains": "pay"},
+        {"contains": "retry exh", "start_time": "2026-02-14T10:30:00+00:00"},
+        {"endpoint": "/checkout", "end_time": "2026-02-14T11:15:00+00:00"},
+        {"contains": "no-such-term"},
+    ]
+
+    in_order, out_of_order = LogIndex(logs), LogIndex(shuffled)
+    assert in_order._in_time_order and not out_of_order._in_time_order
+    for index in (in_order, out_of_order):
+        for query in queries:
+            expected = index.search(**query)
+            assert list(index.iter_search(**query)) == expected
+            assert list(index.iter_search(newest_first=True, **query)) == expected[::-1]
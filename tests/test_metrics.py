@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+import services.orchestrator.app as orchestrator_app_module
+from services.orchestrator.metrics import MetricsRegistry
+from tests.test_api import build_test_engine
+from tests.test_pipeline import build_incident
+
+
+def test_histogram_merges_thread_shards_and_estimates_quantiles() -> None:
+    registry = MetricsRegistry()
+    histogram = registry.histogram("stage_duration_seconds", "Stage latency.", ("stage",), buckets=(0.01, 0.1, 1.0))
+
+    def observe() -> None:
+        for _ in range(99):
+            histogram.observe(0.005, stage="triage")
+        histogram.observe(0.5, stage="triage")
+
+    workers = [threading.Thread(target=observe) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    histogram.observe(2.0, stage="verification")
+
+    assert histogram.count(stage="triage") == 400
+    assert histogram.quantile(0.5, stage="triage") < 0.01
+    assert 0.1 < histogram.quantile(0.995, stage="triage") <= 1.0
+    assert histogram.quantile(0.99, stage="verification") == 1.0
+    text = registry.render()
+    assert "# TYPE sentinel_stage_duration_seconds histogram" in text
+    assert 'sentinel_stage_duration_seconds_bucket{stage="triage",le="0.01"} 396' in text
+    assert 'sentinel_stage_duration_seconds_bucket{stage="triage",le="+Inf"} 400' in text
+    assert 'sentinel_stage_duration_seconds_count{stage="verification"} 1' in text
+
+    # Short-lived threads do not accumulate shards between scrapes.
+    for _ in range(50):
+        worker = threading.Thread(target=histogram.observe, args=(0.05,), kwargs={"stage": "patching"})
+        worker.start()
+        worker.join()
+    assert len(histogram._shards) <= 2
+    assert histogram.count(stage="patching") == 50
+
+
+def test_metrics_endpoint_exposes_pipeline_and_tool_metrics(tmp_path: Path) -> None:
+    engine = build_test_engine(tmp_path)
+    orchestrator_app_module.engine = engine
+    engine.ingest_incident(build_incident("inc-metrics-1"))
+    engine.ingest_incident(build_incident("inc-metrics-2"))
+
+    response = TestClient(orchestrator_app_module.app).get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+    assert 'sentinel_stage_duration_seconds_count{stage="investigation"} 1' in text
+    assert 'sentinel_stage_duration_seconds_count{stage="pipeline"} 2' in text
+    assert 'sentinel_pipeline_runs_total{status="pr_ready"} 1' in text
+    assert 'sentinel_pipeline_runs_total{status="duplicate"} 1' in text
+    assert 'sentinel_incidents{status="pr_ready"} 1' in text
+    tool_calls = "sentinel_tool_call_duration_seconds_count"
+    assert f'{tool_calls}{{backend="azure_monitor",operation="iter_logs",outcome="ok"}}' in text
+    assert f'{tool_calls}{{backend="github",operation="create_draft_pr",outcome="ok"}} 1' in text
+    assert 'sentinel_pr_outbox_jobs{status="published"} 1' in text
+    assert "sentinel_pattern_store_records 1" in text
+    assert engine.stage_latency.quantile(0.99, stage="verification") is not None
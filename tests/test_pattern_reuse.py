@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+from contracts import ApproveRequest, Decision, IncidentStatus, PatternRecord
+from services.tools.copilot_agent import CopilotPatchGenerator
+from storage import PatternStore
+from tests.test_pipeline import build_engine, build_incident
+
+
+class CountingGenerator(CopilotPatchGenerator):
+    def __init__(self, repo_slug: str) -> None:
+        super().__init__(repo_slug)
+        self.calls = 0
+
+    def generate_patch(self, incident, investigation, attempt=1):
+        self.calls += 1
+        return super().generate_patch(incident, investigation, attempt=attempt)
+
+
+def test_proven_fix_is_reused_until_rejected(tmp_path: Path) -> None:
+    engine = build_engine(tmp_path)
+    generator = CountingGenerator(engine.github_client.repo_slug)
+    engine.patch_agent.generator = generator
+
+    first = engine.ingest_incident(build_incident("inc-reuse-001"))
+    assert first.patch.source == "generator" and generator.calls == 1
+    engine.approve_incident("inc-reuse-001", ApproveRequest(approved_by="oncall", decision=Decision.APPROVE))
+
+    second = engine.ingest_incident(build_incident("inc-reuse-002"))
+    assert second.status == IncidentStatus.PR_READY
+    assert generator.calls == 1
+    assert second.patch.source == "pattern:inc-reuse-001"
+    assert second.patch.patch_text == first.patch.patch_text
+    assert second.patch.branch == "sentinel/inc-reuse-002-attempt-1"
+    assert second.patch.risk_level == first.patch.risk_level
+    engine.approve_incident("inc-reuse-002", ApproveRequest(approved_by="oncall", decision=Decision.REJECT))
+
+    third = engine.ingest_incident(build_incident("inc-reuse-003"))
+    assert third.patch.source == "generator" and generator.calls == 2
+
+
+def test_pattern_store_migrates_legacy_schema(tmp_path: Path) -> None:
+    db_path = tmp_path / "legacy.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "CREATE TABLE pattern_records (id INTEGER PRIMARY KEY AUTOINCREMENT, fingerprint TEXT NOT NULL, "
+            "root_cause TEXT NOT NULL, fix_signature TEXT NOT NULL, outcome TEXT NOT NULL, created_at TEXT NOT NULL)"
+        )
+        conn.execute(
+            "INSERT INTO pattern_records (fingerprint, root_cause, fix_signature, outcome, created_at) "
+            "VALUES ('svc:prod:http_5xx_rate:/x', 'cause', 'fix', 'approved', '2026-01-01T00:00:00+00:00')"
+        )
+
+    store = PatternStore(str(db_path))
+    legacy = store.find_latest("svc:prod:http_5xx_rate:/x")
+    assert legacy.patch_text == "" and legacy.changed_files == []
+    assert store.find_reusable_fix("svc:prod:http_5xx_rate:/x") is None
+
+
+def test_only_approved_fixes_count_as_proven(tmp_path: Path) -> None:
+    store = PatternStore(str(tmp_path / "patterns.db"))
+    fingerprint = "checkout-api:prod:http_5xx_rate:/checkout"
+
+    def save(incident_id: str, outcome: str, patch_text: str, risk_level: str = "medium") -> None:
+        store.save(
+            PatternRecord(
+                fingerprint=fingerprint,
+                root_cause="cause",
+                fix_signature="fix",
+                outcome=outcome,
+                incident_id=incident_id,
+                patch_text=patch_text,
+                risk_level=risk_level,
+            )
+        )
+
+    timeout_fix = "--- a/config/t.yaml\n+++ b/config/t.yaml\n@@ -1 +1 @@\n-a: 1\n+a: 2\n"
+    retry_fix = "--- a/config/r.yaml\n+++ b/config/r.yaml\n@@ -1 +1 @@\n-b: 1\n+b: 2\n"
+    save("inc-1", "pending_approval", timeout_fix, risk_level="high")
+    assert store.find_reusable_fix(fingerprint) is None
+
+    store.update_outcome("inc-1", "approved")
+    reusable = store.find_reusable_fix(fingerprint)
+    assert reusable.incident_id == "inc-1" and reusable.risk_level == "high"
+
+    save("inc-2", "approved", retry_fix)
+    save("inc-3", "rejected", retry_fix)
+    assert store.find_reusable_fix(fingerprint).incident_id == "inc-1"
+    save("inc-4", "rejected", timeout_fix)
+    assert store.find_reusable_fix(fingerprint) is None
+
+
+def test_pattern_store_backfills_content_hashes(tmp_path: Path) -> None:
+    db_path = tmp_path / "unhashed.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "CREATE TABLE pattern_records (id INTEGER PRIMARY KEY AUTOINCREMENT, fingerprint TEXT NOT NULL, "
+            "root_cause TEXT NOT NULL, fix_signature TEXT NOT NULL, outcome TEXT NOT NULL, created_at TEXT NOT NULL, "
+            "incident_id TEXT NOT NULL DEFAULT '', patch_text TEXT NOT NULL DEFAULT '', "
+            "changed_files TEXT NOT NULL DEFAULT '[]', evidence_terms TEXT NOT NULL DEFAULT '[]')"
+        )
+        conn.executemany(
+            "INSERT INTO pattern_records (fingerprint, root_cause, fix_signature, outcome, created_at, incident_id, "
+            "patch_text) VALUES ('svc:prod:http_5xx_rate:/x', 'cause', 'fix', ?, '2026-01-01T00:00:00+00:00', ?, ?)",
+            [("approved", "inc-1", "+a: 2\n"), ("rejected", "inc-2", "+a: 2\n")],
+        )
+
+    assert PatternStore(str(db_path)).find_reusable_fix("svc:prod:http_5xx_rate:/x") is None
+    with sqlite3.connect(db_path) as conn:
+        hashes = {row[0] for row in conn.execute("SELECT content_hash FROM pattern_records")}
+    assert len(hashes) == 1 and "" not in hashes
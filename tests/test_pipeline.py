@@ -83,6 +83,30 @@ def test_investigation_links_latest_deployment(tmp_path: Path) -> None:
     assert packet.confidence >= 0.65
 
 
+def test_investigation_cites_newest_error_logs(tmp_path: Path) -> None:
+    azure_tool = MockAzureMonitorTool()
+    azure_tool.append_logs(
+        "checkout-api",
+        "prod",
+        (
+            {
+                "timestamp": f"2026-02-10T08:{minute:02d}:00+00:00",
+                "level": "ERROR",
+                "message": f"Stale cache warmup failure {minute}",
+                "endpoint": "/checkout",
+            }
+            for minute in range(10)
+        ),
+    )
+    engine = build_engine(tmp_path, azure_tool=azure_tool)
+    packet = engine.investigation_agent.investigate(build_incident("inc-004b"))
+    assert packet.log_evidence[:2] == [
+        "Retry budget exhausted for payment provider",
+        "Upstream timeout when contacting payments dependency",
+    ]
+    assert len(packet.log_evidence) == engine.investigation_agent.max_log_evidence
+
+
 def test_patch_proposal_has_rationale_and_constrained_scope(tmp_path: Path) -> None:
     engine = build_engine(tmp_path)
     incident = build_incident("inc-005")
@@ -145,12 +169,16 @@ def test_low_confidence_path_escalates_without_pr(tmp_path: Path) -> None:
 
 def test_tool_outage_retries_then_escalates_safely(tmp_path: Path) -> None:
     class FailingAzureTool(MockAzureMonitorTool):
+        calls = 0
+
         def get_recent_deployments(self, service: str, env: str):
+            self.calls += 1
             raise TimeoutError("Azure Monitor query timeout")
 
+    azure_tool = FailingAzureTool()
     engine = build_engine(
         tmp_path,
-        azure_tool=FailingAzureTool(),
+        azure_tool=azure_tool,
         tool_retry_attempts=2,
     )
     record = engine.ingest_incident(build_incident("inc-010"))
@@ -161,8 +189,8 @@ def test_tool_outage_retries_then_escalates_safely(tmp_path: Path) -> None:
     ]
 
     assert record.status == IncidentStatus.ESCALATED
-    assert len(failures) == 2
-    assert "investigation attempt 2 failed" in (record.last_error or "").lower()
+    assert len(failures) == 1 and azure_tool.calls == 2
+    assert "investigation failed" in (record.last_error or "").lower()
 
 
 def test_bad_patch_path_stops_after_retry_limit(tmp_path: Path) -> None:
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+
+from contracts import IncidentStatus, PipelineEvent, VirtualClock
+from services.orchestrator.config import Settings
+from services.orchestrator.engine import SentinelEngine
+from services.orchestrator.publisher import PullRequestPublisher
+from services.tools import CIRunner, GitHubClient, MockAzureMonitorTool, PullRequestInfo
+from storage import PatternStore, PullRequestJob, PullRequestOutbox
+from tests.test_pipeline import build_incident
+
+
+class GatedGitHubClient(GitHubClient):
+    def __init__(self, fail_times: int = 0) -> None:
+        super().__init__(owner="demo-org", repo="demo-service", mode="mock")
+        self.gate = threading.Event()
+        self.fail_times = fail_times
+        self.create_calls = 0
+
+    def create_draft_pr(self, title: str, body: str, head_branch: str, base_branch: str = "main") -> PullRequestInfo:
+        self.create_calls += 1
+        self.gate.wait(5)
+        if self.create_calls <= self.fail_times:
+            raise RuntimeError("GitHub API error (502): bad gateway")
+        return super().create_draft_pr(title, body, head_branch, base_branch)
+
+
+def wait_until(predicate, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_pipeline_commits_pr_job_without_waiting_for_github(tmp_path: Path) -> None:
+    db_path = str(tmp_path / "patterns.db")
+    github = GatedGitHubClient()
+    engine = SentinelEngine(
+        settings=Settings(pattern_db_path=db_path, tool_retry_attempts=1, pr_publish_interval_seconds=0.05),
+        azure_tool=MockAzureMonitorTool(),
+        github_client=github,
+        ci_runner=CIRunner(),
+        pattern_store=PatternStore(db_path),
+    )
+    engine.pr_publisher.start()
+    try:
+        record = engine.ingest_incident(build_incident("inc-outbox-1"))
+        assert record.status == IncidentStatus.PR_READY
+        assert record.approval_package is not None
+        assert record.approval_package.pr_url == "pending"
+        counts = engine.pr_outbox.counts()
+        assert counts["pending"] + counts["in_flight"] == 1 and counts["published"] == 0
+
+        github.gate.set()
+        assert wait_until(lambda: record.approval_package.pr_url.startswith("https://github.com/"))
+    finally:
+        engine.pr_publisher.stop()
+
+    assert record.linked_artifacts["pr_url"] == record.approval_package.pr_url
+    assert record.events[-1].event == PipelineEvent.PR_PUBLISHED
+    job = engine.pr_outbox.get(record.patch.branch)
+    assert job is not None and job.status == "published" and job.pr_url == record.approval_package.pr_url
+    assert github.create_calls == 1
+
+
+def test_outbox_is_idempotent_on_head_branch_and_survives_restarts(tmp_path: Path) -> None:
+    outbox_path = str(tmp_path / "pr_outbox.db")
+    job = PullRequestJob("sentinel/inc-1", "inc-1", "Fix", "body", "main")
+    outbox = PullRequestOutbox(outbox_path)
+    outbox.enqueue(job)
+    outbox.enqueue(PullRequestJob("sentinel/inc-1", "inc-1", "Fix again", "other", "main"))
+    assert len(outbox) == 1
+    assert outbox.get("sentinel/inc-1").title == "Fix"
+
+    # GitHub accepted the PR but the process died before the outbox update.
+    github = GatedGitHubClient()
+    github.gate.set()
+    github.create_draft_pr("Fix", "body", "sentinel/inc-1")
+    published: list[PullRequestInfo] = []
+    restarted = PullRequestPublisher(
+        PullRequestOutbox(outbox_path),
+        github,
+        on_published=lambda _, pr_info: published.append(pr_info),
+    )
+    assert restarted.publish_pending() == 1
+    assert github.create_calls == 1
+    assert published[0].pr_url == github.created_prs[0].pr_url
+
+    flaky = GatedGitHubClient(fail_times=5)
+    flaky.gate.set()
+    failures: list[str] = []
+    retrying = PullRequestPublisher(
+        PullRequestOutbox(outbox_path),
+        flaky,
+        on_failed=lambda _, error: failures.append(error),
+        retry_seconds=0.0,
+        max_attempts=2,
+    )
+    retrying.outbox.enqueue(PullRequestJob("sentinel/inc-2", "inc-2", "Fix", "body", "main"))
+    assert retrying.publish_pending() == 0
+    assert flaky.create_calls == 2
+    assert retrying.outbox.counts() == {"pending": 0, "in_flight": 0, "published": 1, "failed": 1}
+    assert failures and "bad gateway" in failures[0]
+
+
+def test_reenqueueing_a_failed_job_starts_it_over(tmp_path: Path) -> None:
+    outbox = PullRequestOutbox(str(tmp_path / "pr_outbox.db"))
+    outbox.enqueue(PullRequestJob("sentinel/inc-1", "inc-1", "Fix", "body", "main"))
+    outbox.enqueue(PullRequestJob("sentinel/inc-2", "inc-2", "Fix", "body", "main"))
+    outbox.claim(2, lease_seconds=60.0)
+    outbox.mark_failed("sentinel/inc-1", "bad gateway", None)
+    outbox.mark_published("sentinel/inc-2", "https://github.com/demo-org/demo-service/pull/2", 2)
+
+    retried = outbox.enqueue(PullRequestJob("sentinel/inc-1", "inc-1", "Fix again", "other", "main"))
+    assert (retried.status, retried.attempts, retried.last_error) == ("pending", 0, None)
+    assert (retried.title, retried.lease_until) == ("Fix again", 0.0)
+    assert outbox.enqueue(PullRequestJob("sentinel/inc-2", "inc-2", "Fix again", "other", "main")).status == "published"
+    assert [job.head_branch for job in outbox.claim(2, lease_seconds=60.0)] == ["sentinel/inc-1"]
+
+
+def test_publishers_sharing_an_outbox_claim_disjoint_jobs_and_recover_expired_leases(tmp_path: Path) -> None:
+    outbox_path = str(tmp_path / "pr_outbox.db")
+    clock = VirtualClock()
+    first, second = PullRequestOutbox(outbox_path, clock=clock), PullRequestOutbox(outbox_path, clock=clock)
+    for index in range(6):
+        first.enqueue(PullRequestJob(f"sentinel/inc-{index}", f"inc-{index}", "Fix", "body", "main"))
+        clock.advance(1)
+
+    claims: list[list[PullRequestJob]] = [[], []]
+    workers = [
+        threading.Thread(target=lambda slot=slot, outbox=outbox: claims[slot].extend(outbox.claim(6, 60.0)))
+        for slot, outbox in enumerate((first, second))
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    branches = [job.head_branch for claim in claims for job in claim]
+    assert sorted(branches) == [f"sentinel/inc-{index}" for index in range(6)]
+    assert first.counts()["in_flight"] == 6 and first.claim(6, 60.0) == []
+
+    # The claimant of sentinel/inc-0 died; its lease runs out and the job is
+    # delivered again, while a late report from the dead claimant is ignored.
+    for branch in branches[1:]:
+        first.mark_published(branch, f"https://github.test/{branch}", None)
+    clock.advance(61)
+    reclaimed = second.claim(6, 60.0)
+    assert [job.head_branch for job in reclaimed] == ["sentinel/inc-0"]
+    second.mark_published("sentinel/inc-0", "https://github.test/pull/1", 1)
+    first.mark_failed("sentinel/inc-0", "stale", 0.0)
+    assert first.get("sentinel/inc-0").status == "published"
+    assert first.counts() == {"pending": 0, "in_flight": 0, "published": 6, "failed": 0}
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import replace
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+import services.orchestrator.app as orchestrator_app_module
+from services.orchestrator.profiler import SamplingProfiler
+from services.orchestrator.telemetry import bind_span_tags, traced_span
+from tests.test_api import build_test_engine
+
+
+def spin(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(200))
+
+
+def test_profiler_tags_samples_with_span_stage_and_incident() -> None:
+    stop = threading.Event()
+
+    def investigate() -> None:
+        with traced_span("investigation", {"incident_id": "inc-prof-1"}):
+            spin(stop)
+
+    def handed_off() -> None:
+        with traced_span("verification", {"incident_id": "inc-prof-2"}):
+            worker = threading.Thread(target=bind_span_tags(lambda: spin(stop)), name="sentinel-verification")
+            worker.start()
+            worker.join()
+
+    threads = [threading.Thread(target=investigate), threading.Thread(target=handed_off)]
+    for thread in threads:
+        thread.start()
+    try:
+        result = SamplingProfiler(interval_seconds=0.002).profile(0.2)
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    assert result.samples > 0
+    assert result.by_tag("stage")["investigation"] > 0
+    assert result.by_tag("incident")["inc-prof-2"] > 0
+    lines = result.collapsed().splitlines()
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    handed_off_prefix = "sentinel-verification;[incident:inc-prof-2];[stage:verification];"
+    assert any(line.startswith(handed_off_prefix) and "test_profiler:spin" in line for line in lines)
+
+
+def test_profile_endpoint_requires_admin_token(tmp_path: Path) -> None:
+    engine = build_test_engine(tmp_path)
+    orchestrator_app_module.engine = engine
+    client = TestClient(orchestrator_app_module.app)
+    request = {"duration_seconds": 0.05, "interval_ms": 5}
+    assert client.post("/api/v1/admin/profile", json=request).status_code == 403
+
+    engine.settings = replace(engine.settings, admin_token="s3cret", profiler_max_seconds=0.1)
+    denied = client.post("/api/v1/admin/profile", json=request, headers={"X-Sentinel-Admin-Token": "nope"})
+    assert denied.status_code == 401
+    started = time.perf_counter()
+    response = client.post(
+        "/api/v1/admin/profile",
+        json={"duration_seconds": 60, "interval_ms": 5, "format": "json", "include_idle": True},
+        headers={"X-Sentinel-Admin-Token": "s3cret"},
+    )
+    assert response.status_code == 200
+    assert time.perf_counter() - started < 5
+    body = response.json()
+    assert body["duration_seconds"] <= 0.5
+    assert body["samples"] > 0 and body["stacks"]
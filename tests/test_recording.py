@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from pathlib import Path
+
+from contracts import IncidentStatus
+from services.orchestrator.config import Settings
+from services.orchestrator.engine import SentinelEngine
+from services.orchestrator.recording import TrafficReplayer
+from storage import PatternStore
+from tests.test_pipeline import build_incident
+
+
+def test_recorded_traffic_replays_into_fresh_engine(tmp_path: Path) -> None:
+    log_path = tmp_path / "traffic.jsonl.gz"
+    live_db = str(tmp_path / "live.db")
+    settings = Settings(pattern_db_path=live_db, record_path=str(log_path))
+    recording_engine = SentinelEngine(settings=settings, pattern_store=PatternStore(live_db))
+    live = [
+        recording_engine.ingest_incident(build_incident("inc-rec-001")),
+        recording_engine.ingest_incident(build_incident("inc-rec-002")),
+        recording_engine.ingest_incident(build_incident("inc-rec-003", env="dev")),
+    ]
+    recording_engine.recorder.close()
+
+    replayer = TrafficReplayer(log_path)
+    assert [incident.incident_id for _, incident in replayer.incidents] == [
+        "inc-rec-001",
+        "inc-rec-002",
+        "inc-rec-003",
+    ]
+
+    results = []
+    for run in ("a", "b"):
+        db_path = str(tmp_path / f"replay-{run}.db")
+        replay_settings = replace(settings, record_path=None, pattern_db_path=db_path)
+        engine = SentinelEngine(settings=replay_settings, pattern_store=PatternStore(db_path), **replayer.tools(speed=0))
+        results.append(replayer.replay(engine, speed=0, max_workers=1))
+
+    assert results[0].statuses == {record.incident.incident_id: record.status.value for record in live}
+    assert results[0].statuses["inc-rec-001"] == IncidentStatus.PR_READY.value
+    assert results[0].status_changes(results[1]) == {}
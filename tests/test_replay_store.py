@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from contracts import IncidentStatus
+from services.tools import MockAzureMonitorTool, ReplayAzureMonitorTool, default_telemetry_dataset, write_replay_file
+from services.tools import replay_store
+from services.tools.synthetic_data import synthetic_5xx_incident
+from tests.test_pipeline import build_engine
+
+
+def test_replay_store_round_trips_mock_queries(tmp_path: Path) -> None:
+    path = tmp_path / "capture.sntl"
+    write_replay_file(path, default_telemetry_dataset())
+    mock = MockAzureMonitorTool()
+
+    with ReplayAzureMonitorTool(path) as replay:
+        assert replay.buckets() == [("checkout-api", "prod")]
+        assert replay.get_recent_deployments("checkout-api", "prod") == mock.get_recent_deployments(
+            "checkout-api", "prod"
+        )
+        assert replay.query_metrics("checkout-api", "prod") == mock.query_metrics("checkout-api", "prod")
+        assert replay.query_metrics("checkout-api", "prod", metric_name="http_5xx_rate") == mock.query_metrics(
+            "checkout-api", "prod", metric_name="http_5xx_rate"
+        )
+        assert replay.query_logs("checkout-api", "prod", contains="RETRY", levels=("error",)) == mock.query_logs(
+            "checkout-api", "prod", contains="RETRY", levels=("error",)
+        )
+        window = replay.query_logs(
+            "checkout-api",
+            "prod",
+            start_time="2026-02-14T11:47:00+00:00",
+            end_time="2026-02-14T11:48:00Z",
+        )
+        assert [log["message"] for log in window] == ["Retry budget exhausted for payment provider"]
+        assert replay.query_logs("unknown-api", "prod") == []
+
+
+def test_engine_investigates_from_replay_capture(tmp_path: Path) -> None:
+    path = tmp_path / "capture.sntl"
+    write_replay_file(path, default_telemetry_dataset())
+
+    with ReplayAzureMonitorTool(path) as replay:
+        engine = build_engine(tmp_path, azure_tool=replay)
+        record = engine.ingest_incident(synthetic_5xx_incident("inc-replay-001"))
+
+    assert record.status == IncidentStatus.PR_READY
+    assert record.investigation is not None
+    assert record.investigation.suspected_release == "2026.02.14.2"
+
+
+def test_replay_store_keeps_millisecond_timestamps(tmp_path: Path) -> None:
+    path = tmp_path / "capture.sntl"
+    logs = [
+        {"timestamp": "2026-02-14T11:47:10.250+00:00", "level": "ERROR", "message": "first"},
+        {"timestamp": "2026-02-14T11:47:10.750Z", "level": "ERROR", "message": "second"},
+    ]
+    write_replay_file(path, {("checkout-api", "prod"): {"logs": logs}})
+
+    with ReplayAzureMonitorTool(path) as replay:
+        assert [log["timestamp"] for log in replay.query_logs("checkout-api", "prod")] == [
+            "2026-02-14T11:47:10.250+00:00",
+            "2026-02-14T11:47:10.750+00:00",
+        ]
+        window = replay.query_logs("checkout-api", "prod", start_time="2026-02-14T11:47:10.500Z")
+        assert [log["message"] for log in window] == ["second"]
+
+
+def test_failed_replay_write_leaves_no_temp_file(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    def fail(*args: object) -> None:
+        raise OSError("disk full")
+
+    monkeypatch.setattr(replay_store.shutil, "copyfileobj", fail)
+    with pytest.raises(OSError, match="disk full"):
+        write_replay_file(tmp_path / "capture.sntl", default_telemetry_dataset())
+    assert list(tmp_path.iterdir()) == []
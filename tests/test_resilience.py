@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import random
+from pathlib import Path
+
+import pytest
+
+from contracts import IncidentStatus, VirtualClock
+from contracts.models import parse_iso
+from services.orchestrator.config import Settings
+from services.orchestrator.engine import SentinelEngine
+from services.tools import (
+    CIRunner,
+    CircuitOpenError,
+    GitHubClient,
+    MockAzureMonitorTool,
+    ResilientGitHubClient,
+    RetryPolicy,
+    ToolResilience,
+)
+from storage import PatternStore
+from tests.test_pipeline import build_incident
+
+
+class FlakyAzureTool(MockAzureMonitorTool):
+    def __init__(self, failures: int) -> None:
+        super().__init__()
+        self.failures = failures
+        self.calls = 0
+
+    def get_recent_deployments(self, service: str, env: str):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise TimeoutError("Azure Monitor query timeout")
+        return super().get_recent_deployments(service, env)
+
+
+def test_breaker_opens_fails_fast_and_recovers_through_a_probe() -> None:
+    clock = VirtualClock()
+    resilience = ToolResilience(
+        RetryPolicy(attempts=3, base_delay_seconds=1.0, max_delay_seconds=4.0),
+        failure_threshold=3,
+        reset_timeout_seconds=30.0,
+        clock=clock,
+        seed=1,
+    )
+    calls = []
+
+    def failing() -> None:
+        calls.append(clock.monotonic())
+        raise ConnectionError("backend down")
+
+    with pytest.raises(ConnectionError):
+        resilience.call("github", failing)
+    assert len(calls) == 3 and 0.0 < calls[-1] <= 3.0
+    assert resilience.breaker("github").state == "open"
+    with pytest.raises(CircuitOpenError):
+        resilience.call("github", failing)
+    assert len(calls) == 3
+
+    clock.advance(31)
+    assert resilience.call("github", lambda: "ok") == "ok"
+    snapshot = resilience.snapshot()
+    assert snapshot["breakers"]["github"]["state"] == "closed"
+    assert snapshot["breakers"]["github"]["short_circuits"] == 1
+    assert snapshot["retries"] == {"github": 2}
+    assert all(0.0 <= RetryPolicy().delay(retry, random.Random(retry)) <= 8.0 for retry in range(1, 12))
+
+
+def test_engine_retries_with_backoff_and_fails_fast_while_circuit_is_open(tmp_path: Path) -> None:
+    incident = build_incident("inc-res-001")
+    clock = VirtualClock(parse_iso(incident.start_time))
+    db_path = str(tmp_path / "patterns.db")
+    settings = Settings(pattern_db_path=db_path, telemetry_cache_ttl_seconds=0, circuit_failure_threshold=2)
+
+    flaky = FlakyAzureTool(failures=1)
+    engine = SentinelEngine(settings=settings, azure_tool=flaky, pattern_store=PatternStore(db_path), clock=clock)
+    assert engine.ingest_incident(incident).status == IncidentStatus.PR_READY
+    assert engine.resilience.snapshot()["retries"] == {"azure_monitor": 1}
+
+    down = FlakyAzureTool(failures=10**6)
+    engine = SentinelEngine(settings=settings, azure_tool=down, pattern_store=PatternStore(db_path), clock=clock)
+    first = engine.ingest_incident(build_incident("inc-res-002"))
+    # One retry layer: the tool call is attempted tool_retry_attempts times.
+    assert first.status == IncidentStatus.ESCALATED and down.calls == 2
+    second = engine.ingest_incident(build_incident("inc-res-003", env="staging"))
+    assert second.status == IncidentStatus.ESCALATED
+    assert "circuit" in (second.last_error or "").lower()
+    assert down.calls == 2
+    assert engine.resilience.breaker("azure_monitor").to_dict()["state"] == "open"
+
+
+def test_ci_outage_during_verification_escalates_instead_of_failing_the_request(tmp_path: Path) -> None:
+    class DownCIRunner(CIRunner):
+        def run_suite(self, patch, suite):
+            raise ConnectionError("CI unreachable")
+
+    db_path = str(tmp_path / "patterns.db")
+    settings = Settings(
+        pattern_db_path=db_path,
+        dedupe_window_minutes=0,
+        verification_cache_ttl_seconds=0,
+        circuit_failure_threshold=3,
+    )
+    engine = SentinelEngine(settings=settings, ci_runner=DownCIRunner(), pattern_store=PatternStore(db_path))
+
+    first = engine.ingest_incident(build_incident("inc-res-004"))
+    assert first.status == IncidentStatus.ESCALATED
+    assert (first.last_error or "").startswith("Verification failed:")
+    second = engine.ingest_incident(build_incident("inc-res-005"))
+    assert second.status == IncidentStatus.ESCALATED and second.stage == "escalated"
+    assert "circuit" in (second.last_error or "").lower()
+
+
+def test_draft_pr_creation_is_attempted_once() -> None:
+    class DownGitHubClient(GitHubClient):
+        def __init__(self) -> None:
+            super().__init__(owner="demo-org", repo="demo-service", mode="mock")
+            self.creates = 0
+
+        def create_draft_pr(self, title: str, body: str, head_branch: str, base_branch: str = "main"):
+            self.creates += 1
+            raise ConnectionError("connection reset after the request was sent")
+
+    resilience = ToolResilience(RetryPolicy(attempts=3), clock=VirtualClock(), seed=1)
+    backend = DownGitHubClient()
+    client = ResilientGitHubClient(backend, resilience)
+
+    with pytest.raises(ConnectionError):
+        client.create_draft_pr("title", "body", "sentinel/inc-1-attempt-1")
+    assert backend.creates == 1
+    assert resilience.breaker("github").consecutive_failures == 1
+    assert resilience.snapshot()["retries"] == {}
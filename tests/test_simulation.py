@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import timedelta
+from pathlib import Path
+
+from contracts import IncidentStatus, VirtualClock
+from contracts.models import parse_iso
+from services.orchestrator.config import Settings
+from services.orchestrator.engine import SentinelEngine
+from services.orchestrator.simulation import DEFAULT_TOOL_LATENCIES, run_simulation, simulated_tools
+from services.tools import CIRunner, GitHubClient, MockAzureMonitorTool, SyntheticWorkload, WorkloadSpec
+from services.tools.ci_client import TEST_SUITES
+from storage import PatternStore
+from tests.test_pipeline import build_incident
+
+
+def build_simulated_engine(tmp_path: Path, clock: VirtualClock, azure_tool: MockAzureMonitorTool) -> SentinelEngine:
+    db_path = str(tmp_path / "patterns.db")
+    settings = Settings(pattern_db_path=db_path, dedupe_window_minutes=20, github_mode="mock")
+    tools = simulated_tools(
+        clock,
+        azure_tool=azure_tool,
+        github_client=GitHubClient(owner="demo-org", repo="demo-service", mode="mock"),
+        ci_runner=CIRunner(),
+    )
+    return SentinelEngine(settings=settings, pattern_store=PatternStore(db_path), clock=clock, **tools)
+
+
+def test_virtual_clock_drives_dedupe_window_and_timestamps(tmp_path: Path) -> None:
+    incident = build_incident("inc-virt-001")
+    clock = VirtualClock(parse_iso(incident.start_time))
+    engine = build_simulated_engine(tmp_path, clock, MockAzureMonitorTool())
+
+    first = engine.ingest_incident(incident)
+    assert first.status == IncidentStatus.PR_READY
+    # Suites and the canary replay run concurrently, so verification costs the longest job.
+    expected = max(
+        *(DEFAULT_TOOL_LATENCIES[f"run_suite.{suite}"] for suite in TEST_SUITES),
+        DEFAULT_TOOL_LATENCIES["run_canary_replay"],
+    )
+    assert expected <= first.processing_seconds < expected + 60
+    assert first.approval_package.telemetry_snapshot["generated_at"] == first.finished_at
+
+    clock.advance(5 * 60)
+    assert engine.ingest_incident(replace(incident, incident_id="inc-virt-002")).status == IncidentStatus.DUPLICATE
+
+    clock.advance(30 * 60)
+    later = engine.ingest_incident(replace(incident, incident_id="inc-virt-003"))
+    assert later.status == IncidentStatus.PR_READY
+    assert parse_iso(later.started_at) - parse_iso(first.started_at) >= timedelta(minutes=35)
+
+
+def test_simulated_day_of_incidents_runs_in_seconds(tmp_path: Path) -> None:
+    spec = WorkloadSpec(
+        seed=5,
+        services=2,
+        endpoints_per_service=2,
+        duration_minutes=24 * 60,
+        metric_resolution_seconds=600,
+        logs_per_minute=1,
+        deployment_interval_minutes=180,
+        alert_storm_size=3,
+    )
+    workload = SyntheticWorkload(spec)
+    clock = VirtualClock(parse_iso(spec.start_time))
+    engine = build_simulated_engine(tmp_path, clock, MockAzureMonitorTool(dataset=workload.dataset()))
+
+    result = run_simulation(engine, clock, workload.iter_incident_envelopes())
+
+    assert result.statuses
+    assert result.virtual_seconds >= 12 * 3600
+    assert result.wall_seconds < 30
+    counts = result.status_counts()
+    assert counts.get(IncidentStatus.PR_READY.value, 0) >= 1
+    assert counts.get(IncidentStatus.DUPLICATE.value, 0) >= 1
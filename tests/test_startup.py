@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+import services.orchestrator.app as orchestrator_app_module
+from benchmarks.startup_bench import ROOT_DIR
+
+
+def test_importing_app_defers_engine_and_tool_stack() -> None:
+    script = (
+        "import json, sys\n"
+        "import services.orchestrator.app\n"
+        "heavy = ['numpy', 'services.orchestrator.engine', 'services.tools.github_client', 'storage.pattern_store']\n"
+        "before = [name for name in heavy if name in sys.modules]\n"
+        "from services.orchestrator import SentinelEngine\n"
+        "from services.tools import GitHubClient\n"
+        "print(json.dumps({'before': before, 'after': [name for name in heavy if name in sys.modules]}))\n"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", script], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+    )
+    loaded = json.loads(completed.stdout)
+
+    assert loaded["before"] == []
+    assert {"numpy", "services.orchestrator.engine", "services.tools.github_client"} <= set(loaded["after"])
+
+
+def test_lifespan_warms_engine_in_background(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("SENTINEL_PATTERN_DB_PATH", str(tmp_path / "patterns.db"))
+    monkeypatch.setattr(orchestrator_app_module, "engine", None)
+
+    assert TestClient(orchestrator_app_module.app).get("/ready").status_code == 503
+    with TestClient(orchestrator_app_module.app) as client:
+        assert client.get("/health").json() == {"status": "ok"}
+        deadline = time.monotonic() + 10.0
+        while client.get("/ready").status_code != 200 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert client.get("/ready").json() == {"status": "ready"}
+        engine = orchestrator_app_module.get_engine()
+        assert engine is orchestrator_app_module.engine
+        assert engine.pattern_store.db_path == str(tmp_path / "patterns.db")
+        assert client.get("/api/v1/pr-outbox").json()["publisher_running"] is True
+
+    assert engine.pr_publisher.running is False
+
+
+def test_ready_reports_a_failed_warm_up(monkeypatch: pytest.MonkeyPatch) -> None:
+    def fail(_: list) -> None:
+        raise RuntimeError("pattern store is locked")
+
+    monkeypatch.setattr(orchestrator_app_module, "_start_background_services", fail)
+    with TestClient(orchestrator_app_module.app) as client:
+        deadline = time.monotonic() + 10.0
+        while client.get("/ready").status_code == 503 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        response = client.get("/ready")
+        assert response.status_code == 500
+        assert response.json() == {"detail": "Engine failed to start: pattern store is locked"}
+        assert client.get("/health").json() == {"status": "ok"}
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from contracts import PatchProposal
+from services.orchestrator import SentinelEngine
+from services.orchestrator.config import Settings
+from services.tools import ResourceLimits, SubprocessCIRunner
+from services.verification import VerificationRunner
+from tests.test_pipeline import build_incident
+
+
+PATCH = (
+    "--- a/config/timeouts.yaml\n"
+    "+++ b/config/timeouts.yaml\n"
+    "@@ -1 +1 @@\n"
+    "-payments_timeout_ms: 400\n"
+    "+payments_timeout_ms: 900\n"
+)
+
+
+def init_repo(path: Path) -> Path:
+    (path / "config").mkdir(parents=True)
+    (path / "config" / "timeouts.yaml").write_text("payments_timeout_ms: 400\n")
+    (path / "check_timeout.py").write_text(
+        "import sys\n"
+        "sys.exit(0 if '900' in open('config/timeouts.yaml').read() else 1)\n"
+    )
+    (path / "noisy.py").write_text("print('x' * 100000)\nprint('tail-marker')\n")
+    for command in (
+        ["git", "init", "-q", "-b", "main"],
+        ["git", "add", "."],
+        ["git", "-c", "user.name=ci", "-c", "user.email=ci@example.com", "commit", "-qm", "init"],
+    ):
+        subprocess.run(command, cwd=path, check=True)
+    return path
+
+
+def build_patch(patch_text: str = PATCH, branch: str = "sentinel/inc-sub-001-attempt-1") -> PatchProposal:
+    return PatchProposal(
+        repo="demo-org/demo-service",
+        branch=branch,
+        changed_files=["config/timeouts.yaml"],
+        diff_summary="Increase upstream timeout",
+        hypothesis="Upstream timeouts",
+        risk_level="low",
+        patch_text=patch_text,
+    )
+
+
+@pytest.fixture()
+def repo(tmp_path: Path) -> Path:
+    return init_repo(tmp_path / "repo")
+
+
+def test_suites_run_against_patched_worktrees(repo: Path, tmp_path: Path) -> None:
+    runner = SubprocessCIRunner(
+        repo,
+        {
+            "unit": [sys.executable, "check_timeout.py"],
+            "smoke": [sys.executable, "noisy.py"],
+        },
+        base_ref="main",
+        max_workers=2,
+        max_output_bytes=2048,
+        limits=ResourceLimits(cpu_seconds=30, open_files=256),
+        worktree_root=tmp_path / "worktrees",
+    )
+    try:
+        report = VerificationRunner(runner).verify(build_incident("inc-sub-001"), build_patch())
+        assert report.test_results == {"unit": "passed", "smoke": "passed"}
+        smoke = runner.executions[("sentinel/inc-sub-001-attempt-1", "smoke")]
+        assert smoke.output_truncated and len(smoke.output) < 2200
+        assert smoke.output.rstrip().endswith("tail-marker")
+        unit = runner.executions[("sentinel/inc-sub-001-attempt-1", "unit")]
+        assert unit.worktree == smoke.worktree
+
+        unpatched = build_patch(patch_text="", branch="sentinel/inc-sub-002-attempt-1")
+        assert runner.run_suite(unpatched, "unit") == "failed"
+        assert runner.run_suite(build_patch(patch_text="not a diff"), "unit") == "failed"
+
+        used = {execution.worktree for execution in runner.executions.values()}
+        assert len(used) <= 2
+        assert (repo / "config" / "timeouts.yaml").read_text() == "payments_timeout_ms: 400\n"
+        assert runner.config_fingerprint()["base_commit"] == runner.worktrees.base_commit
+    finally:
+        runner.close()
+
+
+def test_hard_timeout_kills_the_process_group(repo: Path, tmp_path: Path) -> None:
+    runner = SubprocessCIRunner(
+        repo,
+        {"integration": [sys.executable, "-c", "import subprocess, time; subprocess.Popen(['sleep', '30']); time.sleep(30)"]},
+        base_ref="main",
+        timeout_seconds=0.5,
+        worktree_root=tmp_path / "worktrees",
+    )
+    try:
+        started = time.perf_counter()
+        assert runner.run_suite(build_patch(), "integration") == "timed_out"
+        assert time.perf_counter() - started < 5.0
+        assert runner.executions[("sentinel/inc-sub-001-attempt-1", "integration")].returncode is None
+    finally:
+        runner.close()
+
+
+def test_engine_close_releases_the_worktrees_it_created(repo: Path, tmp_path: Path) -> None:
+    engine = SentinelEngine(
+        settings=Settings(
+            pattern_db_path=str(tmp_path / "patterns.db"),
+            base_branch="main",
+            test_repo_path=str(repo),
+            test_commands=(("unit", f"{sys.executable} check_timeout.py"),),
+            record_path=str(tmp_path / "traffic.jsonl.gz"),
+        )
+    )
+    assert engine.ci_runner.batch_suites
+    assert engine.ci_runner.run_tests(build_patch()) == {"unit": "passed"}
+    worktrees = engine.ci_runner.backend.backend.worktrees
+    assert any(worktrees.root.iterdir())
+
+    engine.close()
+    assert not worktrees.root.exists()
+    assert engine.recorder._handle.closed
+    engine.close()
+
+
+def test_suites_share_one_budget_and_stop_after_the_first_failure(repo: Path, tmp_path: Path) -> None:
+    runner = SubprocessCIRunner(
+        repo,
+        {
+            "first": [sys.executable, "-c", "import time; time.sleep(1)"],
+            "second": [sys.executable, "-c", "import time; time.sleep(1)"],
+        },
+        base_ref="main",
+        worktree_root=tmp_path / "worktrees",
+    )
+    try:
+        started = time.perf_counter()
+        assert runner.run_tests(build_patch()) == {"first": "passed", "second": "passed"}
+        assert time.perf_counter() - started < 1.9
+
+        runner.suite_commands = {
+            "unit": (sys.executable, "-c", "raise SystemExit(1)"),
+            "integration": (sys.executable, "-c", "import time; time.sleep(30)"),
+        }
+        runner.test_suites = tuple(runner.suite_commands)
+        started = time.perf_counter()
+        assert runner.run_tests(build_patch()) == {"unit": "failed", "integration": "cancelled"}
+        assert time.perf_counter() - started < 5.0
+    finally:
+        runner.close()
+
+
+def test_abandoned_verification_kills_running_suites(repo: Path, tmp_path: Path) -> None:
+    runner = SubprocessCIRunner(
+        repo,
+        {"integration": [sys.executable, "-c", "import time; time.sleep(30)"]},
+        base_ref="main",
+        worktree_root=tmp_path / "worktrees",
+    )
+    try:
+        report = VerificationRunner(runner, timeout_seconds=0.5).verify(build_incident("inc-sub-003"), build_patch())
+        assert report.test_results == {"integration": "timed_out"}
+
+        key = ("sentinel/inc-sub-001-attempt-1", "integration")
+        deadline = time.perf_counter() + 5.0
+        while key not in runner.executions and time.perf_counter() < deadline:
+            time.sleep(0.05)
+        assert runner.executions[key].status == "cancelled"
+    finally:
+        runner.close()
+
+
+def test_worktree_pool_tracks_only_created_worktrees_and_removes_its_root(repo: Path) -> None:
+    runner = SubprocessCIRunner(repo, {"unit": [sys.executable, "check_timeout.py"]}, base_ref="main")
+    pool = runner.worktrees
+    (pool.root / "wt-000").write_text("in the way")
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+    assert pool._all == []
+
+    assert runner.run_suite(build_patch(), "unit") == "passed"
+    assert len(pool._all) == 1
+    runner.close()
+    assert not pool.root.exists()
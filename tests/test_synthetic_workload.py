@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import types
+from itertools import islice
+from pathlib import Path
+
+from contracts import IncidentStatus
+from services.tools import MockAzureMonitorTool, SyntheticWorkload, WorkloadSpec
+from tests.test_pipeline import build_engine
+
+
+def test_workload_is_deterministic_streaming_and_sized_by_spec() -> None:
+    spec = WorkloadSpec(seed=11, services=3, endpoints_per_service=4, duration_minutes=90, logs_per_minute=6)
+    first = SyntheticWorkload(spec)
+    second = SyntheticWorkload(spec)
+
+    metrics = first.iter_metrics("svc-001", "prod")
+    assert isinstance(metrics, types.GeneratorType)
+    assert list(islice(metrics, 50)) == list(islice(second.iter_metrics("svc-001", "prod"), 50))
+    assert sum(1 for _ in first.iter_metrics("svc-000", "prod")) == 90 * 4 * 2
+    assert sum(1 for _ in first.iter_logs("svc-000", "prod")) == 90 * 6
+    assert list(first.iter_incidents()) == list(second.iter_incidents())
+    assert first.buckets() == [("svc-000", "prod"), ("svc-001", "prod"), ("svc-002", "prod")]
+
+    # Storms longer than the deployment interval overlap; the merged stream must still be globally ordered.
+    storms = SyntheticWorkload(
+        WorkloadSpec(services=2, deployment_interval_minutes=2, alert_storm_size=8, alert_storm_spread_seconds=600)
+    )
+    incidents = storms.iter_incidents()
+    assert isinstance(incidents, types.GeneratorType)
+    ordered = [(item["start_time"], item["incident_id"]) for item in incidents]
+    assert ordered == sorted(ordered) and len(set(ordered)) == len(ordered)
+
+    regression = first.regressions("svc-000", "prod")[0]
+    degraded = [
+        metric
+        for metric in first.iter_metrics("svc-000", "prod")
+        if metric["name"] == "http_5xx_rate" and metric["value"] >= 0.1
+    ]
+    assert degraded
+    assert {metric["endpoint"] for metric in degraded} <= {
+        item.endpoint for item in first.regressions("svc-000", "prod")
+    }
+    assert regression.end_epoch > regression.start_epoch
+
+
+def test_alert_storm_feeds_engine_from_synthetic_dataset(tmp_path: Path) -> None:
+    workload = SyntheticWorkload(WorkloadSpec(seed=3, regression_probability=1.0, alert_storm_size=4))
+    engine = build_engine(tmp_path, azure_tool=MockAzureMonitorTool(dataset=workload.dataset()))
+
+    storm = list(islice(workload.iter_incident_envelopes(), 4))
+    records = [engine.ingest_incident(incident) for incident in storm]
+
+    assert records[0].status == IncidentStatus.PR_READY
+    assert [record.status for record in records[1:]] == [IncidentStatus.DUPLICATE] * 3
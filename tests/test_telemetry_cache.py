@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import threading
+import time
+from itertools import islice
+from pathlib import Path
+
+from contracts import IncidentStatus
+from services.orchestrator.config import Settings
+from services.orchestrator.engine import SentinelEngine
+from services.tools import CachingAzureMonitorTool, CIRunner, MockAzureMonitorTool
+from tests.test_pipeline import build_incident
+
+
+class CountingAzureTool(MockAzureMonitorTool):
+    def __init__(self, delay_seconds: float = 0.0) -> None:
+        super().__init__()
+        self.delay_seconds = delay_seconds
+        self.calls = 0
+        self._calls_lock = threading.Lock()
+
+    def _count(self) -> None:
+        with self._calls_lock:
+            self.calls += 1
+        time.sleep(self.delay_seconds)
+
+    def query_metrics(self, service: str, env: str, metric_name: str | None = None):
+        self._count()
+        return super().query_metrics(service, env, metric_name=metric_name)
+
+    def iter_metrics(self, service: str, env: str, metric_name: str | None = None):
+        self._count()
+        return super().iter_metrics(service, env, metric_name=metric_name)
+
+
+class PagedLogTool(MockAzureMonitorTool):
+    def __init__(self) -> None:
+        super().__init__()
+        self.yielded = 0
+
+    def iter_logs(self, service: str, env: str, **filters):
+        for item in super().iter_logs(service, env, **filters):
+            self.yielded += 1
+            yield item
+
+
+def test_cache_hits_expire_and_evict() -> None:
+    now = [0.0]
+    backend = CountingAzureTool()
+    cache = CachingAzureMonitorTool(backend, ttl_seconds=30.0, max_entries=1, clock=lambda: now[0])
+
+    first = cache.query_metrics("checkout-api", "prod")
+    first.clear()
+    assert cache.query_metrics("checkout-api", "prod")
+    assert backend.calls == 1
+
+    now[0] = 31.0
+    cache.query_metrics("checkout-api", "prod")
+    cache.query_metrics("checkout-api", "prod", metric_name="http_5xx_rate")
+    assert backend.calls == 3
+    assert len(cache) == 1
+    assert cache.stats.to_dict() == {
+        "hits": 1,
+        "misses": 3,
+        "coalesced": 0,
+        "evictions": 1,
+        "expirations": 1,
+        "hit_rate": 0.25,
+    }
+
+
+def test_streams_pass_through_until_drained() -> None:
+    backend = PagedLogTool()
+    backend.append_logs(
+        "checkout-api",
+        "prod",
+        (
+            {
+                "timestamp": f"2026-02-16T09:{minute:02d}:00Z",
+                "service": "checkout-api",
+                "env": "prod",
+                "level": "ERROR",
+                "message": f"upstream timeout {minute}",
+            }
+            for minute in range(50)
+        ),
+    )
+    cache = CachingAzureMonitorTool(backend)
+
+    newest = list(islice(cache.iter_logs("checkout-api", "prod", levels=("ERROR",), newest_first=True), 2))
+    assert [item["message"] for item in newest] == ["upstream timeout 49", "upstream timeout 48"]
+    assert backend.yielded == 2
+    assert len(cache) == 0
+
+    drained = list(cache.iter_logs("checkout-api", "prod", levels=("ERROR",)))
+    yielded = backend.yielded
+    assert list(cache.iter_logs("checkout-api", "prod", levels=("ERROR",))) == drained
+    assert [item["message"] for item in islice(
+        cache.iter_logs("checkout-api", "prod", levels=("ERROR",), newest_first=True), 1
+    )] == ["upstream timeout 49"]
+    assert backend.yielded == yielded
+    assert cache.stats.hits == 2
+
+
+def test_concurrent_identical_queries_share_one_backend_call() -> None:
+    backend = CountingAzureTool(delay_seconds=0.2)
+    cache = CachingAzureMonitorTool(backend)
+    results: list[int] = []
+
+    def query() -> None:
+        results.append(len(cache.query_metrics("checkout-api", "prod")))
+
+    threads = [threading.Thread(target=query) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert backend.calls == 1
+    assert results == [3] * 8
+    assert cache.stats.misses == 1
+    assert cache.stats.coalesced == 7
+
+
+def test_engine_investigations_share_cached_telemetry(tmp_path: Path) -> None:
+    backend = CountingAzureTool()
+    settings = Settings(pattern_db_path=str(tmp_path / "patterns.db"), dedupe_window_minutes=0)
+    engine = SentinelEngine(settings=settings, azure_tool=backend, ci_runner=CIRunner())
+
+    first = engine.ingest_incident(build_incident("inc-cache-1"))
+    calls_after_first = backend.calls
+    second = engine.ingest_incident(build_incident("inc-cache-2"))
+
+    assert first.status == second.status == IncidentStatus.PR_READY
+    assert isinstance(engine.azure_tool, CachingAzureMonitorTool)
+    assert calls_after_first > 0 and backend.calls == calls_after_first
+    assert engine.azure_tool.stats.misses > 0
+    assert engine.azure_tool.stats.hits > 0
+    assert len(engine.azure_tool) > 0
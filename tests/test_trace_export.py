@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from benchmarks.tracing_bench import run
+from services.orchestrator.telemetry import set_span_exporter, traced_span
+from services.orchestrator.trace_export import BatchedFileSpanExporter
+
+
+def read_spans(path: Path) -> list[dict]:
+    spans = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        request = json.loads(line)
+        for resource in request["resourceSpans"]:
+            for scope in resource["scopeSpans"]:
+                spans.extend(scope["spans"])
+    return spans
+
+
+def test_exporter_writes_nested_otlp_json_spans_and_rotates(tmp_path: Path) -> None:
+    exporter = BatchedFileSpanExporter(str(tmp_path), batch_size=2, max_file_bytes=2048, max_files=3)
+    exporter.start()
+    previous = set_span_exporter(exporter)
+    try:
+        with traced_span("investigation", {"incident_id": "inc-trace-1", "attempt": 1}):
+            with traced_span("query_logs"):
+                pass
+        with pytest.raises(ValueError):
+            with traced_span("verification", {"incident_id": "inc-trace-1"}):
+                raise ValueError("suite failed")
+        exporter.flush()
+        spans = read_spans(exporter.path)
+        for index in range(40):
+            with traced_span("triage", {"incident_id": f"inc-rotate-{index}"}):
+                pass
+    finally:
+        set_span_exporter(previous)
+        exporter.shutdown()
+
+    by_name = {span["name"]: span for span in spans}
+    parent, child = by_name["investigation"], by_name["query_logs"]
+    assert child["parentSpanId"] == parent["spanId"] and child["traceId"] == parent["traceId"]
+    assert "parentSpanId" not in parent
+    assert {"key": "attempt", "value": {"intValue": "1"}} in parent["attributes"]
+    assert int(parent["endTimeUnixNano"]) >= int(child["endTimeUnixNano"]) >= int(child["startTimeUnixNano"])
+    assert by_name["verification"]["status"] == {"code": 2, "message": "ValueError: suite failed"}
+
+    assert exporter.stats.rotations >= 1
+    files = sorted(path.name for path in tmp_path.iterdir())
+    assert files[-1] == "spans.jsonl" and len(files) <= 3
+    assert all(path.stat().st_size <= 2048 for path in tmp_path.iterdir())
+    assert exporter.stats.exported == 43 and exporter.stats.dropped == 0
+
+
+def test_exporter_drops_beyond_its_bound_and_benchmark_stays_in_microseconds(tmp_path: Path) -> None:
+    exporter = BatchedFileSpanExporter(str(tmp_path), max_queue_size=5, batch_size=100)
+    for index in range(8):
+        exporter.export(("span", 1, index + 1, 0, 0, 1, None, None))
+    assert (exporter.stats.queued, exporter.stats.dropped) == (5, 3)
+    exporter.shutdown()
+    assert len(read_spans(exporter.path)) == 5
+
+    results = {result.mode: result for result in run(iterations=2000)}
+    assert set(results) == {"untraced", "traced", "traced+export"}
+    assert results["traced"].overhead_us < 200
+    assert results["traced+export"].dropped == 0
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import time
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from contracts import PatchProposal, RetryRequest, VirtualClock
+from services.tools import CIRunner
+from services.verification import VerificationRunner
+from storage import VerificationCache
+from tests.test_pipeline import build_incident
+
+
+def build_patch() -> PatchProposal:
+    return PatchProposal(
+        repo="demo-org/demo-service",
+        branch="sentinel/inc-ver-001-attempt-1",
+        changed_files=["src/checkout/client.py"],
+        diff_summary="Increase upstream timeout and add retry",
+        hypothesis="Upstream timeouts cause 5xx responses",
+        risk_level="low",
+        patch_text=(
+            "--- a/config/timeouts.yaml\n"
+            "+++ b/config/timeouts.yaml\n"
+            "-payments_timeout_ms: 400\n"
+            "+payments_timeout_ms: 900\n"
+        ),
+    )
+
+
+class SlowCIRunner(CIRunner):
+    def __init__(self, delays: dict[str, float], statuses: dict[str, str] | None = None) -> None:
+        super().__init__()
+        self.delays = delays
+        self.statuses = statuses or {}
+
+    def run_suite(self, patch: PatchProposal, suite: str) -> str:
+        time.sleep(self.delays.get(suite, 0.0))
+        return self.statuses.get(suite, "passed")
+
+    def run_canary_replay(self, incident, patch):
+        time.sleep(self.delays.get("canary_replay", 0.0))
+        return super().run_canary_replay(incident, patch)
+
+
+def test_suites_and_canary_run_concurrently_with_durations() -> None:
+    ci_runner = SlowCIRunner({"unit": 0.2, "integration": 0.2, "smoke": 0.2, "canary_replay": 0.2})
+    started = time.perf_counter()
+    report = VerificationRunner(ci_runner).verify(build_incident("inc-ver-001"), build_patch())
+    elapsed = time.perf_counter() - started
+
+    assert report.pass_fail
+    assert elapsed < 0.6
+    assert report.test_results == {"unit": "passed", "integration": "passed", "smoke": "passed"}
+    assert set(report.durations_ms) == {"unit", "integration", "smoke", "canary_replay"}
+    assert all(duration >= 150.0 for duration in report.durations_ms.values())
+
+
+def test_failure_cancels_remaining_work_and_suites_time_out() -> None:
+    ci_runner = SlowCIRunner({"integration": 5.0, "smoke": 5.0, "canary_replay": 5.0}, statuses={"unit": "failed"})
+    started = time.perf_counter()
+    report = VerificationRunner(ci_runner).verify(build_incident("inc-ver-002"), build_patch())
+
+    assert time.perf_counter() - started < 1.0
+    assert not report.pass_fail
+    assert report.test_results == {"unit": "failed", "integration": "cancelled", "smoke": "cancelled"}
+    assert report.canary_replay_result == {"status": "cancelled"}
+    assert report.regression_flags == ["unit_failed"]
+
+    runner = VerificationRunner(SlowCIRunner({"integration": 5.0}), suite_timeouts={"integration": 0.1})
+    report = runner.verify(build_incident("inc-ver-003"), build_patch())
+    assert report.test_results["integration"] == "timed_out"
+    assert "integration_timed_out" in report.regression_flags
+    assert report.durations_ms["integration"] < 1000.0
+
+
+class CountingCIRunner(CIRunner):
+    def __init__(self) -> None:
+        super().__init__()
+        self.suite_runs = 0
+
+    def run_suite(self, patch: PatchProposal, suite: str) -> str:
+        self.suite_runs += 1
+        return super().run_suite(patch, suite)
+
+
+def test_verification_cache_reuses_suite_results_until_forced_or_expired(tmp_path: Path) -> None:
+    clock = VirtualClock()
+    cache = VerificationCache(str(tmp_path / "verification.db"), ttl_seconds=3600, max_entries=2, clock=clock)
+    ci_runner = CountingCIRunner()
+    runner = VerificationRunner(ci_runner, cache=cache)
+
+    first = runner.verify(build_incident("inc-cache-001"), build_patch())
+    second = runner.verify(build_incident("inc-cache-002", error_rate=0.35), build_patch())
+    assert ci_runner.suite_runs == 3
+    assert not first.cache_hit and second.cache_hit
+    assert second.test_results == first.test_results
+    assert abs(second.canary_replay_result["baseline_5xx_rate"] - 0.35) < 0.01
+
+    assert runner.verify(build_incident("inc-cache-003"), build_patch(), force=True).cache_hit is False
+    assert ci_runner.suite_runs == 6
+
+    other = replace(build_patch(), patch_text="--- a/config/db_pool.yaml\n+++ b/config/db_pool.yaml\n")
+    assert runner.cache_key(other) != runner.cache_key(build_patch())
+    key = runner.cache_key(build_patch())
+    assert runner.cache_key(replace(build_patch(), branch="sentinel/inc-other-attempt-2")) == key
+    ci_runner.force_test_failure = True
+    assert runner.cache_key(build_patch()) != key
+    ci_runner.force_test_failure = False
+
+    clock.advance(3601)
+    assert runner.verify(build_incident("inc-cache-004"), build_patch()).cache_hit is False
+    runner.verify(build_incident("inc-cache-005"), other)
+    runner.verify(build_incident("inc-cache-006"), replace(other, patch_text=other.patch_text + "+x\n"))
+    assert len(cache) == 2
+    assert cache.stats.expirations == 1 and cache.stats.evictions == 1
+
+
+def test_custom_test_runner_runs_once_and_every_reported_suite_counts() -> None:
+    calls: list[str] = []
+
+    def custom_runner(patch: PatchProposal) -> dict[str, str]:
+        calls.append(patch.branch)
+        return {"unit": "passed", "integration": "passed", "smoke": "passed", "lint": "failed"}
+
+    report = VerificationRunner(CIRunner(custom_test_runner=custom_runner)).verify(
+        build_incident("inc-ver-custom"), build_patch()
+    )
+
+    assert calls == [build_patch().branch]
+    assert report.test_results["lint"] == "failed"
+    assert "lint_failed" in report.regression_flags
+    assert report.pass_fail is False
+    assert set(report.durations_ms) == {"unit", "integration", "smoke", "lint", "canary_replay"}
+
+
+def test_custom_runners_cache_only_under_an_explicit_identity(tmp_path: Path) -> None:
+    cache = VerificationCache(str(tmp_path / "verification.db"))
+    anonymous = VerificationRunner(CIRunner(custom_test_runner=lambda patch: {"unit": "passed"}), cache=cache)
+    named = VerificationRunner(
+        CIRunner(custom_test_runner=lambda patch: {"unit": "failed"}, custom_runner_id="lint-v2"), cache=cache
+    )
+
+    assert anonymous.cache_key(build_patch()) is None
+    anonymous.verify(build_incident("inc-cache-anon"), build_patch())
+    assert len(cache) == 0
+    named.verify(build_incident("inc-cache-named-1"), build_patch())
+    assert named.verify(build_incident("inc-cache-named-2"), build_patch()).cache_hit is True
+    assert len(cache) == 1
+
+    assert RetryRequest.from_dict({"force_verification": "false"}).force_verification is False
+    assert RetryRequest.from_dict({"force_verification": "Yes"}).force_verification is True
+    with pytest.raises(ValueError):
+        RetryRequest.from_dict({"force_verification": "sometimes"})